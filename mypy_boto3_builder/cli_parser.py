@@ -8,15 +8,27 @@ import argparse
 import enum
 import logging
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from mypy_boto3_builder.constants import OUTPUT_PATH_SENTINEL, PROG_NAME
+from mypy_boto3_builder.constants import (
+    BENCH_COMMAND,
+    BENCH_HISTORY_NAME,
+    CACHE_PATH,
+    MERGE_COMMAND,
+    OUTPUT_PATH_SENTINEL,
+    PROG_NAME,
+    WORKER_COMMAND,
+)
+from mypy_boto3_builder.enums.bench_scenario import BenchScenario
 from mypy_boto3_builder.enums.output_type import OutputType
 from mypy_boto3_builder.enums.product import Product
+from mypy_boto3_builder.enums.profile_mode import ProfileMode
 from mypy_boto3_builder.service_name import ServiceName
+from mypy_boto3_builder.utils.memory import format_memory_size, parse_memory_size
 from mypy_boto3_builder.utils.path import print_path
+from mypy_boto3_builder.utils.shards import Shard
 from mypy_boto3_builder.utils.version import get_builder_version
 
 
@@ -33,6 +45,38 @@ def get_absolute_path(path: str) -> Path:
     return Path(path).absolute()
 
 
+def get_shard(value: str) -> Shard:
+    """
+    Get shard from a `K/N` string.
+
+    Arguments:
+        value -- String containing shard number and total number of shards.
+
+    Returns:
+        Shard.
+    """
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def get_memory_size(value: str) -> int:
+    """
+    Get memory size in bytes from a string like `4G`.
+
+    Arguments:
+        value -- String containing memory size.
+
+    Returns:
+        Memory size in bytes.
+    """
+    try:
+        return parse_memory_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
 class EnumListAction(argparse.Action):
     """
     Argparse action for handling Enums.
@@ -111,6 +155,25 @@ class CLINamespace:
     disable_smart_version: bool = False
     download_static_stubs: bool = True
     raise_interrupt: bool = False
+    cache_path: Path | None = None
+    offline: bool = False
+    link_static: bool = False
+    updated_from: Path | None = None
+    task_graph_path: Path | None = None
+    report_path: Path | None = None
+    trace_memory: bool = False
+    memory_budget: int | None = None
+    profile_path: Path | None = None
+    profile_mode: ProfileMode = ProfileMode.sampling
+    shard: Shard | None = None
+    merge_paths: list[Path] = field(default_factory=list[Path])
+    work_queue_path: Path | None = None
+    is_worker: bool = False
+    idle_timeout: float | None = None
+    resume: bool = False
+    keep_going: bool = False
+    bench_scenarios: list[BenchScenario] = field(default_factory=list[BenchScenario])
+    bench_history_path: Path | None = None
 
     def to_cmd(self) -> tuple[str, ...]:
         """
@@ -121,12 +184,53 @@ class CLINamespace:
                 None,
                 (
                     PROG_NAME,
+                    MERGE_COMMAND if self.merge_paths else None,
+                    WORKER_COMMAND if self.is_worker else None,
+                    BENCH_COMMAND if self.bench_scenarios else None,
                     print_path(self.output_path),
                     "--no-smart-version" if self.disable_smart_version else None,
                     "--skip-published" if self.skip_published else None,
                     "--partial-overload" if self.partial_overload else None,
                     "--download-static-stubs" if self.download_static_stubs else None,
                     "--list-services" if self.list_services else None,
+                    f"--cache-dir {print_path(self.cache_path)}"
+                    if self.cache_path and self.cache_path != CACHE_PATH
+                    else None,
+                    "--offline" if self.offline else None,
+                    "--link-static" if self.link_static else None,
+                    f"--updated-from {print_path(self.updated_from)}"
+                    if self.updated_from
+                    else None,
+                    f"--dump-task-graph {print_path(self.task_graph_path)}"
+                    if self.task_graph_path
+                    else None,
+                    f"--report {print_path(self.report_path)}" if self.report_path else None,
+                    "--trace-memory" if self.trace_memory else None,
+                    f"--memory-budget {format_memory_size(self.memory_budget)}"
+                    if self.memory_budget
+                    else None,
+                    f"--profile-dir {print_path(self.profile_path)}" if self.profile_path else None,
+                    f"--profile-mode {self.profile_mode.value}"
+                    if self.profile_path and self.profile_mode != ProfileMode.sampling
+                    else None,
+                    f"--shard {self.shard}" if self.shard else None,
+                    f"--shards {' '.join(print_path(i) for i in self.merge_paths)}"
+                    if self.merge_paths
+                    else None,
+                    f"--work-queue {print_path(self.work_queue_path)}"
+                    if self.work_queue_path
+                    else None,
+                    f"--idle-timeout {self.idle_timeout}"
+                    if self.idle_timeout is not None
+                    else None,
+                    "--resume" if self.resume else None,
+                    "--keep-going" if self.keep_going else None,
+                    f"--scenario {' '.join(i.value for i in self.bench_scenarios)}"
+                    if self.bench_scenarios
+                    else None,
+                    f"--history {print_path(self.bench_history_path)}"
+                    if self.bench_history_path
+                    else None,
                     f"--build-version {self.build_version}" if self.build_version else None,
                     f"--product {' '.join(i.value for i in self.products)}"
                     if self.products
@@ -141,18 +245,151 @@ class CLINamespace:
         )
 
 
+def parse_worker_args(args: Sequence[str]) -> CLINamespace:
+    """
+    Parse `worker` subcommand CLI arguments.
+
+    Returns:
+        Argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        f"{PROG_NAME} {WORKER_COMMAND}",
+        description="Build service packages from a shared work queue.",
+    )
+    parser.add_argument("-d", "--debug", action="store_true", help="Show debug messages")
+    parser.add_argument(
+        "queue_path",
+        metavar="QUEUE_PATH",
+        help="Work queue directory shared with the main build.",
+        type=get_absolute_path,
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Exit after this many seconds without jobs. (default: wait until build is finished)",
+    )
+    result = parser.parse_args(args)
+    return CLINamespace(
+        log_level=logging.DEBUG if result.debug else logging.INFO,
+        output_path=result.queue_path,
+        service_names=[],
+        build_version="",
+        output_types=[OutputType.package],
+        products=[],
+        download_static_stubs=False,
+        raise_interrupt=result.debug,
+        work_queue_path=result.queue_path,
+        is_worker=True,
+        idle_timeout=result.idle_timeout,
+    )
+
+
+def parse_bench_args(args: Sequence[str]) -> CLINamespace:
+    """
+    Parse `bench` subcommand CLI arguments.
+
+    Returns:
+        Argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        f"{PROG_NAME} {BENCH_COMMAND}",
+        description=(
+            "Benchmark product builds without network and smart versioning"
+            " and append results to a history file."
+        ),
+    )
+    parser.add_argument("-d", "--debug", action="store_true", help="Show debug messages")
+    parser.add_argument(
+        "output_path",
+        metavar="OUTPUT_PATH",
+        help="Keep build outputs in this directory. (default: temporary directory)",
+        type=get_absolute_path,
+        default=OUTPUT_PATH_SENTINEL,
+        nargs="?",
+    )
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        type=BenchScenario,
+        action=EnumListAction,
+        metavar="SCENARIO",
+        nargs="+",
+        default=tuple(BenchScenario),
+        help=(
+            "Scenarios to run: single large service, essential services or all services."
+            " (default: all scenarios)"
+        ),
+    )
+    parser.add_argument(
+        "--product",
+        dest="products",
+        type=Product,
+        action=EnumListAction,
+        metavar="PRODUCT",
+        nargs="+",
+        default=(Product.types_boto3_services,),
+        help="Packages to build. (default: types-boto3-services)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=get_absolute_path,
+        default=CACHE_PATH,
+        help=f"Local cache served to offline builds. (default: {print_path(CACHE_PATH)})",
+    )
+    parser.add_argument(
+        "--history",
+        type=get_absolute_path,
+        metavar="PATH",
+        help=f"Results history file. (default: {BENCH_HISTORY_NAME} in cache directory)",
+    )
+    result = parser.parse_args(args)
+    return CLINamespace(
+        log_level=logging.DEBUG if result.debug else logging.INFO,
+        output_path=result.output_path,
+        service_names=[],
+        build_version="",
+        output_types=[OutputType.package],
+        products=result.products,
+        disable_smart_version=True,
+        download_static_stubs=False,
+        raise_interrupt=result.debug,
+        cache_path=result.cache_dir,
+        offline=True,
+        bench_scenarios=result.scenarios,
+        bench_history_path=result.history or result.cache_dir / BENCH_HISTORY_NAME,
+    )
+
+
 def parse_args(args: Sequence[str]) -> CLINamespace:
     """
     Parse CLI arguments.
 
+    `merge` subcommand assembles products from `--shard` build outputs.
+    `worker` subcommand builds service packages from `--work-queue`.
+    `bench` subcommand runs end-to-end build benchmarks.
+
     Returns:
         Argument parser.
     """
+    if args and args[0] == WORKER_COMMAND:
+        return parse_worker_args(args[1:])
+    if args and args[0] == BENCH_COMMAND:
+        return parse_bench_args(args[1:])
+
     version = get_builder_version()
+    is_merge = bool(args) and args[0] == MERGE_COMMAND
+    if is_merge:
+        args = args[1:]
 
     parser = argparse.ArgumentParser(
-        PROG_NAME,
-        description="Type annotations generator for boto3, aiobotocore and aioboto3.",
+        f"{PROG_NAME} {MERGE_COMMAND}" if is_merge else PROG_NAME,
+        description=(
+            "Merge service packages built by shards and generate wrapper and full packages."
+            if is_merge
+            else "Type annotations generator for boto3, aiobotocore and aioboto3."
+        ),
+        epilog=None if is_merge else f"Use `{PROG_NAME} {MERGE_COMMAND} -h` to merge shards.",
     )
     parser.add_argument("-d", "--debug", action="store_true", help="Show debug messages")
     parser.add_argument(
@@ -190,6 +427,68 @@ def parse_args(args: Sequence[str]) -> CLINamespace:
         action="store_true",
         help="Download static stubs from GitHub repositories instead of using built-in files.",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=get_absolute_path,
+        default=CACHE_PATH,
+        help=f"Local cache for static stubs and downloads. (default: {print_path(CACHE_PATH)})",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Do not use network, serve PyPI, changelog and GitHub responses from local cache.",
+    )
+    parser.add_argument(
+        "--link-static",
+        action="store_true",
+        help=(
+            "Hardlink static stubs from cache directory instead of copying them."
+            " Linked files are read-only and shared with the cache, ignored for installed output."
+        ),
+    )
+    parser.add_argument(
+        "--dump-task-graph",
+        type=get_absolute_path,
+        metavar="PATH",
+        help="Save executed generation task graphs with timings as JSON files to this directory.",
+    )
+    parser.add_argument(
+        "--report",
+        type=get_absolute_path,
+        metavar="PATH",
+        help="Save per-service and per-stage wall and CPU times, file counts and sizes as JSON.",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Add per-service and per-stage peak and retained memory to --report.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=get_memory_size,
+        metavar="SIZE",
+        help=(
+            "Process memory budget, e.g. 4G. When it is approached, caches are released"
+            " and new services wait for running ones to finish."
+        ),
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=get_absolute_path,
+        metavar="PATH",
+        help="Profile each service separately and save profiles to this directory.",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        type=ProfileMode,
+        action=EnumListAction,
+        metavar="MODE",
+        default=ProfileMode.sampling,
+        help=(
+            "Profiler mode for --profile-dir: sampling saves collapsed stacks and speedscope"
+            " files, cprofile traces every call and saves pstats files."
+        ),
+    )
     parser.add_argument(
         "--panic",
         action="store_true",
@@ -217,6 +516,16 @@ def parse_args(args: Sequence[str]) -> CLINamespace:
         ),
         default=(ServiceName.ALL,),
     )
+    parser.add_argument(
+        "--updated-from",
+        type=get_absolute_path,
+        metavar="PATH",
+        help=(
+            "Detect `updated` services locally by comparing service models with"
+            " a previous output directory, its services manifest or a `botocore/data` directory."
+            " By default, botocore changelog is downloaded."
+        ),
+    )
     parser.add_argument(
         "--partial-overload",
         action="store_true",
@@ -244,11 +553,62 @@ def parse_args(args: Sequence[str]) -> CLINamespace:
         action="store_true",
         help="List supported boto3 service names.",
     )
+    if is_merge:
+        parser.add_argument(
+            "--shards",
+            type=get_absolute_path,
+            metavar="PATH",
+            nargs="+",
+            required=True,
+            help="Output paths of all shards.",
+        )
+    else:
+        parser.add_argument(
+            "--shard",
+            type=get_shard,
+            metavar="K/N",
+            help=(
+                "Build only services of shard K out of N, services are split by cost."
+                " Wrapper packages are skipped, use `merge` to assemble them from shard outputs."
+            ),
+        )
+        parser.add_argument(
+            "--work-queue",
+            type=get_absolute_path,
+            metavar="PATH",
+            help=(
+                "Build service packages through a work queue directory on shared storage."
+                f" Start `{PROG_NAME} {WORKER_COMMAND} PATH` on other hosts to pull jobs from it."
+                " OUTPUT_PATH should be shared with workers too."
+            ),
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help=(
+                "Skip service packages completed by a previous interrupted or failed build"
+                " to the same OUTPUT_PATH, if their service models did not change."
+            ),
+        )
+        parser.add_argument(
+            "--keep-going",
+            action="store_true",
+            help="Do not stop on failed service packages, report all failures at the end.",
+        )
     result = parser.parse_args(args)
 
     if result.installed:
         result.output_type = [OutputType.installed]
 
+    shard: Shard | None = None if is_merge else result.shard
+    work_queue_path: Path | None = None if is_merge else result.work_queue
+    if is_merge and result.output_path == OUTPUT_PATH_SENTINEL:
+        parser.error("OUTPUT_PATH is required for merge")
+    if (shard or work_queue_path or is_merge) and OutputType.installed in result.output_type:
+        parser.error("Installed output type is not supported for sharded builds")
+    if (shard or work_queue_path) and OutputType.package not in result.output_type:
+        result.output_type = [*result.output_type, OutputType.package]
+
     return CLINamespace(
         log_level=logging.DEBUG if result.debug else logging.INFO,
         output_path=result.output_path,
@@ -262,4 +622,19 @@ def parse_args(args: Sequence[str]) -> CLINamespace:
         disable_smart_version=result.no_smart_version,
         download_static_stubs=result.download_static_stubs,
         raise_interrupt=result.debug,
+        cache_path=result.cache_dir,
+        offline=result.offline,
+        link_static=result.link_static,
+        updated_from=result.updated_from,
+        task_graph_path=result.dump_task_graph,
+        report_path=result.report,
+        trace_memory=result.trace_memory,
+        memory_budget=result.memory_budget,
+        profile_path=result.profile_dir,
+        profile_mode=result.profile_mode,
+        shard=shard,
+        merge_paths=result.shards if is_merge else [],
+        work_queue_path=work_queue_path,
+        resume=False if is_merge else result.resume,
+        keep_going=False if is_merge else result.keep_going,
     )
@@ -4,6 +4,7 @@ Constants and paths.
 Copyright 2024 Vlad Emelianov
 """
 
+import os
 from pathlib import Path
 from typing import Final
 
@@ -53,9 +54,44 @@ SUPPORTED_PY_VERSIONS: Final = {
     (3, 14),
 }
 
+# Local cache for static stubs and downloaded archives
+CACHE_PATH: Final = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mypy_boto3_builder"
+)
+
+# list of files written to output directory by the last run, used for cleanup
+OUTPUT_MANIFEST_NAME: Final = ".mypy-boto3-builder-manifest"
+
+# service model fingerprints recorded by the last run, used to detect updated services
+SERVICE_FINGERPRINTS_NAME: Final = ".mypy-boto3-builder-services.json"
+
+# services completed by the current or interrupted run, used by `--resume`
+CHECKPOINT_NAME: Final = ".mypy-boto3-builder-checkpoint.jsonl"
+
+# service generation timings recorded in cache directory, used to predict build time
+SERVICE_TIMINGS_NAME: Final = "service-timings.json"
+
+# partial manifest saved by a shard build, used by merge
+SHARD_MANIFEST_NAME: Final = ".mypy-boto3-builder-shard.json"
+
+# CLI subcommand to assemble products from shard outputs
+MERGE_COMMAND: Final = "merge"
+
+# CLI subcommand to build service packages from a shared work queue
+WORKER_COMMAND: Final = "worker"
+
+# CLI subcommand to run end-to-end build benchmarks
+BENCH_COMMAND: Final = "bench"
+
+# end-to-end benchmark results appended by every `bench` run, stored in cache directory
+BENCH_HISTORY_NAME: Final = "bench-history.jsonl"
+
 # default timeout for HTTP requests
 REQUEST_TIMEOUT: Final = 120
 
+# interval between stack samples of a service profiler in seconds
+PROFILE_SAMPLE_INTERVAL: Final = 0.005
+
 # Sentinel value for output path for CLI
 OUTPUT_PATH_SENTINEL = Path("/tmp/output_path_sentinel")  # noqa: S108
 
@@ -0,0 +1,32 @@
+"""
+End-to-end benchmark scenario.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from enum import Enum
+
+from mypy_boto3_builder.service_name import ServiceName
+
+
+class BenchScenario(Enum):
+    """
+    End-to-end benchmark scenario.
+
+    `single` builds one large service, `essential` builds essential services,
+    `all` builds all available services.
+    """
+
+    single = "single"
+    essential = "essential"
+    all = "all"
+
+    def get_service_selection(self) -> tuple[str, ...]:
+        """
+        Get `--services` CLI values for scenario.
+        """
+        if self == BenchScenario.single:
+            return ("ec2",)
+        if self == BenchScenario.essential:
+            return (ServiceName.ESSENTIAL,)
+        return (ServiceName.ALL,)
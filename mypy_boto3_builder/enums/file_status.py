@@ -0,0 +1,18 @@
+"""
+Output file status after write.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from enum import Enum
+
+
+class FileStatus(Enum):
+    """
+    Output file status after write.
+    """
+
+    created = "created"
+    updated = "updated"
+    unchanged = "unchanged"
+    deleted = "deleted"
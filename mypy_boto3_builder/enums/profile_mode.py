@@ -0,0 +1,19 @@
+"""
+Service profiler mode.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from enum import Enum
+
+
+class ProfileMode(Enum):
+    """
+    Service profiler mode.
+
+    `sampling` mode takes stack samples with low overhead and saves flamegraphs.
+    `cprofile` mode traces every call with `cProfile` and saves `pstats` files.
+    """
+
+    sampling = "sampling"
+    cprofile = "cprofile"
@@ -0,0 +1,19 @@
+"""
+Resource class of a task graph task.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from enum import Enum
+
+
+class ResourceClass(Enum):
+    """
+    Resource class of a task graph task.
+
+    Each class is scheduled on its own worker pool.
+    """
+
+    cpu = "cpu"
+    subprocess = "subprocess"
+    io = "io"
@@ -0,0 +1,19 @@
+"""
+Task graph task status.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from enum import Enum
+
+
+class TaskStatus(Enum):
+    """
+    Task graph task status.
+    """
+
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+    cancelled = "cancelled"
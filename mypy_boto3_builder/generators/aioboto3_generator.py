@@ -37,6 +37,7 @@ class AioBoto3Generator(BaseGenerator):
 
     service_package_data = TypesAioBoto3PackageData()
     service_template_path = TemplatePath.types_aiobotocore_service
+    static_stubs_urls = (StaticStubsPullURL.types_aioboto3, StaticStubsPullURL.types_aiobotocore)
 
     def _get_static_files_path(self) -> Path:
         return self._get_or_download_static_files_path(
@@ -112,8 +113,6 @@ class AioBoto3Generator(BaseGenerator):
         Generate service and main docs.
         """
         package_data = TypesAioBoto3PackageData()
-        total_str = f"{len(self.service_names)}"
-
         self.logger.info(
             f"Generating {package_data.pypi_name} module docs",
             tags=package_data.pypi_name,
@@ -128,16 +127,17 @@ class AioBoto3Generator(BaseGenerator):
             templates_path=TemplatePath.types_aioboto3_docs,
         )
 
-        for index, service_name in enumerate(self.service_names):
-            current_str = f"{{:0{len(total_str)}}}".format(index + 1)
+        progress = self.cost_model.get_progress(self.service_names)
+        for service_name in self.service_names:
             package_name = package_data.get_service_package_name(service_name)
-            self.logger.info(f"[{current_str}/{total_str}] Generating {package_name} module docs")
+            self.logger.info(f"{progress.start()} Generating {package_name} module docs")
             self._process_service_docs(
                 service_name=service_name,
                 package_data=package_data,
                 templates_path=TemplatePath.types_aioboto3_service_docs,
                 version=self.version,
             )
+            progress.finish(service_name.name)
 
     def generate_service_stubs(self) -> NoReturn:
         """
@@ -175,6 +175,7 @@ class AioBoto3Generator(BaseGenerator):
             package=package,
             template_path=TemplatePath.types_aioboto3_custom,
             static_files_path=self._get_static_files_path(),
+            exclude_template_names=("setup.py.jinja2",),
         )
 
         aiobotocore_package = parse_types_aiobotocore_package(
@@ -187,6 +188,7 @@ class AioBoto3Generator(BaseGenerator):
             generate_package=False,
             cleanup=False,
             is_typings=False,
+            sink=self.sink,
         )
         aiobotocore_package_writer.write_package(
             package=aiobotocore_package,
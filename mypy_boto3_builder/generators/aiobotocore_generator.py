@@ -32,6 +32,7 @@ class AioBotocoreGenerator(BaseGenerator):
 
     service_package_data = TypesAioBotocorePackageData()
     service_template_path = TemplatePath.types_aiobotocore_service
+    static_stubs_urls = (StaticStubsPullURL.types_aiobotocore,)
 
     def _get_static_files_path(self) -> Path:
         return self._get_or_download_static_files_path(
@@ -101,8 +102,6 @@ class AioBotocoreGenerator(BaseGenerator):
         Generate service and main docs.
         """
         package_data = TypesAioBotocorePackageData()
-        total_str = f"{len(self.service_names)}"
-
         self.logger.info(
             f"Generating {package_data.pypi_name} module docs",
             tags=package_data.pypi_name,
@@ -117,16 +116,17 @@ class AioBotocoreGenerator(BaseGenerator):
             templates_path=TemplatePath.types_aiobotocore_docs,
         )
 
-        for index, service_name in enumerate(self.service_names):
-            current_str = f"{{:0{len(total_str)}}}".format(index + 1)
+        progress = self.cost_model.get_progress(self.service_names)
+        for service_name in self.service_names:
             package_name = package_data.get_service_package_name(service_name)
-            self.logger.info(f"[{current_str}/{total_str}] Generating {package_name} module docs")
+            self.logger.info(f"{progress.start()} Generating {package_name} module docs")
             self._process_service_docs(
                 service_name=service_name,
                 package_data=package_data,
                 templates_path=TemplatePath.types_aiobotocore_service_docs,
                 version=self.version,
             )
+            progress.finish(service_name.name)
 
     def generate_full_stubs(self) -> TypesAioBotocorePackage | None:
         """
@@ -154,6 +154,7 @@ class AioBotocoreGenerator(BaseGenerator):
         self.package_writer.write_package(
             package,
             template_path=TemplatePath.types_aiobotocore_full,
+            exclude_template_names=("setup.py.jinja2",),
         )
         self._generate_full_stubs_services(package)
         self.setup_package_writer.write_package(
@@ -185,6 +186,7 @@ class AioBotocoreGenerator(BaseGenerator):
             package=package,
             template_path=TemplatePath.types_aiobotocore_custom,
             static_files_path=self._get_static_files_path(),
+            exclude_template_names=("setup.py.jinja2",),
         )
 
         self._generate_full_stubs_services(package)
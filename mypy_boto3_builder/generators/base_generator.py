@@ -4,17 +4,26 @@ Base stubs/docs generator.
 Copyright 2024 Vlad Emelianov
 """
 
+import functools
 import shutil
 import tempfile
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
 from mypy_boto3_builder.cli_parser import CLINamespace
+from mypy_boto3_builder.constants import OUTPUT_MANIFEST_NAME, SERVICE_TIMINGS_NAME
 from mypy_boto3_builder.enums.product import Product
 from mypy_boto3_builder.enums.product_type import ProductType
-from mypy_boto3_builder.exceptions import AlreadyPublishedError
+from mypy_boto3_builder.enums.resource_class import ResourceClass
+from mypy_boto3_builder.enums.task_status import TaskStatus
+from mypy_boto3_builder.exceptions import (
+    AlreadyPublishedError,
+    BuildEnvError,
+    BuildInternalError,
+)
 from mypy_boto3_builder.logger import get_logger
 from mypy_boto3_builder.package_data import BasePackageData
 from mypy_boto3_builder.parsers.service_package_parser import ServicePackageParser
@@ -23,10 +32,26 @@ from mypy_boto3_builder.service_name import ServiceName
 from mypy_boto3_builder.structures.package import Package
 from mypy_boto3_builder.structures.package_extra import PackageExtra
 from mypy_boto3_builder.structures.packages.service_package import ServicePackage
-from mypy_boto3_builder.utils.github import download_and_extract
+from mypy_boto3_builder.utils.build_report import BuildReport
+from mypy_boto3_builder.utils.content_store import ContentStore
+from mypy_boto3_builder.utils.cost_model import CostModel, CostProgress
+from mypy_boto3_builder.utils.github import download_and_extract, download_and_extract_cached
+from mypy_boto3_builder.utils.memory import MemoryBudget
 from mypy_boto3_builder.utils.package_builder import PackageBuilder
+from mypy_boto3_builder.utils.path import print_path
 from mypy_boto3_builder.utils.pypi_manager import PyPIManager
+from mypy_boto3_builder.utils.service_profiler import ServiceProfiler
+from mypy_boto3_builder.utils.shards import ShardFullPackage, ShardManifest, ShardProduct
+from mypy_boto3_builder.utils.task_graph import Task, TaskGraph
+from mypy_boto3_builder.utils.version_planner import VersionPlan, VersionPlanner
+from mypy_boto3_builder.utils.work_queue import WorkJob, WorkQueue
 from mypy_boto3_builder.writers.package_writer import PackageWriter
+from mypy_boto3_builder.writers.sinks.directory import DirectorySink
+from mypy_boto3_builder.writers.sinks.memory import MemorySink
+
+if TYPE_CHECKING:
+    from mypy_boto3_builder.utils.build_checkpoint import BuildCheckpoint
+    from mypy_boto3_builder.writers.sinks.base import BaseSink
 
 
 class BaseGenerator(ABC):
@@ -43,6 +68,8 @@ class BaseGenerator(ABC):
 
     service_package_data: ClassVar[BasePackageData]
     service_template_path: ClassVar[Path]
+    static_stubs_urls: ClassVar[tuple[str, ...]] = ()
+    _parsed_service_packages: ClassVar[dict[str, ServicePackage]] = {}
 
     def __init__(
         self,
@@ -54,7 +81,6 @@ class BaseGenerator(ABC):
         *,
         cleanup: bool,
     ) -> None:
-        self.__temp_path: Path | None = None
         self._cleanup_dirs: list[Path] = []
         self._downloaded_static_files_path: Path | None = None
 
@@ -65,15 +91,33 @@ class BaseGenerator(ABC):
         self.logger = get_logger()
         self.version = version or self._get_library_version()
         self.cleanup = cleanup
+        self.content_store = ContentStore(config.cache_path) if config.cache_path else None
+        self.sink: BaseSink = (
+            MemorySink()
+            if self.is_package_temporary()
+            else DirectorySink(
+                store=self._get_link_store(), manifest_path=self._get_manifest_path()
+            )
+        )
         self.package_writer = PackageWriter(
             output_path=self.output_path,
             generate_package=self.is_package(),
             cleanup=cleanup,
+            sink=self.sink,
         )
         self.setup_package_writer = PackageWriter(
             output_path=self.output_path,
             generate_package=self.is_package(),
             cleanup=False,
+            sink=self.sink,
+        )
+        self.shard_product: ShardProduct | None = ShardProduct() if config.shard else None
+        self.shard_manifests: list[ShardManifest] = []
+        self.keep_parsed_service_names: set[str] = set()
+        self.checkpoint: BuildCheckpoint | None = None
+        self.failed_services: dict[ServiceName, BaseException] = {}
+        self.cost_model = CostModel.load(
+            config.cache_path / SERVICE_TIMINGS_NAME if config.cache_path else None
         )
 
     def is_package(self) -> bool:
@@ -84,6 +128,24 @@ class BaseGenerator(ABC):
             return False
         return not any(output_type.is_installed() for output_type in self.config.output_types)
 
+    def _get_link_store(self) -> ContentStore | None:
+        """
+        Get content store to hardlink static files from, only if it is requested.
+        """
+        if not self.config.link_static:
+            return None
+        if any(output_type.is_installed() for output_type in self.config.output_types):
+            return None
+        return self.content_store
+
+    def _get_manifest_path(self) -> Path | None:
+        """
+        Get output manifest path, manifests are not written to installed packages.
+        """
+        if any(output_type.is_installed() for output_type in self.config.output_types):
+            return None
+        return self.output_path / OUTPUT_MANIFEST_NAME
+
     def is_packaged(self) -> bool:
         """
         Whether to build wheel or sdist.
@@ -96,20 +158,13 @@ class BaseGenerator(ABC):
         """
         return not any(output_type.is_preserved() for output_type in self.config.output_types)
 
-    @property
-    def _temp_path(self) -> Path:
-        if not self.__temp_path:
-            self.__temp_path = Path(tempfile.TemporaryDirectory(delete=False).name)
-            self._cleanup_dirs.append(self.__temp_path)
-        return self.__temp_path
-
     @property
     def output_path(self) -> Path:
         """
         Output path.
+
+        Temporary packages are kept in memory sink under this path and are never written to disk.
         """
-        if self.is_package_temporary():
-            return self._temp_path
         return self.config.output_path
 
     def _get_or_download_static_files_path(
@@ -127,14 +182,55 @@ class BaseGenerator(ABC):
             return self._downloaded_static_files_path
 
         self.logger.debug(f"Downloading static files from {download_url}")
-        temp_dir_path = Path(tempfile.TemporaryDirectory(delete=False).name)
-        self._cleanup_dirs.append(temp_dir_path)
-        self._downloaded_static_files_path = download_and_extract(download_url, temp_dir_path)
+        if self.content_store:
+            self._downloaded_static_files_path = download_and_extract_cached(
+                download_url, self.content_store
+            )
+        else:
+            temp_dir_path = Path(tempfile.TemporaryDirectory(delete=False).name)
+            self._cleanup_dirs.append(temp_dir_path)
+            self._downloaded_static_files_path = download_and_extract(download_url, temp_dir_path)
 
         self.logger.debug(f"Downloaded static files to {self._downloaded_static_files_path}")
 
         return self._downloaded_static_files_path
 
+    def get_prefetch_urls(self, product_type: ProductType) -> list[str]:
+        """
+        Get URLs that are going to be fetched to generate a product type.
+
+        Covers static stubs archives and PyPI metadata for smart versioning.
+        """
+        result: list[str] = []
+        if self.config.download_static_stubs and product_type in {
+            ProductType.stubs,
+            ProductType.stubs_lite,
+            ProductType.custom,
+        }:
+            result.extend(self.static_stubs_urls)
+
+        if self.config.disable_smart_version:
+            return result
+
+        package_data = self.service_package_data
+        pypi_names: list[str] = []
+        match product_type:
+            case ProductType.stubs:
+                pypi_names.append(package_data.pypi_stubs_name)
+            case ProductType.stubs_lite:
+                pypi_names.append(package_data.pypi_lite_name)
+            case ProductType.full:
+                pypi_names.append(package_data.pypi_full_name)
+            case ProductType.service_stubs:
+                pypi_names.extend(
+                    package_data.get_service_pypi_name(service_name)
+                    for service_name in self.service_names
+                )
+            case ProductType.docs | ProductType.custom:
+                pass
+        result.extend(PyPIManager(pypi_name).json_url for pypi_name in pypi_names if pypi_name)
+        return result
+
     @abstractmethod
     def _get_postprocessor(self, service_package: ServicePackage) -> BasePostprocessor:
         """
@@ -147,21 +243,28 @@ class BaseGenerator(ABC):
         """
         return self.service_package_data.get_library_version()
 
-    def _get_package_build_version(self, pypi_name: str) -> str:
+    def _get_version_plan(self, pypi_names: Iterable[str]) -> VersionPlan:
+        """
+        Resolve build versions for PyPI packages before generation.
+        """
         if self.config.disable_smart_version:
-            return self.version
-        pypi_manager = PyPIManager(pypi_name)
-        if not pypi_manager.has_version(self.version):
-            return self.version
+            return VersionPlan(versions=dict.fromkeys(pypi_names, self.version))
 
-        if self.config.skip_published:
+        version_planner = VersionPlanner(self.version, skip_published=self.config.skip_published)
+        version_plan = version_planner.resolve(pypi_names)
+        for pypi_name in version_plan.published:
             self.logger.info(
                 f"Skipping {pypi_name}: {self.version} is already on PyPI",
                 tags=pypi_name,
             )
+        return version_plan
+
+    def _get_package_build_version(self, pypi_name: str) -> str:
+        version = self._get_version_plan((pypi_name,)).get_version(pypi_name)
+        if version is None:
             raise AlreadyPublishedError(f"{pypi_name} {self.version} is already on PyPI")
 
-        return pypi_manager.get_next_version(self.version)
+        return version
 
     @abstractmethod
     def generate_stubs(self) -> Package | None:
@@ -188,18 +291,25 @@ class BaseGenerator(ABC):
         """
 
     def _generate_full_stubs_services(self, package: Package) -> None:
+        if self.shard_manifests:
+            self._merge_full_stubs_services(package)
+            return
+
         service_package_writer = PackageWriter(
             output_path=self.output_path / package.directory_name,
             generate_package=False,
             cleanup=False,
+            sink=self.sink,
         )
-        total_str = f"{len(self.service_names)}"
-        for index, service_name in enumerate(self.service_names):
-            current_str = f"{{:0{len(total_str)}}}".format(index + 1)
-            progress_str = f"[{current_str}/{total_str}]"
-
+        shard_full_package: ShardFullPackage | None = None
+        if self.shard_product is not None:
+            shard_full_package = self.shard_product.full_packages.setdefault(
+                package.directory_name, ShardFullPackage()
+            )
+        progress = self.cost_model.get_progress(self.service_names)
+        for service_name in self.service_names:
             self.logger.info(
-                f"{progress_str} Generating {service_name.boto3_name} service directory",
+                f"{progress.start()} Generating {service_name.boto3_name} service directory",
                 tags=service_name.boto3_name,
             )
             service_package = self._parse_service_package(
@@ -215,6 +325,67 @@ class BaseGenerator(ABC):
                 templates_path=self.service_template_path,
             )
             package.install_requires.update(service_package.install_requires)
+            progress.finish(service_name.name)
+            if shard_full_package:
+                shard_full_package.service_directories.append(service_package.name)
+                shard_full_package.add_install_requires(
+                    service_package.install_requires.iterate_items()
+                )
+
+    def _copy_shard_directory(self, source_path: Path, target_path: Path) -> None:
+        """
+        Copy files generated by a shard to output sink.
+        """
+        if not source_path.is_dir():
+            raise BuildEnvError(f"Shard output not found: {print_path(source_path)}")
+        for path in sorted(source_path.rglob("*")):
+            if not path.is_file() or path.name == OUTPUT_MANIFEST_NAME:
+                continue
+            self.sink.write_bytes(target_path / path.relative_to(source_path), path.read_bytes())
+
+    def _merge_full_stubs_services(self, package: Package) -> None:
+        """
+        Copy service directories of a full package built by shards without parsing services.
+        """
+        for manifest in self.shard_manifests:
+            shard_product = manifest.get_product(self.product.value)
+            shard_full_package = shard_product.full_packages.get(package.directory_name)
+            if shard_full_package is None:
+                raise BuildEnvError(
+                    f"Shard {manifest.shard} has no {package.directory_name} service directories"
+                )
+            self.logger.info(
+                f"Merging {len(shard_full_package.service_directories)} service directories"
+                f" from shard {manifest.shard}",
+                tags=package.directory_name,
+            )
+            for directory_name in shard_full_package.service_directories:
+                self._copy_shard_directory(
+                    manifest.output_path / package.directory_name / directory_name,
+                    self.output_path / package.directory_name / directory_name,
+                )
+            package.install_requires.add(*shard_full_package.get_install_requires())
+
+    def merge_service_stubs(self) -> list[str]:
+        """
+        Copy service packages built by shards to output path without parsing services.
+
+        Returns:
+            Merged package directory names.
+        """
+        result: list[str] = []
+        for manifest in self.shard_manifests:
+            for directory_name in manifest.get_product(self.product.value).package_directories:
+                self.logger.info(
+                    f"Merging {directory_name} from shard {manifest.shard}",
+                    tags=directory_name,
+                )
+                target_path = self.output_path / directory_name
+                self._copy_shard_directory(manifest.output_path / directory_name, target_path)
+                if self.cleanup:
+                    self.sink.add_cleanup_path(target_path)
+                result.append(directory_name)
+        return result
 
     @abstractmethod
     def generate_docs(self) -> None:
@@ -222,9 +393,12 @@ class BaseGenerator(ABC):
         Generate service and main docs.
         """
 
-    def generate_product(self, product_type: ProductType) -> None:
+    def _generate_product_directories(self, product_type: ProductType) -> list[str]:
         """
-        Run generator for a product type.
+        Generate or merge packages for a product type.
+
+        Returns:
+            Generated package directory names.
         """
         packages: list[Package | None] = []
         match product_type:
@@ -232,30 +406,123 @@ class BaseGenerator(ABC):
                 packages.append(self.generate_stubs())
             case ProductType.stubs_lite:
                 packages.append(self.generate_stubs_lite())
+            case ProductType.service_stubs if self.shard_manifests:
+                return self.merge_service_stubs()
+            case ProductType.service_stubs if self.config.work_queue_path:
+                return self.distribute_service_stubs(self.config.work_queue_path)
             case ProductType.service_stubs:
-                packages.extend(self.generate_service_stubs())
+                return self.generate_service_stubs()
             case ProductType.docs:
                 self.generate_docs()
             case ProductType.full:
                 packages.append(self.generate_full_stubs())
             case ProductType.custom:
                 packages.append(self.generate_custom_stubs())
+        return [package.directory_name for package in packages if package]
+
+    def _get_build_directory_names(
+        self,
+        product_type: ProductType,
+        directory_names: Sequence[str],
+    ) -> list[str]:
+        """
+        Record shard output and get package directory names to build.
+
+        Full packages generated by a shard are partial, so they are built only by `merge`.
+        """
+        if self.shard_product is None:
+            return list(directory_names)
+        if product_type != ProductType.service_stubs:
+            return []
+        self.shard_product.package_directories.extend(directory_names)
+        return list(directory_names)
+
+    def generate_product(self, product_type: ProductType) -> None:
+        """
+        Run generator for a product type.
 
-        generated_packages = list(filter(None, packages))
-        if self.is_packaged() and generated_packages:
+        Shards skip wrapper and docs products, `merge` assembles them from shard outputs.
+        """
+        if self.shard_product is not None and product_type in {
+            ProductType.stubs,
+            ProductType.stubs_lite,
+            ProductType.docs,
+        }:
+            self.logger.info(
+                f"Skipping {self.product.value} in shard {self.config.shard},"
+                " it is generated by merge",
+                tags=self.product.value,
+            )
+            return
+
+        directory_names = self._generate_product_directories(product_type)
+        build_directory_names = self._get_build_directory_names(product_type, directory_names)
+        self.sink.cleanup()
+        if self.is_packaged() and build_directory_names:
             package_builder = PackageBuilder(
                 build_path=self.output_path,
                 output_path=self.config.output_path,
+                sink=self.sink,
             )
-            for package in generated_packages:
-                package_builder.build(package, self.config.output_types)
+            package_builder.build_directories(build_directory_names, self.config.output_types)
 
-    def _parse_service_package(
+        if isinstance(self.sink, MemorySink):
+            for directory_name in directory_names:
+                self.sink.clear(self.output_path / directory_name)
+        else:
+            self.logger.info(
+                f"Output files in {print_path(self.output_path)}: {self.sink.get_summary()}"
+            )
+
+    def get_parsed_service_names(self) -> set[str]:
+        """
+        Get names of services parsed by this product.
+        """
+        if self.shard_manifests:
+            return set()
+        if self.product.get_type() in {ProductType.stubs, ProductType.stubs_lite}:
+            return set()
+        return {service_name.name for service_name in self.service_names}
+
+    @staticmethod
+    def share_parsed_service_packages(generators: Sequence["BaseGenerator"]) -> None:
+        """
+        Keep parsed service packages only for services parsed by next products.
+
+        A shared service package is released by the last product that parses it.
+        """
+        next_service_names: set[str] = set()
+        for generator in reversed(generators):
+            generator.keep_parsed_service_names = set(next_service_names)
+            next_service_names.update(generator.get_parsed_service_names())
+
+    @classmethod
+    def clear_parsed_service_packages(cls) -> None:
+        """
+        Clear parsed service packages shared between products.
+        """
+        BaseGenerator._parsed_service_packages.clear()
+
+    def _get_parsed_service_package(
         self,
         service_name: ServiceName,
         version: str,
         package_data: BasePackageData,
     ) -> ServicePackage:
+        """
+        Parse product-independent service package or get it from cache.
+        """
+        parsed_service_packages = BaseGenerator._parsed_service_packages
+        is_kept = service_name.name in self.keep_parsed_service_names
+        if service_name.name in parsed_service_packages:
+            self.logger.debug(
+                f"Reusing parsed {service_name.boto3_name} botocore service",
+                tags=service_name.boto3_name,
+            )
+            if is_kept:
+                return parsed_service_packages[service_name.name]
+            return parsed_service_packages.pop(service_name.name)
+
         self.logger.debug(
             f"Parsing {service_name.boto3_name} botocore service",
             tags=service_name.boto3_name,
@@ -264,19 +531,42 @@ class BaseGenerator(ABC):
         service_package = parser.parse()
 
         postprocessor = self._get_postprocessor(service_package)
-        postprocessor.generate_docstrings()
-        postprocessor.process_package()
+        with BuildReport.stage("postprocess"):
+            postprocessor.postprocess_parsed()
 
-        postprocessor.extend_literals()
-        postprocessor.replace_self_ref_typed_dicts()
+        if is_kept:
+            parsed_service_packages[service_name.name] = service_package
         return service_package
 
-    def _process_service(
+    def _parse_service_package(
+        self,
+        service_name: ServiceName,
+        version: str,
+        package_data: BasePackageData,
+    ) -> ServicePackage:
+        MemoryBudget.check()
+        with (
+            BuildReport.service(service_name.name),
+            ServiceProfiler.service(service_name.name),
+        ):
+            parsed_service_package = self._get_parsed_service_package(
+                service_name=service_name,
+                version=version,
+                package_data=package_data,
+            )
+            with BuildReport.stage("fork"):
+                service_package = parsed_service_package.fork(package_data, version)
+
+            postprocessor = self._get_postprocessor(service_package)
+            with BuildReport.stage("postprocess"):
+                postprocessor.postprocess()
+        return service_package
+
+    def _parse_service(
         self,
         service_name: ServiceName,
         version: str,
         package_data: BasePackageData,
-        templates_path: Path,
     ) -> ServicePackage:
         service_package = self._parse_service_package(
             service_name=service_name,
@@ -284,6 +574,20 @@ class BaseGenerator(ABC):
             package_data=package_data,
         )
         service_package.mark_safe_typed_dicts()
+        return service_package
+
+    def _process_service(
+        self,
+        service_name: ServiceName,
+        version: str,
+        package_data: BasePackageData,
+        templates_path: Path,
+    ) -> ServicePackage:
+        service_package = self._parse_service(
+            service_name=service_name,
+            version=version,
+            package_data=package_data,
+        )
 
         self.logger.debug(
             f"Writing {service_name.boto3_name} service package",
@@ -318,32 +622,221 @@ class BaseGenerator(ABC):
         )
         return service_package
 
-    def generate_service_stubs(self) -> list[ServicePackage]:
+    def _plan_service_stubs(self) -> dict[ServiceName, str]:
         """
-        Generate service stubs.
+        Resolve build versions for service packages.
+
+        Returns:
+            Service name to build version mapping without already published packages.
         """
-        total_str = f"{len(self.service_names)}"
-        packages: list[ServicePackage] = []
-        for index, service_name in enumerate(self.service_names):
-            current_str = f"{{:0{len(total_str)}}}".format(index + 1)
-            progress_str = f"[{current_str}/{total_str}]"
+        pypi_names = {
+            service_name: self.service_package_data.get_service_pypi_name(service_name)
+            for service_name in self.service_names
+        }
+        version_plan = self._get_version_plan(pypi_names.values())
+        result: dict[ServiceName, str] = {}
+        for service_name, pypi_name in pypi_names.items():
+            version = version_plan.get_version(pypi_name)
+            if version:
+                result[service_name] = version
+        return result
+
+    def _skip_completed_service_stubs(self, service_versions: dict[ServiceName, str]) -> list[str]:
+        """
+        Remove service packages completed by a previous run from `service_versions`.
+
+        Returns:
+            Completed package directory names.
+        """
+        if not self.checkpoint:
+            return []
+        result: list[str] = []
+        for service_name, version in list(service_versions.items()):
+            entry = self.checkpoint.get_completed(self.product.value, service_name.name, version)
+            if entry is None:
+                continue
+            del service_versions[service_name]
+            result.append(entry.directory_name)
+        if result:
+            self.logger.info(
+                f"Skipping {len(result)} {self.product.value} services completed by previous run",
+                tags=self.product.value,
+            )
+        return result
 
+    def _record_failed_service(self, service_name: ServiceName, error: BaseException) -> None:
+        pypi_name = self.service_package_data.get_service_pypi_name(service_name)
+        self.logger.error(f"Failed to generate {pypi_name}: {error}", tags=pypi_name)
+        self.failed_services[service_name] = error
+
+    def generate_service_stubs(self) -> list[str]:
+        """
+        Generate service stubs.
+
+        Parsed service packages are released as soon as they are written,
+        unless next products parse the same services.
+        If memory budget is approached, next services wait for running ones to finish.
+        Services completed by a resumed build are skipped. With `keep_going` config,
+        failed services are recorded to `failed_services` and the rest are still generated.
+
+        Returns:
+            Generated package directory names.
+        """
+        service_versions = self._plan_service_stubs()
+        completed_directory_names = self._skip_completed_service_stubs(service_versions)
+        service_names = self.cost_model.sort(service_versions)
+        progress = self.cost_model.get_progress(service_names)
+        graph = TaskGraph(
+            f"{self.product.value}-services",
+            max_workers={ResourceClass.cpu: 1, ResourceClass.io: 1},
+            throttle=MemoryBudget.check if MemoryBudget.is_enabled() else None,
+            keep_going=self.config.keep_going,
+        )
+        write_tasks: list[Task] = []
+        service_tasks: dict[ServiceName, list[Task]] = {}
+        for service_name in service_names:
             pypi_name = self.service_package_data.get_service_pypi_name(service_name)
-            try:
-                version = self._get_package_build_version(pypi_name)
-            except AlreadyPublishedError:
+            parse_task = graph.add(
+                f"parse:{pypi_name}",
+                self._generate_service_package,
+                service_name,
+                service_versions[service_name],
+                progress,
+            )
+            render_task = graph.add(
+                f"render:{pypi_name}",
+                functools.partial(
+                    self.package_writer.render_service_package,
+                    templates_path=self.service_template_path,
+                ),
+                dependencies=(parse_task,),
+            )
+            format_task = graph.add(
+                f"format:{pypi_name}",
+                self.package_writer.format_service_package,
+                dependencies=(parse_task, render_task),
+                resource_class=ResourceClass.subprocess,
+            )
+            write_task = graph.add(
+                f"write:{pypi_name}",
+                self._write_service_package,
+                service_name,
+                progress,
+                dependencies=(parse_task, format_task),
+                resource_class=ResourceClass.io,
+                keep_result=True,
+            )
+            write_tasks.append(write_task)
+            service_tasks[service_name] = [parse_task, render_task, format_task, write_task]
+
+        graph.run()
+        for service_name, tasks in service_tasks.items():
+            error = next((task.error for task in tasks if task.error), None)
+            if error:
+                self._record_failed_service(service_name, error)
                 continue
+            self.cost_model.record(service_name, sum(task.duration for task in tasks))
+        self.cost_model.save()
+        if self.config.task_graph_path:
+            graph.dump(self.config.task_graph_path / f"{graph.name}.json")
+        return [
+            *completed_directory_names,
+            *(task.result for task in write_tasks if task.status == TaskStatus.done),
+        ]
+
+    def distribute_service_stubs(self, work_queue_path: Path) -> list[str]:
+        """
+        Generate service stubs through a shared work queue.
 
-            self.logger.info(f"{progress_str} Generating {pypi_name} {version}", tags=pypi_name)
-            package = self._process_service(
-                service_name=service_name,
-                version=version,
-                package_data=self.service_package_data,
-                templates_path=self.service_template_path,
+        This process works on the queue too, so idle workers pick the remaining jobs
+        while slow services are still being generated.
+
+        Arguments:
+            work_queue_path -- Work queue directory.
+
+        Returns:
+            Generated package directory names.
+        """
+        service_versions = self._plan_service_stubs()
+        service_names = {
+            service_name.name: service_name
+            for service_name in self.cost_model.sort(service_versions)
+        }
+        jobs = [
+            WorkJob(
+                job_id=f"{index:04d}-{self.product.value}-{service_name.name}",
+                product=self.product.value,
+                service_name=service_name.name,
+                version=service_versions[service_name],
+                output_path=self.output_path.as_posix(),
             )
-            packages.append(package)
+            for index, service_name in enumerate(service_names.values())
+        ]
+        self.logger.info(
+            f"Queued {len(jobs)} {self.product.value} jobs to {print_path(work_queue_path)}",
+            tags=self.product.value,
+        )
+        results = WorkQueue(work_queue_path).run(jobs, self.process_work_job)
+        for worker, count in sorted(Counter(result.worker for result in results).items()):
+            self.logger.debug(f"Worker {worker} processed {count} jobs", tags=worker)
+        for job, result in zip(jobs, results, strict=True):
+            self.cost_model.record(service_names[job.service_name], result.duration)
+        self.cost_model.save()
+        return [result.directory_name for result in results]
+
+    def process_work_job(self, job: WorkJob) -> str:
+        """
+        Generate service package for a work queue job.
+
+        Returns:
+            Generated package directory name.
+        """
+        service_names = {service_name.name: service_name for service_name in self.service_names}
+        if job.product != self.product.value or job.service_name not in service_names:
+            raise BuildInternalError(f"Job {job.job_id} cannot be processed by {self.product}")
+        if Path(job.output_path) != self.output_path:
+            raise BuildInternalError(f"Job {job.job_id} output path is {job.output_path}")
+
+        service_name = service_names[job.service_name]
+        pypi_name = self.service_package_data.get_service_pypi_name(service_name)
+        self.logger.info(f"Generating {pypi_name} {job.version} from queue", tags=pypi_name)
+        service_package = self._process_service(
+            service_name=service_name,
+            version=job.version,
+            package_data=self.service_package_data,
+            templates_path=self.service_template_path,
+        )
+        self.sink.cleanup()
+        return service_package.directory_name
+
+    def _generate_service_package(
+        self,
+        service_name: ServiceName,
+        version: str,
+        progress: CostProgress,
+    ) -> ServicePackage:
+        pypi_name = self.service_package_data.get_service_pypi_name(service_name)
+        self.logger.info(f"{progress.start()} Generating {pypi_name} {version}", tags=pypi_name)
+        return self._parse_service(
+            service_name=service_name,
+            version=version,
+            package_data=self.service_package_data,
+        )
 
-        return packages
+    def _write_service_package(
+        self,
+        service_name: ServiceName,
+        progress: CostProgress,
+        package: ServicePackage,
+        contents: Mapping[Path, str],
+    ) -> str:
+        self.package_writer.write_service_package_files(package, contents)
+        if self.checkpoint:
+            self.checkpoint.add_completed(
+                self.product.value, service_name.name, package.version, package.directory_name
+            )
+        progress.finish(service_name.name)
+        return package.directory_name
 
     def cleanup_temporary_files(self) -> None:
         """
@@ -32,6 +32,7 @@ class TypesBoto3Generator(BaseGenerator):
 
     service_package_data = TypesBoto3PackageData()
     service_template_path = TemplatePath.types_boto3_service
+    static_stubs_urls = (StaticStubsPullURL.types_boto3,)
 
     def _get_postprocessor(self, service_package: ServicePackage) -> BotocorePostprocessor:
         """
@@ -104,8 +105,6 @@ class TypesBoto3Generator(BaseGenerator):
         Generate service and main docs.
         """
         package_data = TypesBoto3PackageData()
-        total_str = f"{len(self.service_names)}"
-
         self.logger.info(
             f"Generating {package_data.pypi_name} package docs",
             tags=package_data.pypi_name,
@@ -121,16 +120,17 @@ class TypesBoto3Generator(BaseGenerator):
             templates_path=TemplatePath.types_boto3_docs,
         )
 
-        for index, service_name in enumerate(self.service_names):
-            current_str = f"{{:0{len(total_str)}}}".format(index + 1)
+        progress = self.cost_model.get_progress(self.service_names)
+        for service_name in self.service_names:
             package_name = package_data.get_service_package_name(service_name)
-            self.logger.info(f"[{current_str}/{total_str}] Generating {package_name} module docs")
+            self.logger.info(f"{progress.start()} Generating {package_name} module docs")
             self._process_service_docs(
                 service_name=service_name,
                 package_data=package_data,
                 templates_path=TemplatePath.types_boto3_service_docs,
                 version=self.version,
             )
+            progress.finish(service_name.name)
 
     def generate_full_stubs(self) -> TypesBoto3Package | None:
         """
@@ -159,6 +159,7 @@ class TypesBoto3Generator(BaseGenerator):
             package=package,
             template_path=TemplatePath.types_boto3_full,
             static_files_path=None,
+            exclude_template_names=("setup.py.jinja2",),
         )
         self._generate_full_stubs_services(package)
         self.setup_package_writer.write_package(
@@ -190,6 +191,7 @@ class TypesBoto3Generator(BaseGenerator):
             package=package,
             template_path=TemplatePath.types_boto3_custom,
             static_files_path=self._get_static_files_path(),
+            exclude_template_names=("setup.py.jinja2",),
         )
 
         self._generate_full_stubs_services(package)
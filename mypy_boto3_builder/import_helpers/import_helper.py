@@ -16,19 +16,19 @@ class Import:
     Wrapper for ImportString usage.
     """
 
-    future: Final = ImportString(ImportParent.future.value)
-    builtins: Final = ImportString(ImportParent.builtins.value)
-    boto3: Final = ImportString(ImportParent.boto3.value)
-    botocore: Final = ImportString(ImportParent.botocore.value)
-    typing: Final = ImportString(ImportParent.typing.value)
-    awscrt: Final = ImportString(ImportParent.awscrt.value)
-    s3transfer: Final = ImportString(ImportParent.s3transfer.value)
-    aiobotocore: Final = ImportString(ImportParent.aiobotocore.value)
-    aioboto3: Final = ImportString(ImportParent.aioboto3.value)
-    typing_extensions: Final = ImportString(ImportParent.typing_extensions.value)
-    types: Final = ImportString(ImportParent.types.value)
-    sys: Final = ImportString(ImportParent.sys.value)
-    collections_abc: Final = ImportString(ImportParent.collections.value, "abc")
+    future: Final = ImportString.intern(ImportParent.future.value)
+    builtins: Final = ImportString.intern(ImportParent.builtins.value)
+    boto3: Final = ImportString.intern(ImportParent.boto3.value)
+    botocore: Final = ImportString.intern(ImportParent.botocore.value)
+    typing: Final = ImportString.intern(ImportParent.typing.value)
+    awscrt: Final = ImportString.intern(ImportParent.awscrt.value)
+    s3transfer: Final = ImportString.intern(ImportParent.s3transfer.value)
+    aiobotocore: Final = ImportString.intern(ImportParent.aiobotocore.value)
+    aioboto3: Final = ImportString.intern(ImportParent.aioboto3.value)
+    typing_extensions: Final = ImportString.intern(ImportParent.typing_extensions.value)
+    types: Final = ImportString.intern(ImportParent.types.value)
+    sys: Final = ImportString.intern(ImportParent.sys.value)
+    collections_abc: Final = ImportString.intern(ImportParent.collections.value, "abc")
 
     @classmethod
     def local(cls, module_name: str) -> ImportString:
@@ -37,7 +37,7 @@ class Import:
         """
         if not module_name:
             raise StructureError("Module name cannot be empty for local import")
-        return ImportString("", module_name)
+        return ImportString.intern("", module_name)
 
     @classmethod
     def from_str(cls, import_string: str) -> ImportString:
@@ -53,4 +53,4 @@ class Import:
         """
         if not parent:
             raise StructureError("Parent cannot be empty")
-        return ImportString(parent, *parts)
+        return ImportString.intern(parent, *parts)
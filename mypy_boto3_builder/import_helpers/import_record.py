@@ -6,7 +6,7 @@ Copyright 2024 Vlad Emelianov
 
 import copy
 import functools
-from typing import Self
+from typing import ClassVar, Self
 
 from mypy_boto3_builder.exceptions import StructureError
 from mypy_boto3_builder.import_helpers.import_string import ImportString
@@ -26,6 +26,10 @@ class ImportRecord:
         fallback -- Fallback ImportRecord.
     """
 
+    __slots__ = ("alias", "fallback", "min_version", "name", "source")
+
+    _interned: ClassVar[dict[tuple[object, ...], "ImportRecord"]] = {}
+
     def __init__(
         self,
         source: ImportString,
@@ -40,6 +44,52 @@ class ImportRecord:
         self.min_version = min_version
         self.fallback = fallback
 
+    @classmethod
+    def intern(
+        cls,
+        source: ImportString,
+        name: str = "",
+        alias: str = "",
+        min_version: VersionParts = (),
+        fallback: "ImportRecord | None" = None,
+    ) -> "ImportRecord":
+        """
+        Get a shared instance for equal import records.
+
+        Shared instances must not be changed, use `copy` to get a mutable one.
+
+        Arguments:
+            source -- Source of import.
+            name -- Import name.
+            alias -- Import local name.
+            min_version -- Minimum Python version, used for fallback.
+            fallback -- Fallback ImportRecord.
+        """
+        key = (
+            source.parts,
+            name,
+            alias,
+            min_version,
+            fallback.get_intern_key() if fallback else None,
+        )
+        result = cls._interned.get(key)
+        if result is None:
+            result = ImportRecord(source, name, alias, min_version, fallback)
+            cls._interned[key] = result
+        return result
+
+    def get_intern_key(self) -> tuple[object, ...]:
+        """
+        Get key that identifies equal import records.
+        """
+        return (
+            self.source.parts,
+            self.name,
+            self.alias,
+            self.min_version,
+            self.fallback.get_intern_key() if self.fallback else None,
+        )
+
     def render_name(self) -> str:
         """
         Get rendered import name.
@@ -87,6 +137,9 @@ class ImportRecord:
         """
         Whether two import records produce the same render.
         """
+        if self is other:
+            return True
+
         if not isinstance(other, ImportRecord):
             return False
 
@@ -5,7 +5,7 @@ Copyright 2024 Vlad Emelianov
 """
 
 import functools
-from typing import Final, Self
+from typing import ClassVar, Final, Self
 
 from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
 from mypy_boto3_builder.exceptions import BuildInternalError, StructureError
@@ -37,6 +37,10 @@ class ImportString:
         'my.name'
     """
 
+    __slots__ = ("parts",)
+
+    _interned: ClassVar[dict[tuple[str, ...], "ImportString"]] = {}
+
     def __init__(self, parent: str, *parts: str) -> None:
         all_parts = (parent, *parts)
         if not parent and not parts:
@@ -54,6 +58,22 @@ class ImportString:
 
         self.parts: Final[tuple[str, ...]] = tuple(all_parts)
 
+    @classmethod
+    def intern(cls, parent: str, *parts: str) -> "ImportString":
+        """
+        Get a shared instance for equal import strings.
+
+        Arguments:
+            parent -- Parent module name
+            parts -- Other import parts
+        """
+        key = (parent, *parts)
+        result = cls._interned.get(key)
+        if result is None:
+            result = cls(parent, *parts)
+            cls._interned[key] = result
+        return result
+
     def __str__(self) -> str:
         """
         Render as a part of a valid Python import statement.
@@ -70,6 +90,9 @@ class ImportString:
         """
         Whether import strings produce the same render.
         """
+        if self is other:
+            return True
+
         if not isinstance(other, ImportString):
             raise BuildInternalError(f"{other} is not ImportString")
 
@@ -94,12 +117,12 @@ class ImportString:
 
         return self.parts > other.parts
 
-    def __add__(self, other: Self | str) -> Self:
+    def __add__(self, other: "ImportString | str") -> "ImportString":
         """
         Create a new import string by adding another import string parts to the end.
         """
-        other_import_string = other if isinstance(other, ImportString) else ImportString(other)
-        return self.__class__(*self.parts, *other_import_string.parts)
+        other_parts = other.parts if isinstance(other, ImportString) else (other,)
+        return self.intern(*self.parts, *other_parts)
 
     def render(self) -> str:
         """
@@ -9,21 +9,25 @@ from __future__ import annotations
 import functools
 import logging
 import sys
+from typing import ClassVar
 
 import loguru
 
 from mypy_boto3_builder.constants import LOGGER_NAME
 
-__all__ = ("get_logger", "setup_logger")
+__all__ = ("get_logger", "is_debug_enabled", "setup_logger")
 
 
-def _formatter(name: str, record: loguru.Record) -> str:
-    tags = record["extra"].get("tags") or ()
-    if isinstance(tags, str):
-        tags = (tags,)
-    message = record["message"]
-    for tag in tags:
-        message = message.replace(f"{tag}", f"<cyan>{tag}</cyan>", 1)
+class _LoggerState:
+    """
+    Logger level and status set by this module.
+    """
+
+    level: ClassVar[int] = logging.DEBUG
+    enabled: ClassVar[bool] = True
+
+
+def _render_format(name: str, message: str) -> str:
     return (
         "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
         "<level>{level: <8}</level> | "
@@ -33,10 +37,34 @@ def _formatter(name: str, record: loguru.Record) -> str:
     )
 
 
+@functools.cache
+def _get_static_format(name: str) -> str:
+    return _render_format(name, "{message}")
+
+
+def _formatter(name: str, record: loguru.Record) -> str:
+    """
+    Get record format with highlighted tags.
+
+    Messages without tags share the same format, so `loguru` parses it only once.
+    """
+    tags = record["extra"].get("tags")
+    if not tags:
+        return _get_static_format(name)
+    if isinstance(tags, str):
+        tags = (tags,)
+    message = record["message"]
+    for tag in dict.fromkeys(str(i) for i in tags):
+        if tag:
+            message = message.replace(tag, f"<cyan>{tag}</cyan>", 1)
+    return _render_format(name, message)
+
+
 def setup_logger(level: int = logging.DEBUG, name: str = LOGGER_NAME) -> None:
     """
     Set up logger.
     """
+    _LoggerState.level = level
     level_name = logging.getLevelName(level)
     loguru.logger.configure(
         handlers=[
@@ -56,6 +84,7 @@ def disable_logger() -> None:
     """
     Disable logger.
     """
+    _LoggerState.enabled = False
     loguru.logger.disable(LOGGER_NAME)
 
 
@@ -63,4 +92,14 @@ def enable_logger() -> None:
     """
     Enable logger.
     """
+    _LoggerState.enabled = True
     loguru.logger.enable(LOGGER_NAME)
+
+
+def is_debug_enabled() -> bool:
+    """
+    Whether debug messages are emitted.
+
+    Check it before building expensive debug messages in hot loops.
+    """
+    return _LoggerState.enabled and _LoggerState.level <= logging.DEBUG
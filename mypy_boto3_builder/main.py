@@ -8,16 +8,22 @@ import datetime
 import sys
 import warnings
 from collections.abc import Iterable, Sequence
+from dataclasses import replace
+from pathlib import Path
 
 from mypy_boto3_builder.chat.chat_buddy import ChatBuddy
 from mypy_boto3_builder.cli_parser import CLINamespace, parse_args
 from mypy_boto3_builder.constants import (
+    BENCH_HISTORY_NAME,
     BUILDER_REPO_URL,
     OUTPUT_PATH_SENTINEL,
     PACKAGE_NAME,
     PROG_NAME,
+    SERVICE_FINGERPRINTS_NAME,
 )
+from mypy_boto3_builder.enums.output_type import OutputType
 from mypy_boto3_builder.enums.product import Product, ProductLibrary
+from mypy_boto3_builder.exceptions import BuildError
 from mypy_boto3_builder.generators.aioboto3_generator import AioBoto3Generator
 from mypy_boto3_builder.generators.aiobotocore_generator import AioBotocoreGenerator
 from mypy_boto3_builder.generators.base_generator import BaseGenerator
@@ -26,10 +32,20 @@ from mypy_boto3_builder.generators.mypy_boto3_generator import MypyBoto3Generato
 from mypy_boto3_builder.generators.types_boto3_generator import TypesBoto3Generator
 from mypy_boto3_builder.jinja_manager import JinjaManager
 from mypy_boto3_builder.logger import get_logger, setup_logger
+from mypy_boto3_builder.parsers.resource_loader import ResourceLoader
 from mypy_boto3_builder.service_name import ServiceName
 from mypy_boto3_builder.type_defs import GeneratorKwargs
+from mypy_boto3_builder.utils.bench import BenchHistory, BenchRunner
 from mypy_boto3_builder.utils.boto3_utils import get_available_service_names
 from mypy_boto3_builder.utils.botocore_changelog import BotocoreChangelog
+from mypy_boto3_builder.utils.build_checkpoint import BuildCheckpoint
+from mypy_boto3_builder.utils.build_report import BuildReport
+from mypy_boto3_builder.utils.http_client import HTTPClient
+from mypy_boto3_builder.utils.memory import MemoryBudget
+from mypy_boto3_builder.utils.path import print_path
+from mypy_boto3_builder.utils.service_fingerprints import ServiceFingerprints
+from mypy_boto3_builder.utils.service_profiler import ServiceProfiler
+from mypy_boto3_builder.utils.shards import Shard, ShardManifest, get_shard_service_names
 from mypy_boto3_builder.utils.strings import get_anchor_link, get_copyright, get_md_doc_link
 from mypy_boto3_builder.utils.type_checks import (
     is_literal,
@@ -40,11 +56,90 @@ from mypy_boto3_builder.utils.type_checks import (
 )
 from mypy_boto3_builder.utils.version import get_builder_version
 from mypy_boto3_builder.utils.version_getters import get_botocore_version
+from mypy_boto3_builder.utils.work_queue import WorkJob, WorkQueue
+
+
+def get_updated_service_names(updated_from: Path | None = None) -> list[str]:
+    """
+    Get a list of service names updated in current `botocore` release.
+
+    Arguments:
+        updated_from -- Previous output directory, services manifest or `botocore/data`
+            directory to compare service models with. Botocore changelog is used if not set.
+    """
+    if updated_from is None:
+        return BotocoreChangelog().fetch_updated(get_botocore_version())
+
+    previous = ServiceFingerprints.load(updated_from)
+    current = ServiceFingerprints.from_installed(previous.library_names)
+    return current.get_updated(previous)
+
+
+def record_service_fingerprints(
+    output_path: Path,
+    service_names: Iterable[ServiceName],
+    current: ServiceFingerprints,
+) -> None:
+    """
+    Record model fingerprints of generated services to output directory.
+
+    Fingerprints of services that were not generated are kept from the previous run.
+
+    Arguments:
+        output_path -- Output directory.
+        service_names -- Generated service names.
+        current -- Fingerprints of installed service models.
+    """
+    manifest_path = output_path / SERVICE_FINGERPRINTS_NAME
+    manifest = (
+        ServiceFingerprints.load(manifest_path)
+        if manifest_path.exists()
+        else ServiceFingerprints({})
+    )
+    manifest.update(current, (i.name for i in service_names))
+    manifest.save(manifest_path)
+
+
+def get_build_checkpoint(
+    args: CLINamespace,
+    main_service_names: Iterable[ServiceName],
+    fingerprints: ServiceFingerprints,
+) -> BuildCheckpoint | None:
+    """
+    Start checkpoint journal of completed services in output directory.
+
+    Only package output type has a journal: installed packages and built wheels or sdists
+    have no package directories to resume from, and build metadata is not written
+    to `site-packages` or next to distributions.
+
+    Arguments:
+        args -- CLI namespace.
+        main_service_names -- Service names included in `ServiceName` literals.
+        fingerprints -- Fingerprints of installed service models.
+    """
+    if OutputType.package not in args.output_types or any(
+        output_type.is_installed() for output_type in args.output_types
+    ):
+        if args.resume:
+            get_logger().warning("Only package output type can be resumed, --resume is ignored")
+        return None
+
+    options_hash = BuildCheckpoint.get_options_hash(
+        {
+            "main_service_names": sorted(i.name for i in main_service_names),
+            "partial_overload": args.partial_overload,
+            "output_types": sorted(i.value for i in args.output_types),
+        }
+    )
+    checkpoint = BuildCheckpoint(args.output_path, fingerprints, options_hash)
+    checkpoint.start(resume=args.resume)
+    return checkpoint
 
 
 def get_selected_service_names(
     selected: Iterable[str],
     available: Iterable[ServiceName],
+    updated_from: Path | None = None,
 ) -> list[ServiceName]:
     """
     Get a list of selected service names.
@@ -55,6 +150,7 @@ def get_selected_service_names(
     Arguments:
         selected -- Selected service names as strings.
         available -- All ServiceNames available in current boto3 release.
+        updated_from -- Path to detect `updated` services locally.
 
     Returns:
         A list of selected ServiceNames.
@@ -63,12 +159,11 @@ def get_selected_service_names(
     available_map = {i.name: i for i in available}
     result: list[ServiceName] = []
     selected_service_names = list(selected)
-    botocore_version = get_botocore_version()
     if ServiceName.ALL in selected_service_names:
         return list(available)
     if ServiceName.UPDATED in selected_service_names:
         selected_service_names.remove(ServiceName.UPDATED)
-        updated_service_names = BotocoreChangelog().fetch_updated(botocore_version)
+        updated_service_names = get_updated_service_names(updated_from)
         selected_service_names.extend(
             service_name_str
             for service_name_str in updated_service_names
@@ -91,6 +186,75 @@ def get_selected_service_names(
     return result
 
 
+def get_merged_service_names(
+    shard_manifests: Iterable[ShardManifest],
+    available: Iterable[ServiceName],
+) -> list[ServiceName]:
+    """
+    Get service names built by all shards in the order they were selected for the build.
+
+    Available service names order is used for shards without selected service names.
+    """
+    manifests = list(shard_manifests)
+    shard_service_names = {
+        service_name for manifest in manifests for service_name in manifest.service_names
+    }
+    available_map = {i.name: i for i in available}
+    selected = manifests[0].selected_service_names if manifests else []
+    ordered_names = selected or list(available_map)
+    return [
+        available_map[name]
+        for name in ordered_names
+        if name in shard_service_names and name in available_map
+    ]
+
+
+def save_shard_manifest(
+    output_path: Path,
+    shard: Shard,
+    service_names: Iterable[ServiceName],
+    generators: Iterable[BaseGenerator],
+    selected_service_names: Iterable[ServiceName] = (),
+) -> None:
+    """
+    Save services and product outputs of a shard for `merge`.
+    """
+    manifest = ShardManifest(
+        shard=shard,
+        service_names=[i.name for i in service_names],
+        selected_service_names=[i.name for i in selected_service_names],
+        products={
+            generator.product.value: generator.shard_product
+            for generator in generators
+            if generator.shard_product is not None
+        },
+    )
+    manifest.save(output_path)
+
+
+def report_failed_services(generators: Iterable[BaseGenerator]) -> None:
+    """
+    Report service packages failed with `--keep-going` for all products.
+
+    Raises:
+        BuildError -- If any service package failed.
+    """
+    failed_services = [
+        (generator.product, service_name, error)
+        for generator in generators
+        for service_name, error in generator.failed_services.items()
+    ]
+    if not failed_services:
+        return
+
+    logger = get_logger()
+    for product, service_name, error in failed_services:
+        logger.error(f"{product.value} {service_name.name} failed: {error}", tags=product.value)
+    raise BuildError(
+        f"{len(failed_services)} service packages failed, fix them and rerun with --resume"
+    )
+
+
 def get_generator(product: Product, kwargs: GeneratorKwargs) -> BaseGenerator:
     """
     Get Generator class for a product.
@@ -109,14 +273,14 @@ def get_generator(product: Product, kwargs: GeneratorKwargs) -> BaseGenerator:
             return AioBoto3Generator(**kwargs)
 
 
-def generate_product(
+def get_product_generator(
     product: Product,
     args: CLINamespace,
     service_names: Sequence[ServiceName],
     main_service_names: Sequence[ServiceName],
-) -> None:
+) -> BaseGenerator:
     """
-    Generate a selected product.
+    Get generator for a selected product.
 
     Arguments:
         product -- Product to generate
@@ -124,7 +288,7 @@ def generate_product(
         service_names -- Selected service names
         main_service_names -- Service names included in main
     """
-    generator = get_generator(
+    return get_generator(
         product,
         {
             "product": product,
@@ -135,6 +299,28 @@ def generate_product(
             "cleanup": True,
         },
     )
+
+
+def prefetch_product_urls(generators: Iterable[BaseGenerator]) -> None:
+    """
+    Start fetching static stubs and PyPI metadata for all products in background.
+    """
+    HTTPClient().prefetch(
+        url
+        for generator in generators
+        for url in generator.get_prefetch_urls(generator.product.get_type())
+    )
+
+
+def generate_product(generator: BaseGenerator) -> None:
+    """
+    Generate a selected product.
+
+    Arguments:
+        generator -- Product generator
+    """
+    product = generator.product
+    get_logger().info(f"Generating {product.value} product", tags=product.value)
     generator.generate_product(product.get_type())
     generator.cleanup_temporary_files()
 
@@ -171,6 +357,14 @@ def run(args: CLINamespace) -> None:
     # FIXME: suppress botocore endpoint warning
     warnings.filterwarnings("ignore", category=FutureWarning, module="botocore.client")
 
+    if args.is_worker:
+        _run_worker(args)
+        return
+
+    if args.bench_scenarios:
+        _run_bench(args)
+        return
+
     if args.output_path == OUTPUT_PATH_SENTINEL:
         ChatBuddy(_run_builder).run()
         return
@@ -180,6 +374,77 @@ def run(args: CLINamespace) -> None:
 
 def _run_builder(args: CLINamespace) -> None:
     setup_logger(level=args.log_level)
+    HTTPClient.configure(
+        cache_path=args.cache_path / "http" if args.cache_path else None,
+        offline=args.offline,
+    )
+    if ServiceName.UPDATED in args.service_names and not args.updated_from:
+        HTTPClient().prefetch((BotocoreChangelog.URL,))
+    work_queue = WorkQueue(args.work_queue_path) if args.work_queue_path else None
+    if work_queue:
+        work_queue.open()
+    if args.report_path:
+        BuildReport.start(trace_memory=args.trace_memory)
+    if args.memory_budget:
+        MemoryBudget.configure(args.memory_budget)
+        MemoryBudget.on_release(ResourceLoader.clear_cache)
+        MemoryBudget.on_release(BaseGenerator.clear_parsed_service_packages)
+    if args.profile_path:
+        ServiceProfiler.start(args.profile_path, args.profile_mode)
+    try:
+        _generate_products(args)
+    finally:
+        HTTPClient.cancel_prefetch()
+        if work_queue:
+            work_queue.close()
+        if args.report_path:
+            BuildReport.save(args.report_path)
+            BuildReport.stop()
+        ServiceProfiler.stop()
+
+
+def _run_worker(args: CLINamespace) -> None:
+    setup_logger(level=args.log_level)
+    if not args.work_queue_path:
+        return
+    initialize_jinja_manager()
+    available_service_names = get_available_service_names()
+    generators: dict[tuple[str, str], BaseGenerator] = {}
+
+    def process_job(job: WorkJob) -> str:
+        key = (job.product, job.output_path)
+        if key not in generators:
+            product = Product(job.product)
+            config = replace(
+                args,
+                output_path=Path(job.output_path),
+                products=[product],
+                build_version=job.version,
+            )
+            generators[key] = get_product_generator(
+                product, config, available_service_names, available_service_names
+            )
+        return generators[key].process_work_job(job)
+
+    work_queue = WorkQueue(args.work_queue_path)
+    get_logger().info(f"Waiting for jobs in {print_path(work_queue.path)}")
+    processed = work_queue.work(process_job, idle_timeout=args.idle_timeout)
+    get_logger().info(f"Processed {processed} jobs from {print_path(work_queue.path)}")
+
+
+def _run_bench(args: CLINamespace) -> None:
+    setup_logger(level=args.log_level)
+    history = BenchHistory(args.bench_history_path or Path(BENCH_HISTORY_NAME))
+    runner = BenchRunner(
+        products=args.products,
+        history=history,
+        output_path=None if args.output_path == OUTPUT_PATH_SENTINEL else args.output_path,
+        cache_path=args.cache_path,
+    )
+    runner.run(args.bench_scenarios)
+
+
+def _generate_products(args: CLINamespace) -> None:
     logger = get_logger()
     available_service_names = get_available_service_names()
     initialize_jinja_manager()
@@ -194,12 +459,45 @@ def _run_builder(args: CLINamespace) -> None:
             )
         return
 
-    service_names = get_selected_service_names(args.service_names, available_service_names)
+    shard_manifests: list[ShardManifest] = []
+    if args.merge_paths:
+        shard_manifests = ShardManifest.load_all(args.merge_paths)
+        service_names = get_merged_service_names(shard_manifests, available_service_names)
+    else:
+        service_names = get_selected_service_names(
+            args.service_names,
+            available_service_names,
+            args.updated_from,
+        )
+    selected_service_names = service_names
     main_service_names = service_names if args.partial_overload else available_service_names
+    if args.shard:
+        service_names = get_shard_service_names(service_names, args.shard)
+        logger.info(f"Building {len(service_names)} services in shard {args.shard}")
 
-    for product in args.products:
-        logger.info(f"Generating {product.value} product", tags=product.value)
-        generate_product(product, args, service_names, main_service_names)
+    generators = [
+        get_product_generator(product, args, service_names, main_service_names)
+        for product in args.products
+    ]
+    fingerprints = ServiceFingerprints.from_installed()
+    checkpoint = get_build_checkpoint(args, main_service_names, fingerprints)
+    for generator in generators:
+        generator.shard_manifests = shard_manifests
+        generator.checkpoint = checkpoint
+    BaseGenerator.share_parsed_service_packages(generators)
+    prefetch_product_urls(generators)
+    for generator in generators:
+        generate_product(generator)
+    report_failed_services(generators)
+
+    if args.shard:
+        save_shard_manifest(
+            args.output_path, args.shard, service_names, generators, selected_service_names
+        )
+    # build metadata is written only next to package directories, see `get_build_checkpoint`
+    if checkpoint:
+        record_service_fingerprints(args.output_path, service_names, fingerprints)
+    BaseGenerator.clear_parsed_service_packages()
 
     logger.debug("Done!")
 
@@ -215,7 +513,7 @@ def main() -> None:
         if args.raise_interrupt:
             raise
         logger = get_logger()
-        logger.warning("Interrupted by user")
+        logger.warning("Interrupted by user, rerun with --resume to skip completed services")
         sys.exit(1)
 
 
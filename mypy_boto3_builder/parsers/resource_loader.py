@@ -22,6 +22,7 @@ from mypy_boto3_builder.parsers.shape_parser_types import (
 )
 from mypy_boto3_builder.service_name import ServiceName
 from mypy_boto3_builder.utils.boto3_utils import get_botocore_session
+from mypy_boto3_builder.utils.build_report import BuildReport
 
 _T = TypeVar("_T")
 
@@ -80,6 +81,13 @@ class ResourceLoader:
             raise ValueError("Loader is not initialized")
         cls._loader.search_paths.append(path.as_posix())
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Release loaded resource shapes.
+        """
+        cls._cache.clear()
+
     def _load_resource(
         self, service_name: ServiceName, type_name: str, _response_type: type[_T]
     ) -> _T | None:
@@ -88,7 +96,7 @@ class ResourceLoader:
             return cast("_T | None", self._cache[cache_key])
         loader = self._get_loader()
         data: dict[str, Any] | None = None
-        with contextlib.suppress(UnknownServiceError):
+        with BuildReport.stage("load_model"), contextlib.suppress(UnknownServiceError):
             data = loader.load_service_model(service_name.boto3_name, type_name)
 
         self._cache[cache_key] = data
@@ -137,4 +145,5 @@ class ResourceLoader:
         Get botocore service data.
         """
         botocore_session = cls._get_botocore_session()
-        return botocore_session.get_service_data(service_name.boto3_name)
+        with BuildReport.stage("load_model"):
+            return botocore_session.get_service_data(service_name.boto3_name)
@@ -18,6 +18,7 @@ from mypy_boto3_builder.structures.paginator import Paginator
 from mypy_boto3_builder.structures.waiter import Waiter
 from mypy_boto3_builder.type_annotations.type_def_sortable import TypeDefSortable
 from mypy_boto3_builder.type_maps.typed_dicts import CloudwatchEventTypeDef
+from mypy_boto3_builder.utils.build_report import BuildReport
 from mypy_boto3_builder.utils.strings import xform_name
 from mypy_boto3_builder.utils.type_def_sorter import TypeDefSorter
 
@@ -51,6 +52,10 @@ class ServicePackageParser:
         """
         Extract all data from boto3 service package.
         """
+        with BuildReport.stage("parse"):
+            return self._parse()
+
+    def _parse(self) -> ServicePackage:
         result = self._parse_service_package()
         result.waiters.extend(self._parse_waiters())
         result.waiters.sort()
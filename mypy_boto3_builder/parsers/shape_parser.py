@@ -27,7 +27,7 @@ from mypy_boto3_builder.constants import (
     SERVICE_RESOURCE,
 )
 from mypy_boto3_builder.exceptions import ShapeParserError
-from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.logger import get_logger, is_debug_enabled
 from mypy_boto3_builder.parsers.resource_loader import ResourceLoader
 from mypy_boto3_builder.parsers.shape_parser_types import (
     ActionShape,
@@ -453,7 +453,7 @@ class ShapeParser:
             if shape.value
             else Type.Any
         )
-        return TypeSubscript(parent, [key_child, value_child])
+        return Type.subscript(parent, [key_child, value_child])
 
     def _get_typed_dict_map(self, *, output: bool, output_child: bool) -> TypedDictMap:
         if output:
@@ -540,16 +540,13 @@ class ShapeParser:
         *,
         is_output_child: bool = False,
     ) -> FakeAnnotation:
-        type_subscript = (
-            TypeSubscript(Type.List) if is_output_child else TypeSubscript(Type.Sequence)
+        parent = Type.List if is_output_child else Type.Sequence
+        child = (
+            self.parse_shape(shape.member, is_output_child=is_output_child)
+            if shape.member
+            else Type.Any
         )
-        if shape.member:
-            type_subscript.add_child(
-                self.parse_shape(shape.member, is_output_child=is_output_child),
-            )
-        else:
-            type_subscript.add_child(Type.Any)
-        return type_subscript
+        return Type.subscript(parent, [child])
 
     def _get_shape_type_name(self, shape: Shape) -> str:
         if isinstance(shape, StructureShape):
@@ -1263,15 +1260,24 @@ class ShapeParser:
         if clashing_typed_dict.is_same(temp_typed_dict):
             return new_typed_dict_name
 
-        self.logger.debug(
-            f"Clashing typed dict name found: {new_typed_dict_name}",
-            tags=new_typed_dict_name,
-        )
+        if is_debug_enabled():
+            self.logger.debug(
+                f"Clashing typed dict name found: {new_typed_dict_name}",
+                tags=new_typed_dict_name,
+            )
         return self._get_non_clashing_typed_dict_name_for_existing(
             temp_typed_dict,
             postfix=optional_postfix,
         )
 
+    def _log_typed_dict_rename(self, kind: str, old_name: str, new_name: str) -> None:
+        if not is_debug_enabled():
+            return
+        self.logger.debug(
+            f"Fixing {kind} TypedDict name clash {old_name} -> {new_name}",
+            tags=(old_name, new_name),
+        )
+
     def fix_typed_dict_names(self) -> None:
         """
         Fix typed dict names to avoid duplicates.
@@ -1295,11 +1301,7 @@ class ShapeParser:
                     "Output",
                 )
                 self._fixed_typed_dict_map[typed_dict] = output_typed_dict
-                self.logger.debug(
-                    "Fixing output TypedDict name clash"
-                    f" {old_typed_dict_name} -> {new_typed_dict_name}",
-                    tags=(old_typed_dict_name, new_typed_dict_name),
-                )
+                self._log_typed_dict_rename("output", old_typed_dict_name, new_typed_dict_name)
 
                 self._output_typed_dict_map.rename(output_typed_dict, new_typed_dict_name)
 
@@ -1328,11 +1330,7 @@ class ShapeParser:
                     response_typed_dict,
                     postfix="Response",
                 )
-                self.logger.debug(
-                    "Fixing response TypedDict name clash"
-                    f" {old_typed_dict_name} -> {new_typed_dict_name}",
-                    tags=(old_typed_dict_name, new_typed_dict_name),
-                )
+                self._log_typed_dict_rename("response", old_typed_dict_name, new_typed_dict_name)
 
                 self._response_typed_dict_map.rename(response_typed_dict, new_typed_dict_name)
 
@@ -1362,18 +1360,19 @@ class ShapeParser:
             for parent_class, method, argument, type_annotation in method_arguments:
                 if type_annotation == input_typed_dict:
                     argument.type_annotation = union_type_annotation
-                    self.logger.debug(
-                        f"Added output shape to {parent_class.name}.{method.name}"
-                        f" {argument.name} argument {input_typed_dict.name} ->"
-                        f" {union_type_annotation.name}",
-                        tags=(
-                            parent_class.name,
-                            method.name,
-                            argument.name,
-                            input_typed_dict.name,
-                            union_type_annotation.name,
-                        ),
-                    )
+                    if is_debug_enabled():
+                        self.logger.debug(
+                            f"Added output shape to {parent_class.name}.{method.name}"
+                            f" {argument.name} argument {input_typed_dict.name} ->"
+                            f" {union_type_annotation.name}",
+                            tags=(
+                                parent_class.name,
+                                method.name,
+                                argument.name,
+                                input_typed_dict.name,
+                                union_type_annotation.name,
+                            ),
+                        )
 
                 if type_annotation in self._fixed_typed_dict_map:
                     continue
@@ -1382,6 +1381,10 @@ class ShapeParser:
                 for parent in sorted(sub_parents):
                     if is_union(parent) and parent.name == union_name:
                         continue
+                    if not is_debug_enabled():
+                        parent.replace_child(input_typed_dict, union_type_annotation)
+                        continue
+
                     old_parent_render = parent.render()
                     parent.replace_child(input_typed_dict, union_type_annotation)
                     new_parent_render = parent.render()
@@ -50,6 +50,15 @@ AIO_IMPORT_MAP: Final[Mapping[ExternalImport, ExternalImport]] = {
 }
 
 
+def get_aio_import(external_import: ExternalImport) -> ExternalImport | None:
+    """
+    Get a copy of aioboto3/aiobotocore import for botocore/boto3 import.
+    """
+    if external_import not in AIO_IMPORT_MAP:
+        return None
+    return AIO_IMPORT_MAP[external_import].copy()
+
+
 def replace_import_with_aio(external_import: ExternalImport) -> None:
     """
     Replace botocore/boto3 import with aioboto3/aiobotocore.
@@ -7,17 +7,28 @@ Copyright 2024 Vlad Emelianov
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 
-from mypy_boto3_builder.exceptions import BuildEnvError
-from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.constants import SERVICE_RESOURCE
+from mypy_boto3_builder.exceptions import BuildEnvError, BuildInternalError
+from mypy_boto3_builder.logger import get_logger, is_debug_enabled
 from mypy_boto3_builder.parsers.resource_loader import ResourceLoader
+from mypy_boto3_builder.postprocessors.pass_manager import PassManager
 from mypy_boto3_builder.service_name import ServiceName
+from mypy_boto3_builder.structures.class_record import ClassRecord
+from mypy_boto3_builder.structures.client import Client
+from mypy_boto3_builder.structures.collection import Collection
+from mypy_boto3_builder.structures.method import Method
 from mypy_boto3_builder.structures.packages.service_package import ServicePackage
+from mypy_boto3_builder.structures.paginator import Paginator
+from mypy_boto3_builder.structures.resource_record import ResourceRecord
+from mypy_boto3_builder.structures.service_resource import ServiceResource
+from mypy_boto3_builder.structures.waiter import Waiter
 from mypy_boto3_builder.type_annotations.type import Type
 from mypy_boto3_builder.type_annotations.type_literal import TypeLiteral
 from mypy_boto3_builder.type_annotations.type_subscript import TypeSubscript
 from mypy_boto3_builder.type_annotations.type_typed_dict import TypedDictAttribute, TypeTypedDict
 from mypy_boto3_builder.utils.boto3_utils import get_region_name_literal
 from mypy_boto3_builder.utils.strings import textwrap
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 
 class BasePostprocessor(ABC):
@@ -46,164 +57,136 @@ class BasePostprocessor(ABC):
         """
         Generate all docstrings.
         """
-        self._generate_docstrings_client()
-        self._generate_docstrings_paginators()
-        self._generate_docstrings_waiters()
-        self._generate_docstrings_service_resource()
-        self._generate_docstrings_collections()
-        self._generate_docstrings_sub_resources()
+        pass_manager = PassManager(self.package)
+        self.register_docstrings_pass(pass_manager)
+        pass_manager.run()
 
-    @abstractmethod
     def process_package(self) -> None:
         """
         Postprocess built package.
         """
+        pass_manager = PassManager(self.package)
+        self.register_package_passes(pass_manager)
+        pass_manager.run()
 
-    def _generate_docstrings_client(self) -> None:
-        client = self.package.client
-        local_doc_link = self.package.get_doc_link("client")
-        client.docstring = self._construct_docstring("", client.boto3_doc_link, local_doc_link)
-        for method in client.methods:
-            boto3_doc_link = (
-                f"{self.package.service_name.boto3_doc_link_parent}/client/{method.name}.html"
-            )
-            if not method.has_boto3_doc_link():
-                method.set_boto3_doc_link(boto3_doc_link)
-            local_doc_link = self.package.get_doc_link("client", method.name)
-            method.docstring = self._construct_docstring(
-                method.docstring,
-                method.boto3_doc_link,
-                local_doc_link,
-            )
+    def postprocess(self) -> PassManager:
+        """
+        Generate docstrings and postprocess built package in a single traversal.
+        """
+        pass_manager = PassManager(self.package)
+        self.register_docstrings_pass(pass_manager)
+        self.register_package_passes(pass_manager)
+        pass_manager.run()
+        return pass_manager
 
-    def _generate_docstrings_paginators(self) -> None:
-        for paginator in self.package.paginators:
-            local_doc_link = self.package.get_doc_link("paginators", paginator.name)
-            paginator.docstring = self._construct_docstring(
-                "",
-                paginator.boto3_doc_link,
-                local_doc_link,
-            )
-            for method in paginator.methods:
-                boto3_doc_link = f"{paginator.boto3_doc_link}.{method.name}"
-                method.set_boto3_doc_link(boto3_doc_link)
-                method.docstring = self._construct_docstring(
-                    method.docstring,
-                    method.boto3_doc_link,
-                    local_doc_link,
-                )
+    def postprocess_parsed(self) -> PassManager:
+        """
+        Run product-independent passes for a freshly parsed package.
+        """
+        pass_manager = PassManager(self.package)
+        self.register_parsed_package_passes(pass_manager)
+        pass_manager.run()
+        return pass_manager
 
-    def _generate_docstrings_waiters(self) -> None:
-        for waiter in self.package.waiters:
-            local_doc_link = self.package.get_doc_link("waiters", waiter.name)
-            waiter.docstring = self._construct_docstring("", waiter.boto3_doc_link, local_doc_link)
-            for method in waiter.methods:
-                boto3_doc_link = f"{waiter.boto3_doc_link}.{method.name}"
-                method.set_boto3_doc_link(boto3_doc_link)
-                method.docstring = self._construct_docstring(
-                    method.docstring,
-                    method.boto3_doc_link,
-                    local_doc_link,
-                )
+    def register_parsed_package_passes(self, pass_manager: PassManager) -> None:
+        """
+        Register product-independent handlers.
+        """
+        pass_manager.on_package("literals", self.extend_literals)
+        pass_manager.on_package("self_references", self.replace_self_ref_typed_dicts)
 
-    def _generate_docstrings_service_resource(self) -> None:
-        if not self.package.service_resource:
-            return
+    def register_docstrings_pass(self, pass_manager: PassManager) -> None:
+        """
+        Register docstrings generation handlers.
+        """
+        pass_manager.on_class_record("docstrings", self._generate_class_record_docstring)
+        pass_manager.on_method("docstrings", self._generate_method_docstring)
+
+    @abstractmethod
+    def register_package_passes(self, pass_manager: PassManager) -> None:
+        """
+        Register product-specific postprocessing handlers.
+        """
+
+    def _get_local_doc_link(self, class_record: ClassRecord) -> str:
+        if isinstance(class_record, Client):
+            return self.package.get_doc_link("client")
+        if isinstance(class_record, Paginator):
+            return self.package.get_doc_link("paginators", class_record.name)
+        if isinstance(class_record, Waiter):
+            return self.package.get_doc_link("waiters", class_record.name)
+        if isinstance(class_record, ServiceResource):
+            return self.package.get_doc_link("service_resource")
+        if isinstance(class_record, Collection):
+            return self._get_collection_local_doc_link(class_record)
+        if isinstance(class_record, ResourceRecord):
+            return self.package.get_doc_link("service_resource", class_record.name)
+        raise BuildInternalError(f"Unknown class record {class_record.name}")
+
+    def _get_collection_local_doc_link(self, collection: Collection) -> str:
+        if collection.parent_name == SERVICE_RESOURCE:
+            return self.package.get_doc_link("service_resource", collection.name)
+        return self.package.get_doc_link(
+            "service_resource",
+            collection.parent_name,
+            collection.attribute_name,
+        )
 
-        service_resource = self.package.service_resource
-        local_doc_link = self.package.get_doc_link("service_resource")
-        service_resource.docstring = self._construct_docstring(
+    def _generate_class_record_docstring(self, class_record: ClassRecord) -> None:
+        class_record.docstring = self._construct_docstring(
             "",
-            service_resource.boto3_doc_link,
-            local_doc_link,
+            class_record.boto3_doc_link,
+            self._get_local_doc_link(class_record),
         )
-        for method in service_resource.methods:
-            boto3_doc_link = (
-                f"{service_resource.service_name.boto3_doc_link_parent}"
-                f"/service-resource/{method.name}.html"
-            )
-            method.set_boto3_doc_link(boto3_doc_link)
-            local_doc_link = self.package.get_doc_link(
-                "service_resource",
-                service_resource.name,
-                f"{method.name} method",
-            )
-            method.docstring = self._construct_docstring(
-                method.docstring,
-                method.boto3_doc_link,
-                local_doc_link,
-            )
 
-    def _generate_docstrings_collections(self) -> None:
-        if not self.package.service_resource:
+    def _set_method_boto3_doc_link(self, class_record: ClassRecord, method: Method) -> None:
+        service_name = self.package.service_name
+        if isinstance(class_record, Client):
+            if not method.has_boto3_doc_link():
+                method.set_boto3_doc_link(
+                    f"{service_name.boto3_doc_link_parent}/client/{method.name}.html"
+                )
             return
-
-        for collection in self.package.service_resource.collections:
-            local_doc_link = self.package.get_doc_link("service_resource", collection.name)
-            collection.docstring = self._construct_docstring(
-                "",
-                collection.boto3_doc_link,
-                local_doc_link,
+        if isinstance(class_record, Paginator | Waiter):
+            method.set_boto3_doc_link(f"{class_record.boto3_doc_link}.{method.name}")
+            return
+        if isinstance(class_record, ServiceResource):
+            method.set_boto3_doc_link(
+                f"{service_name.boto3_doc_link_parent}/service-resource/{method.name}.html"
             )
-            for method in collection.methods:
-                # FIXME: potentially links will be changed to the same as paginators/waiters use
-                if not method.has_boto3_doc_link():
-                    method.set_boto3_doc_link(f"{collection.boto3_doc_link_parent}#{method.name}")
-                method.docstring = self._construct_docstring(
-                    method.docstring,
-                    method.boto3_doc_link,
-                    local_doc_link,
-                )
-
-    def _generate_docstrings_sub_resources(self) -> None:
-        if not self.package.service_resource:
             return
+        if isinstance(class_record, Collection):
+            # FIXME: potentially links will be changed to the same as paginators/waiters use
+            if not method.has_boto3_doc_link():
+                method.set_boto3_doc_link(f"{class_record.boto3_doc_link_parent}#{method.name}")
+            return
+        if isinstance(class_record, ResourceRecord):
+            method.set_boto3_doc_link(
+                f"{service_name.boto3_doc_link_parent}"
+                f"/{class_record.name.lower()}"
+                f"/{method.name}.html"
+            )
+            return
+        raise BuildInternalError(f"Unknown class record {class_record.name}")
 
-        for sub_resource in self.package.service_resource.sub_resources:
-            local_doc_link = self.package.get_doc_link("service_resource", sub_resource.name)
-            sub_resource.docstring = self._construct_docstring(
-                "",
-                sub_resource.boto3_doc_link,
-                local_doc_link,
+    def _get_method_local_doc_link(self, class_record: ClassRecord, method: Method) -> str:
+        if isinstance(class_record, Client):
+            return self.package.get_doc_link("client", method.name)
+        if isinstance(class_record, ServiceResource | ResourceRecord):
+            return self.package.get_doc_link(
+                "service_resource",
+                class_record.name,
+                f"{method.name} method",
             )
-            for method in sub_resource.methods:
-                boto3_doc_link = (
-                    f"{sub_resource.service_name.boto3_doc_link_parent}"
-                    f"/{sub_resource.name.lower()}"
-                    f"/{method.name}.html"
-                )
-                method.set_boto3_doc_link(boto3_doc_link)
-                local_doc_link = self.package.get_doc_link(
-                    "service_resource",
-                    sub_resource.name,
-                    f"{method.name} method",
-                )
-                method.docstring = self._construct_docstring(
-                    method.docstring,
-                    method.boto3_doc_link,
-                    local_doc_link,
-                )
-            for collection in sub_resource.collections:
-                local_doc_link = self.package.get_doc_link(
-                    "service_resource",
-                    sub_resource.name,
-                    collection.attribute_name,
-                )
-                collection.docstring = self._construct_docstring(
-                    "",
-                    collection.boto3_doc_link,
-                    local_doc_link,
-                )
-                for method in collection.methods:
-                    if not method.has_boto3_doc_link():
-                        method.set_boto3_doc_link(
-                            f"{collection.boto3_doc_link_parent}#{method.name}",
-                        )
-                    method.docstring = self._construct_docstring(
-                        method.docstring,
-                        method.boto3_doc_link,
-                        local_doc_link,
-                    )
+        return self._get_local_doc_link(class_record)
+
+    def _generate_method_docstring(self, class_record: ClassRecord, method: Method) -> None:
+        self._set_method_boto3_doc_link(class_record, method)
+        method.docstring = self._construct_docstring(
+            method.docstring,
+            method.boto3_doc_link,
+            self._get_method_local_doc_link(class_record, method),
+        )
 
     def _construct_docstring(self, docstring: str, boto3_doc_link: str, local_doc_link: str) -> str:
         docstring_part = f"{textwrap(docstring)}\n\n" if docstring else ""
@@ -261,18 +244,20 @@ class BasePostprocessor(ABC):
         replacement = Type.DictStrAny
         if attribute.type_annotation is reference:
             attribute.type_annotation = replacement
-            self.logger.debug(
-                f"Replaced {reference.name} with {replacement.render()} in"
-                f" {parent.name}.{attribute.name}",
-            )
+            if is_debug_enabled():
+                self.logger.debug(
+                    f"Replaced {reference.name} with {replacement.render()} in"
+                    f" {parent.name}.{attribute.name}",
+                )
             return
 
         if isinstance(attribute.type_annotation, TypeSubscript):
             attribute.type_annotation.replace_child(reference, Type.DictStrAny)
-            self.logger.debug(
-                f"Deep replaced {reference.name} with {replacement.render()} in"
-                f" {parent.name}.{attribute.name}",
-            )
+            if is_debug_enabled():
+                self.logger.debug(
+                    f"Deep replaced {reference.name} with {replacement.render()} in"
+                    f" {parent.name}.{attribute.name}",
+                )
             return
 
         raise BuildEnvError(
@@ -293,10 +278,8 @@ class BasePostprocessor(ABC):
         next_depth = depth - 1
 
         for child in typed_dict.iterate_children():
-            for child_typed_dict in child.type_annotation.iterate_types():
-                if not isinstance(child_typed_dict, TypeTypedDict):
-                    continue
-
+            type_iterator = TypeIterator((child.type_annotation,))
+            for child_typed_dict in type_iterator.filter(TypeTypedDict):
                 if child_typed_dict is reference:
                     self._replace_typed_dict_with_dict(child, reference, typed_dict)
                 if next_depth > 0:
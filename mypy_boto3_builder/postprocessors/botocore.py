@@ -5,6 +5,7 @@ Copyright 2024 Vlad Emelianov
 """
 
 from mypy_boto3_builder.postprocessors.base import BasePostprocessor
+from mypy_boto3_builder.postprocessors.pass_manager import PassManager
 
 
 class BotocorePostprocessor(BasePostprocessor):
@@ -12,7 +13,7 @@ class BotocorePostprocessor(BasePostprocessor):
     Postprocessor for botocore classes and methods.
     """
 
-    def process_package(self) -> None:
+    def register_package_passes(self, pass_manager: PassManager) -> None:
         """
         Leave package as it is.
         """
@@ -0,0 +1,152 @@
+"""
+Pass manager that runs postprocessor passes in a single package traversal.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import time
+from collections.abc import Callable, Iterator
+
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.structures.attribute import Attribute
+from mypy_boto3_builder.structures.class_record import ClassRecord
+from mypy_boto3_builder.structures.method import Method
+from mypy_boto3_builder.structures.packages.service_package import ServicePackage
+from mypy_boto3_builder.structures.resource_record import ResourceRecord
+from mypy_boto3_builder.structures.service_resource import ServiceResource
+from mypy_boto3_builder.utils.build_report import BuildReport
+
+ClassRecordHandler = Callable[[ClassRecord], None]
+MethodHandler = Callable[[ClassRecord, Method], None]
+AttributeHandler = Callable[[ClassRecord, Attribute], None]
+PackageHandler = Callable[[], None]
+
+
+class PassManager:
+    """
+    Pass manager that runs postprocessor passes in a single package traversal.
+
+    Handlers are called in registration order for every node:
+
+    - class record handlers before its methods, attributes and children
+    - method and attribute handlers
+    - class record exit handlers after all children are processed
+    - package handlers after the whole tree is traversed
+
+    Arguments:
+        package -- Service package
+    """
+
+    def __init__(self, package: ServicePackage) -> None:
+        self.package = package
+        self.timings: dict[str, float] = {}
+        self.cpu_timings: dict[str, float] = {}
+        self._class_record_handlers: list[tuple[str, ClassRecordHandler]] = []
+        self._method_handlers: list[tuple[str, MethodHandler]] = []
+        self._attribute_handlers: list[tuple[str, AttributeHandler]] = []
+        self._class_record_exit_handlers: list[tuple[str, ClassRecordHandler]] = []
+        self._package_handlers: list[tuple[str, PackageHandler]] = []
+        self._logger = get_logger()
+
+    def _add_pass_name(self, name: str) -> None:
+        self.timings.setdefault(name, 0.0)
+        self.cpu_timings.setdefault(name, 0.0)
+
+    def on_class_record(self, name: str, handler: ClassRecordHandler) -> None:
+        """
+        Register handler called before class record children are processed.
+        """
+        self._add_pass_name(name)
+        self._class_record_handlers.append((name, handler))
+
+    def on_method(self, name: str, handler: MethodHandler) -> None:
+        """
+        Register handler called for every class record method.
+        """
+        self._add_pass_name(name)
+        self._method_handlers.append((name, handler))
+
+    def on_attribute(self, name: str, handler: AttributeHandler) -> None:
+        """
+        Register handler called for every class record attribute.
+        """
+        self._add_pass_name(name)
+        self._attribute_handlers.append((name, handler))
+
+    def on_class_record_exit(self, name: str, handler: ClassRecordHandler) -> None:
+        """
+        Register handler called after class record children are processed.
+        """
+        self._add_pass_name(name)
+        self._class_record_exit_handlers.append((name, handler))
+
+    def on_package(self, name: str, handler: PackageHandler) -> None:
+        """
+        Register handler called once after package tree traversal.
+        """
+        self._add_pass_name(name)
+        self._package_handlers.append((name, handler))
+
+    def _iterate_class_records(self) -> Iterator[ClassRecord]:
+        yield self.package.client
+        yield from self.package.paginators
+        yield from self.package.waiters
+        if self.package.service_resource:
+            yield self.package.service_resource
+
+    @staticmethod
+    def _get_children(class_record: ClassRecord) -> tuple[ClassRecord, ...]:
+        if isinstance(class_record, ServiceResource):
+            return (*class_record.collections, *class_record.sub_resources)
+        if isinstance(class_record, ResourceRecord):
+            return tuple(class_record.collections)
+        return ()
+
+    def _run_timed(self, name: str, handler: Callable[..., None], *args: object) -> None:
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        handler(*args)
+        self.timings[name] += time.perf_counter() - start
+        self.cpu_timings[name] += time.thread_time() - cpu_start
+
+    def _visit_class_record(self, class_record: ClassRecord) -> None:
+        for name, class_record_handler in self._class_record_handlers:
+            self._run_timed(name, class_record_handler, class_record)
+
+        if self._method_handlers:
+            for method in tuple(class_record.methods):
+                for name, method_handler in self._method_handlers:
+                    self._run_timed(name, method_handler, class_record, method)
+
+        if self._attribute_handlers:
+            for attribute in tuple(class_record.attributes):
+                for name, attribute_handler in self._attribute_handlers:
+                    self._run_timed(name, attribute_handler, class_record, attribute)
+
+        for child in self._get_children(class_record):
+            self._visit_class_record(child)
+
+        for name, exit_handler in self._class_record_exit_handlers:
+            self._run_timed(name, exit_handler, class_record)
+
+    def run(self) -> None:
+        """
+        Traverse package tree once and run all registered handlers.
+        """
+        for class_record in tuple(self._iterate_class_records()):
+            self._visit_class_record(class_record)
+
+        for name, package_handler in self._package_handlers:
+            self._run_timed(name, package_handler)
+
+        for name, duration in self.timings.items():
+            BuildReport.record(f"postprocess:{name}", duration, self.cpu_timings[name])
+
+        if self.timings:
+            timings_str = ", ".join(
+                f"{name} {duration * 1000:.2f}ms" for name, duration in self.timings.items()
+            )
+            self._logger.debug(
+                f"Postprocessed {self.package.service_name.boto3_name}: {timings_str}",
+                tags=self.package.service_name.boto3_name,
+            )
@@ -10,6 +10,7 @@ from typing import Final, Literal, Self
 
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.type_constant import TypeConstant
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 
 class Argument:
@@ -23,6 +24,8 @@ class Argument:
         prefix -- Used for starargs.
     """
 
+    __slots__ = ("default", "name", "prefix", "type_annotation")
+
     SELF_NAME: Final = "self"
     CLS_NAME: Final = "cls"
     KW_NAME: Final = "*"
@@ -70,14 +73,20 @@ class Argument:
         """
         return self.name == "*"
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
         """
-        Extract required type annotations.
+        Iterate over type annotation and default value.
         """
         if self.type_annotation is not None:
-            yield from self.type_annotation.iterate_types()
+            yield self.type_annotation
         if self.default is not None:
-            yield from self.default.iterate_types()
+            yield self.default
+
+    def iterate_types(self) -> Generator[FakeAnnotation]:
+        """
+        Extract required type annotations.
+        """
+        yield from TypeIterator(self.iterate_root_types())
 
     @property
     def required(self) -> bool:
@@ -10,6 +10,7 @@ from typing import Literal, Self
 
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.type_constant import TypeConstant
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 _TypeIgnore = Literal["override"] | None
 
@@ -28,6 +29,16 @@ class Attribute:
         is_collection -- Whether the attribute parsed from collections.
     """
 
+    __slots__ = (
+        "is_collection",
+        "is_identifier",
+        "is_reference",
+        "name",
+        "type_annotation",
+        "type_ignore",
+        "value",
+    )
+
     def __init__(
         self,
         name: str,
@@ -47,6 +58,12 @@ class Attribute:
         self.is_identifier = is_identifier
         self.is_collection = is_collection
 
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
+        """
+        Iterate over attribute type annotation.
+        """
+        yield self.type_annotation
+
     def iterate_types(self) -> Generator[FakeAnnotation]:
         """
         Iterate over all type annotations used.
@@ -54,7 +71,7 @@ class Attribute:
         Yields:
             Type annotation.
         """
-        return self.type_annotation.iterate_types()
+        yield from TypeIterator(self.iterate_root_types())
 
     def render(self) -> str:
         """
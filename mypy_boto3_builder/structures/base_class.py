@@ -5,11 +5,13 @@ Copyright 2024 Vlad Emelianov
 """
 
 from collections.abc import Generator
+from typing import Self
 
 from mypy_boto3_builder.import_helpers.import_helper import Import
 from mypy_boto3_builder.type_annotations.external_import import ExternalImport
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.utils.type_checks import is_type_subscript
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 
 class BaseClass:
@@ -50,10 +52,22 @@ class BaseClass:
             "  # type: ignore[assignment]\n"
         )
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
         """
-        Iterate over definition type annotations.
+        Iterate over annotation and `TYPE_CHECKING` import for a subscript.
         """
-        yield from self.annotation.iterate_types()
+        yield self.annotation
         if is_type_subscript(self.annotation):
             yield ExternalImport(Import.typing, "TYPE_CHECKING")
+
+    def iterate_types(self) -> Generator[FakeAnnotation]:
+        """
+        Iterate over definition type annotations.
+        """
+        yield from TypeIterator(self.iterate_root_types())
+
+    def copy(self) -> Self:
+        """
+        Copy base class with its annotation.
+        """
+        return self.__class__(self.name, self.annotation.copy())
@@ -4,7 +4,9 @@ Base class for all structures that can be rendered to a class.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator, Iterable
+import copy
+from collections.abc import Callable, Generator, Iterable, Iterator
+from typing import Self
 
 from mypy_boto3_builder.exceptions import StructureError
 from mypy_boto3_builder.import_helpers.import_record import ImportRecord
@@ -13,6 +15,7 @@ from mypy_boto3_builder.structures.base_class import BaseClass
 from mypy_boto3_builder.structures.method import Method
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.utils.strings import xform_name
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 
 class ClassRecord:
@@ -58,16 +61,22 @@ class ClassRecord:
 
         return f"_{self.name}"
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
         """
-        Iterate over type annotations for methods, attributes and bases.
+        Iterate over root type annotations for methods, attributes and bases.
         """
         for method in self.methods:
-            yield from method.iterate_types()
+            yield from method.iterate_root_types()
         for attribute in self.attributes:
-            yield from attribute.iterate_types()
+            yield from attribute.iterate_root_types()
         for base in self.bases:
-            yield from base.iterate_types()
+            yield from base.iterate_root_types()
+
+    def iterate_types(self) -> Generator[FakeAnnotation]:
+        """
+        Iterate over unique type annotations for methods, attributes and bases.
+        """
+        yield from TypeIterator(self.iterate_root_types())
 
     def get_required_import_records(self) -> set[ImportRecord]:
         """
@@ -102,3 +111,50 @@ class ClassRecord:
                 return method
 
         raise StructureError(f"Method {name} not found")
+
+    def copy(self) -> Self:
+        """
+        Copy class record with its methods, attributes and bases.
+
+        Nested type annotations are shared with the original.
+        """
+        return copy.copy(self)
+
+    def __copy__(self) -> Self:
+        """
+        Copy class record with its methods, attributes and bases.
+        """
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        result.methods = [method.copy() for method in self.methods]
+        result.attributes = [attribute.copy() for attribute in self.attributes]
+        result.bases = tuple(base.copy() for base in self.bases)
+        return result
+
+    def iterate_direct_type_annotations(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over type annotations directly used by methods, attributes and bases.
+        """
+        for method in self.methods:
+            yield from method.iterate_direct_type_annotations()
+        for attribute in self.attributes:
+            yield attribute.type_annotation
+        for base in self.bases:
+            yield base.annotation
+
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> None:
+        """
+        Replace type annotations directly used by methods, attributes and bases.
+
+        Arguments:
+            get_replacement -- Function that returns a replacement for a type annotation.
+        """
+        for method in self.methods:
+            method.replace_direct_type_annotations(get_replacement)
+        for attribute in self.attributes:
+            attribute.type_annotation = get_replacement(attribute.type_annotation)
+        for base in self.bases:
+            base.annotation = get_replacement(base.annotation)
@@ -4,8 +4,8 @@ Boto3 Client.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Iterator
-from typing import Final
+from collections.abc import Callable, Iterator
+from typing import Final, Self
 
 from botocore.client import BaseClient
 from botocore.errorfactory import BaseClientExceptions
@@ -16,6 +16,7 @@ from mypy_boto3_builder.structures.argument import Argument
 from mypy_boto3_builder.structures.class_record import ClassRecord
 from mypy_boto3_builder.structures.method import Method
 from mypy_boto3_builder.type_annotations.external_import import ExternalImport
+from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.internal_import import InternalImport
 from mypy_boto3_builder.utils.type_checks import is_typed_dict
 
@@ -45,6 +46,31 @@ class Client(ClassRecord):
         """
         return hash(self.service_name)
 
+    def __copy__(self) -> Self:
+        """
+        Copy client with its exceptions class.
+        """
+        result = super().__copy__()
+        result.exceptions_class = self.exceptions_class.copy()
+        return result
+
+    def iterate_direct_type_annotations(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over type annotations directly used by client and exceptions class.
+        """
+        yield from super().iterate_direct_type_annotations()
+        yield from self.exceptions_class.iterate_direct_type_annotations()
+
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> None:
+        """
+        Replace type annotations directly used by client and exceptions class.
+        """
+        super().replace_direct_type_annotations(get_replacement)
+        self.exceptions_class.replace_direct_type_annotations(get_replacement)
+
     @property
     def alias_name(self) -> str:
         """
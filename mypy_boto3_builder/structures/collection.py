@@ -4,7 +4,7 @@ Boto3 ServiceResource or Resource collection.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterator
 
 from mypy_boto3_builder.constants import SERVICE_RESOURCE
 from mypy_boto3_builder.import_helpers.import_helper import Import
@@ -45,6 +45,23 @@ class Collection(ClassRecord):
         self.type_annotation = type_annotation
         self.object_class_name = object_class_name
 
+    def iterate_direct_type_annotations(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over type annotations directly used by collection.
+        """
+        yield from super().iterate_direct_type_annotations()
+        yield self.type_annotation
+
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> None:
+        """
+        Replace type annotations directly used by collection.
+        """
+        super().replace_direct_type_annotations(get_replacement)
+        self.type_annotation = get_replacement(self.type_annotation)
+
     @property
     def boto3_doc_link_parent(self) -> str:
         """
@@ -68,9 +85,9 @@ class Collection(ClassRecord):
             f"#{self.service_name.class_name}.{self.parent_name}.{self.attribute_name}"
         )
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
         """
-        Iterate over all type annotations.
+        Iterate over root type annotations including collection item type.
         """
-        yield from super().iterate_types()
-        yield from self.type_annotation.iterate_types()
+        yield from super().iterate_root_types()
+        yield self.type_annotation
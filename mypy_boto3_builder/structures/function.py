@@ -5,7 +5,7 @@ Copyright 2024 Vlad Emelianov
 """
 
 import copy
-from collections.abc import Iterable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from typing import Literal, Self
 
 from mypy_boto3_builder.exceptions import BuildInternalError
@@ -14,6 +14,7 @@ from mypy_boto3_builder.structures.argument import Argument
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.type import Type
 from mypy_boto3_builder.type_annotations.type_typed_dict import TypeTypedDict
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 _TypeIgnore = Literal["override"] | None
 
@@ -162,15 +163,20 @@ class Function:
         """
         return "\n".join(self.body_lines)
 
+    def iterate_root_types(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over return type, arguments and decorators type annotations.
+        """
+        yield self.return_type
+        for argument in self.iterate_packed_arguments():
+            yield from argument.iterate_root_types()
+        yield from self.decorators
+
     def iterate_types(self) -> Iterator[FakeAnnotation]:
         """
         Iterate over required type annotations.
         """
-        yield from self.return_type.iterate_types()
-        for argument in self.iterate_packed_arguments():
-            yield from argument.iterate_types()
-        for decorator in self.decorators:
-            yield from decorator.iterate_types()
+        return iter(TypeIterator(self.iterate_root_types()))
 
     def get_required_import_records(self) -> set[ImportRecord]:
         """
@@ -230,7 +236,7 @@ class Function:
         """
         Deep copy function.
         """
-        return self.__class__(
+        result = self.__class__(
             name=self.name,
             arguments=[i.copy() for i in self.arguments],
             return_type=self.return_type.copy(),
@@ -239,7 +245,36 @@ class Function:
             body_lines=list(self.body_lines),
             type_ignore=self.type_ignore,
             is_async=self.is_async,
+            boto3_doc_link=self._boto3_doc_link,
         )
+        result.request_type_annotation_name = self.request_type_annotation_name
+        return result
+
+    def iterate_direct_type_annotations(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over return type, arguments and decorators type annotations.
+        """
+        yield self.return_type
+        for argument in self.arguments:
+            if argument.type_annotation is not None:
+                yield argument.type_annotation
+        yield from self.decorators
+
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> None:
+        """
+        Replace return type, arguments and decorators type annotations.
+
+        Arguments:
+            get_replacement -- Function that returns a replacement for a type annotation.
+        """
+        self.return_type = get_replacement(self.return_type)
+        for argument in self.arguments:
+            if argument.type_annotation is not None:
+                argument.type_annotation = get_replacement(argument.type_annotation)
+        self.decorators = [get_replacement(decorator) for decorator in self.decorators]
 
     def remove_argument(self, *names: str) -> Self:
         """
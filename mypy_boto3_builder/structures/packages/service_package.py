@@ -4,13 +4,13 @@ Parsed Service package.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator, Iterable, Iterator, Mapping
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
 from itertools import chain
-from typing import Final, Literal
+from typing import Final, Literal, Self
 
 from mypy_boto3_builder.constants import TYPING_EXTENSIONS_PYPI_NAME
 from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
-from mypy_boto3_builder.exceptions import StructureError
+from mypy_boto3_builder.exceptions import StructureError, TypeAnnotationError
 from mypy_boto3_builder.import_helpers.import_helper import Import
 from mypy_boto3_builder.import_helpers.import_record import ImportRecord
 from mypy_boto3_builder.import_helpers.import_record_group import ImportRecordGroup
@@ -31,6 +31,8 @@ from mypy_boto3_builder.type_annotations.type_literal import TypeLiteral
 from mypy_boto3_builder.utils.install_requires import InstallRequiresItem
 from mypy_boto3_builder.utils.strings import RESERVED_NAMES, get_anchor_link, is_reserved
 from mypy_boto3_builder.utils.type_checks import is_type_def, is_typed_dict
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
+from mypy_boto3_builder.utils.type_replacer import TypeReplacer
 from mypy_boto3_builder.utils.version import VersionParts, stringify_parts
 
 
@@ -84,18 +86,83 @@ class ServicePackage(Package):
             raise StructureError(f"Client is not present for {self.service_name}")
         return self._client
 
+    def fork(self, data: BasePackageData, version: str) -> Self:
+        """
+        Create a product variant of parsed package.
+
+        Class records are copied, so postprocessors can change them.
+        Nested type annotations and type defs are shared with the original package,
+        use `replace_type_annotations` to change them.
+
+        Arguments:
+            data -- Product package data
+            version -- Product package version
+        """
+        result = self.__class__(
+            data=data,
+            service_name=self.service_name,
+            version=version,
+            client=self._client.copy() if self._client else None,
+            service_resource=self.service_resource.copy() if self.service_resource else None,
+            waiters=[waiter.copy() for waiter in self.waiters],
+            paginators=[paginator.copy() for paginator in self.paginators],
+            type_defs=self.type_defs,
+            literals=self.literals,
+            helper_functions=[function.copy() for function in self.helper_functions],
+        )
+        result.install_requires = self.install_requires.copy()
+        return result
+
+    def _iterate_class_records(self) -> Iterator[ClassRecord]:
+        yield self.client
+        if self.service_resource:
+            yield self.service_resource
+        yield from self.waiters
+        yield from self.paginators
+
+    def replace_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation | None],
+    ) -> None:
+        """
+        Replace type annotations in the whole package without changing shared ones.
+
+        Parents of replaced type annotations are copied, so packages forked
+        from the same parsed package are not affected.
+
+        Arguments:
+            get_replacement -- Function that returns a replacement or `None` to keep it.
+        """
+        type_replacer = TypeReplacer(get_replacement)
+        type_replacer.scan(
+            chain(
+                *(
+                    record.iterate_direct_type_annotations()
+                    for record in self._iterate_class_records()
+                ),
+                *(function.iterate_direct_type_annotations() for function in self.helper_functions),
+                self.type_defs,
+            )
+        )
+        for record in self._iterate_class_records():
+            record.replace_direct_type_annotations(type_replacer.get)
+        for function in self.helper_functions:
+            function.replace_direct_type_annotations(type_replacer.get)
+
+        type_defs: list[TypeDefSortable] = []
+        for type_def in self.type_defs:
+            new_type_def = type_replacer.get(type_def)
+            if not isinstance(new_type_def, TypeDefSortable):
+                raise TypeAnnotationError(f"Type def {type_def.name} replaced with non-type def")
+            type_defs.append(new_type_def)
+        self.type_defs = type_defs
+
     def extract_literals(self) -> list[TypeLiteral]:
         """
         Extract literals from children.
         """
-        type_literals: set[TypeLiteral] = set()
-        for type_annotation in chain(self.iterate_types(), self.type_defs):
-            if isinstance(type_annotation, TypeDefSortable):
-                type_literals.update(type_annotation.get_children_literals())
-            if isinstance(type_annotation, TypeLiteral):
-                type_literals.add(type_annotation)
-
-        return sorted(type_literals)
+        type_iterator = TypeIterator(chain(self.iterate_root_types(), self.type_defs), deep=True)
+        return sorted(set(type_iterator.filter(TypeLiteral)))
 
     def _iterate_methods(self) -> Iterator[Method]:
         yield from self.client.methods
@@ -137,17 +204,23 @@ class ServicePackage(Package):
         """
         return sorted([i.name for i in self.literals])
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
         """
-        Iterate over type annotations from Client, ServiceResource, waiters and paginators.
+        Iterate over root type annotations from Client, ServiceResource, waiters and paginators.
         """
-        yield from self.client.iterate_types()
+        yield from self.client.iterate_root_types()
         if self.service_resource:
-            yield from self.service_resource.iterate_types()
+            yield from self.service_resource.iterate_root_types()
         for waiter in self.waiters:
-            yield from waiter.iterate_types()
+            yield from waiter.iterate_root_types()
         for paginator in self.paginators:
-            yield from paginator.iterate_types()
+            yield from paginator.iterate_root_types()
+
+    def iterate_types(self) -> Generator[FakeAnnotation]:
+        """
+        Iterate over unique type annotations from Client, ServiceResource, waiters and paginators.
+        """
+        yield from TypeIterator(self.iterate_root_types())
 
     def get_init_import_records(self) -> ImportRecordGroup:
         """
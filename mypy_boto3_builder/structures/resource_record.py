@@ -4,8 +4,8 @@ Boto3 ServiceResource sub-Resource.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Generator, Iterator
+from typing import TYPE_CHECKING, Self
 
 from mypy_boto3_builder.import_helpers.import_helper import Import
 from mypy_boto3_builder.service_name import ServiceName
@@ -31,6 +31,33 @@ class ResourceRecord(ClassRecord):
         self.service_name: ServiceName = service_name
         self.collections: list[Collection] = []
 
+    def __copy__(self) -> Self:
+        """
+        Copy resource with its collections.
+        """
+        result = super().__copy__()
+        result.collections = [collection.copy() for collection in self.collections]
+        return result
+
+    def iterate_direct_type_annotations(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over type annotations directly used by resource and its collections.
+        """
+        yield from super().iterate_direct_type_annotations()
+        for collection in self.collections:
+            yield from collection.iterate_direct_type_annotations()
+
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> None:
+        """
+        Replace type annotations directly used by resource and its collections.
+        """
+        super().replace_direct_type_annotations(get_replacement)
+        for collection in self.collections:
+            collection.replace_direct_type_annotations(get_replacement)
+
     @property
     def boto3_doc_link(self) -> str:
         """
@@ -41,10 +68,10 @@ class ResourceRecord(ClassRecord):
             f"#{self.service_name.class_name}.{self.name}"
         )
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
         """
-        Iterate over all type annotations from collections.
+        Iterate over root type annotations including collections.
         """
-        yield from super().iterate_types()
+        yield from super().iterate_root_types()
         for collection in self.collections:
-            yield from collection.iterate_types()
+            yield from collection.iterate_root_types()
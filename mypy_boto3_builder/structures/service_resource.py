@@ -4,7 +4,8 @@ Boto3 ServiceResource.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterator
+from typing import Self
 
 from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
 from mypy_boto3_builder.exceptions import StructureError
@@ -43,6 +44,41 @@ class ServiceResource(ClassRecord):
         """
         return hash(self.service_name)
 
+    def __copy__(self) -> Self:
+        """
+        Copy service resource with its collections and sub-resources.
+        """
+        result = super().__copy__()
+        result.collections = [collection.copy() for collection in self.collections]
+        result.sub_resources = [sub_resource.copy() for sub_resource in self.sub_resources]
+        result.resource_meta_class = self.resource_meta_class.copy()
+        return result
+
+    def iterate_direct_type_annotations(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over type annotations directly used by service resource and its children.
+        """
+        yield from super().iterate_direct_type_annotations()
+        yield from self.resource_meta_class.iterate_direct_type_annotations()
+        for collection in self.collections:
+            yield from collection.iterate_direct_type_annotations()
+        for sub_resource in self.sub_resources:
+            yield from sub_resource.iterate_direct_type_annotations()
+
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> None:
+        """
+        Replace type annotations directly used by service resource and its children.
+        """
+        super().replace_direct_type_annotations(get_replacement)
+        self.resource_meta_class.replace_direct_type_annotations(get_replacement)
+        for collection in self.collections:
+            collection.replace_direct_type_annotations(get_replacement)
+        for sub_resource in self.sub_resources:
+            sub_resource.replace_direct_type_annotations(get_replacement)
+
     @property
     def alias_name(self) -> str:
         """
@@ -57,16 +93,16 @@ class ServiceResource(ClassRecord):
         """
         return f"{self.service_name.boto3_doc_link_parent}/service-resource/index.html"
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def iterate_root_types(self) -> Generator[FakeAnnotation]:
         """
-        Iterate over type annotations for collections and sub-resources.
+        Iterate over root type annotations for collections and sub-resources.
         """
-        yield from super().iterate_types()
-        yield from self.resource_meta_class.iterate_types()
+        yield from super().iterate_root_types()
+        yield from self.resource_meta_class.iterate_root_types()
         for collection in self.collections:
-            yield from collection.iterate_types()
+            yield from collection.iterate_root_types()
         for sub_resource in self.sub_resources:
-            yield from sub_resource.iterate_types()
+            yield from sub_resource.iterate_root_types()
 
     def get_all_names(self) -> list[str]:
         """
@@ -25,6 +25,8 @@ class ExternalImport(FakeAnnotation):
         safe -- Whether import is wrapped in try-except.
     """
 
+    __slots__ = ("alias", "fallback", "name", "source")
+
     def __init__(
         self,
         source: ImportString,
@@ -68,16 +70,7 @@ class ExternalImport(FakeAnnotation):
         """
         Get import record required for using type annotation.
         """
-        if self.fallback:
-            fallback = self.fallback or ImportRecord(Import.builtins, "object", self.name)
-            return ImportRecord(
-                self.source,
-                self.name,
-                self.alias,
-                min_version=(),
-                fallback=fallback,
-            )
-        return ImportRecord(
+        return ImportRecord.intern(
             source=self.source,
             name=self.name,
             alias=self.alias,
@@ -7,7 +7,7 @@ Copyright 2024 Vlad Emelianov
 import copy
 import functools
 from abc import ABC, abstractmethod
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from typing import Self
 
 from mypy_boto3_builder.exceptions import BuildInternalError
@@ -20,6 +20,8 @@ class FakeAnnotation(ABC):
     Parent class for all type annotation wrappers.
     """
 
+    __slots__ = ()
+
     def __hash__(self) -> int:
         """
         Calculate hash value based on string render.
@@ -30,6 +32,9 @@ class FakeAnnotation(ABC):
         """
         Whether two annotations are equal.
         """
+        if self is other:
+            return True
+
         if not isinstance(other, FakeAnnotation):
             raise BuildInternalError(f"{other} is not FakeAnnotation")
 
@@ -78,8 +83,31 @@ class FakeAnnotation(ABC):
     def iterate_types(self) -> Generator["FakeAnnotation"]:
         """
         Iterate over all used type annotations recursively including self.
+
+        Shared type annotations are yielded as many times as they are used,
+        use `TypeIterator` to get unique ones.
+        """
+        stack: list[FakeAnnotation] = [self]
+        while stack:
+            type_annotation = stack.pop()
+            if type_annotation.is_used_type():
+                yield type_annotation
+            stack.extend(reversed(tuple(type_annotation.iterate_child_types(deep=False))))
+
+    def is_used_type(self) -> bool:
+        """
+        Whether type annotation itself is yielded by `iterate_types`.
+        """
+        return True
+
+    def iterate_child_types(self, *, deep: bool) -> Iterator["FakeAnnotation"]:
+        """
+        Iterate over type annotations that `iterate_types` descends into.
+
+        Arguments:
+            deep -- Whether to descend into TypeDef children.
         """
-        yield self
+        return iter(())
 
     def is_dict(self) -> bool:
         """
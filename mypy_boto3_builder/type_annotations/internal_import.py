@@ -22,6 +22,8 @@ class InternalImport(FakeAnnotation):
         use_alias -- Use name alias.
     """
 
+    __slots__ = ("module_name", "name", "service_name", "use_alias")
+
     def __init__(
         self,
         name: str,
@@ -4,6 +4,7 @@ Predefined FakeAnnotation instances.
 Copyright 2024 Vlad Emelianov
 """
 
+from collections.abc import Iterable
 from datetime import datetime
 from decimal import Decimal
 from typing import Final
@@ -14,6 +15,32 @@ from mypy_boto3_builder.type_annotations.type_annotation import TypeAnnotation
 from mypy_boto3_builder.type_annotations.type_constant import TypeConstant
 from mypy_boto3_builder.type_annotations.type_subscript import TypeSubscript
 
+_SHARED_SUBSCRIPTS: Final[dict[tuple[int, ...], TypeSubscript]] = {}
+
+
+def _get_shared_subscript_key(
+    parent: FakeAnnotation,
+    children: Iterable[FakeAnnotation],
+) -> tuple[int, ...] | None:
+    type_annotations = (parent, *children)
+    for type_annotation in type_annotations:
+        if isinstance(type_annotation, TypeSubscript):
+            if not is_shared_subscript(type_annotation):
+                return None
+        elif not isinstance(type_annotation, TypeAnnotation | TypeConstant | ExternalImport):
+            return None
+    return tuple(id(i) for i in type_annotations)
+
+
+def is_shared_subscript(type_annotation: TypeSubscript) -> bool:
+    """
+    Whether TypeSubscript is created by `Type.subscript` and must not be changed in place.
+    """
+    key = _get_shared_subscript_key(type_annotation.parent, type_annotation.children)
+    if key is None:
+        return False
+    return _SHARED_SUBSCRIPTS.get(key) is type_annotation
+
 
 class Type:
     """
@@ -59,6 +86,32 @@ class Type:
     Unpack: Final[TypeAnnotation] = TypeAnnotation("Unpack")
     Self: Final[TypeAnnotation] = TypeAnnotation("Self")
 
+    @classmethod
+    def subscript(cls, parent: FakeAnnotation, children: Iterable[FakeAnnotation]) -> TypeSubscript:
+        """
+        Get TypeSubscript that is shared between equal usages, e.g. `Sequence[str]`.
+
+        Only subscripts built from `typing` annotations, constants, external imports
+        and other shared subscripts are shared. Subscripts with TypeDefs are created
+        as usual, because TypeDefs are renamed and replaced in place.
+
+        Shared subscripts must not be changed, use `copy` to get a mutable one.
+
+        Arguments:
+            parent -- Parent type annotation.
+            children -- Children type annotations.
+        """
+        children = tuple(children)
+        key = _get_shared_subscript_key(parent, children)
+        if key is None:
+            return TypeSubscript(parent, children)
+
+        result = _SHARED_SUBSCRIPTS.get(key)
+        if result is None:
+            result = TypeSubscript(parent, children)
+            _SHARED_SUBSCRIPTS[key] = result
+        return result
+
     @classmethod
     def unpack(cls, wrapped: FakeAnnotation) -> FakeAnnotation:
         """
@@ -23,6 +23,8 @@ class TypeAnnotation(FakeAnnotation):
         wrapped_type -- Original type annotation as a string.
     """
 
+    __slots__ = ("_wrapped_type",)
+
     # Set of supported type annotations. value is default import module
     _SUPPORTED_TYPES: Final[Mapping[str, ImportRecord]] = {
         "Union": ImportRecord(Import.typing, "Union"),
@@ -26,6 +26,8 @@ class TypeConstant(FakeAnnotation):
         value -- Constant value.
     """
 
+    __slots__ = ("value",)
+
     Ellipsis: Final[EllipsisType] = EllipsisType()
 
     def __init__(self, value: ValueType) -> None:
@@ -17,8 +17,9 @@ class TypeDefSortable(FakeAnnotation, ABC):
     Sortable abstractclass for TypeDefSorter.
     """
 
+    __slots__ = ()
+
     name: str
-    _stringify: bool
 
     @abstractmethod
     def get_sortable_children(self) -> list["TypeDefSortable"]:
@@ -45,17 +46,17 @@ class TypeDefSortable(FakeAnnotation, ABC):
         Get import record required for using TypeAnnotation.
         """
 
+    @abstractmethod
     def is_stringified(self) -> bool:
         """
         Whether TypeDef usage should be rendered as a string.
         """
-        return self._stringify
 
+    @abstractmethod
     def stringify(self) -> None:
         """
         Render TypeDef usage as a string.
         """
-        self._stringify = True
 
     @abstractmethod
     def get_children_types(self) -> set[FakeAnnotation]:
@@ -6,16 +6,18 @@ Copyright 2024 Vlad Emelianov
 
 from collections.abc import Iterable
 from pathlib import Path
-from typing import Self
+from typing import Final, Self
 
 from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
 from mypy_boto3_builder.exceptions import TypeAnnotationError
+from mypy_boto3_builder.import_helpers.import_helper import Import
 from mypy_boto3_builder.import_helpers.import_record import ImportRecord
-from mypy_boto3_builder.import_helpers.internal_import_record import InternalImportRecord
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.type_annotation import TypeAnnotation
 from mypy_boto3_builder.utils.jinja2 import render_jinja2_template
 
+_LITERAL: Final = TypeAnnotation("Literal")
+
 
 class TypeLiteral(FakeAnnotation):
     """
@@ -27,6 +29,8 @@ class TypeLiteral(FakeAnnotation):
         inline -- Render literal inline.
     """
 
+    __slots__ = ("children", "name")
+
     def __init__(self, name: str, children: Iterable[str]) -> None:
         self.children: set[str] = set(children)
         self.name: str = name
@@ -66,15 +70,15 @@ class TypeLiteral(FakeAnnotation):
         Get import record required for using type annotation.
         """
         if self.inline:
-            return TypeAnnotation("Literal").get_import_records()
+            return _LITERAL.get_import_records()
 
-        return {InternalImportRecord(ServiceModuleName.literals, name=self.name)}
+        return {ImportRecord.intern(Import.local(ServiceModuleName.literals.name), self.name)}
 
     def get_definition_import_records(self) -> set[ImportRecord]:
         """
         Get import record required for using Literal.
         """
-        return TypeAnnotation("Literal").get_import_records()
+        return _LITERAL.get_import_records()
 
     def __copy__(self) -> Self:
         """
@@ -5,7 +5,7 @@ Copyright 2024 Vlad Emelianov
 """
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from typing import Self
 
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
@@ -17,6 +17,8 @@ class TypeParent(FakeAnnotation, ABC):
     Protocol for types with children.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def replace_child(self, child: FakeAnnotation, new_child: FakeAnnotation) -> Self:
         """
@@ -31,6 +33,19 @@ class TypeParent(FakeAnnotation, ABC):
         """
         ...
 
+    @abstractmethod
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> Self:
+        """
+        Replace all type annotations directly present in parent.
+
+        Arguments:
+            get_replacement -- Function that returns a replacement for a child.
+        """
+        ...
+
     @abstractmethod
     def get_children_types(self) -> set[FakeAnnotation]:
         """
@@ -4,13 +4,14 @@ Wrapper for subscript type annotations, like `List[str]`.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator, Iterable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from typing import Self
 
 from mypy_boto3_builder.exceptions import TypeAnnotationError
 from mypy_boto3_builder.import_helpers.import_record import ImportRecord
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.type_parent import TypeParent
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 
 class TypeSubscript(TypeParent):
@@ -22,6 +23,8 @@ class TypeSubscript(TypeParent):
         children -- Children type annotations.
     """
 
+    __slots__ = ("children", "parent")
+
     def __init__(
         self,
         parent: FakeAnnotation,
@@ -54,13 +57,18 @@ class TypeSubscript(TypeParent):
             result.update(child.get_import_records())
         return result
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def is_used_type(self) -> bool:
         """
-        Extract type annotations from children.
+        Subscript is not yielded by `iterate_types`, only its parent and children are.
         """
-        yield from self.parent.iterate_types()
-        for child in self.children:
-            yield from child.iterate_types()
+        return False
+
+    def iterate_child_types(self, *, deep: bool) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over parent and children type annotations.
+        """
+        yield self.parent
+        yield from self.children
 
     def add_child(self, child: FakeAnnotation) -> None:
         """
@@ -109,10 +117,7 @@ class TypeSubscript(TypeParent):
         """
         Extract required type annotations from attributes.
         """
-        result: set[FakeAnnotation] = set()
-        for child in self.children:
-            result.update(child.iterate_types())
-        return result
+        return set(TypeIterator(self.children))
 
     def replace_child(self, child: FakeAnnotation, new_child: FakeAnnotation) -> Self:
         """
@@ -129,6 +134,17 @@ class TypeSubscript(TypeParent):
         self.children[index] = new_child
         return self
 
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> Self:
+        """
+        Replace parent and children type annotations.
+        """
+        self.parent = get_replacement(self.parent)
+        self.children = [get_replacement(child) for child in self.children]
+        return self
+
     def iterate_children(self) -> Iterator[FakeAnnotation]:
         """
         Iterate over children.
@@ -4,14 +4,14 @@ Wrapper for `typing/typing_extensions.TypedDict` type annotations.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator, Iterable, Iterator
+from collections.abc import Callable, Generator, Iterable, Iterator
 from pathlib import Path
 from typing import Self
 
 from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
 from mypy_boto3_builder.exceptions import TypeAnnotationError
+from mypy_boto3_builder.import_helpers.import_helper import Import
 from mypy_boto3_builder.import_helpers.import_record import ImportRecord
-from mypy_boto3_builder.import_helpers.internal_import_record import InternalImportRecord
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.type import Type
 from mypy_boto3_builder.type_annotations.type_def_sortable import TypeDefSortable
@@ -19,6 +19,7 @@ from mypy_boto3_builder.type_annotations.type_literal import TypeLiteral
 from mypy_boto3_builder.type_annotations.type_parent import TypeParent
 from mypy_boto3_builder.type_annotations.type_subscript import TypeSubscript
 from mypy_boto3_builder.utils.jinja2 import render_jinja2_template
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 
 class TypedDictAttribute:
@@ -31,6 +32,8 @@ class TypedDictAttribute:
         required -- Whether the attribute has to be set.
     """
 
+    __slots__ = ("name", "required", "type_annotation")
+
     def __init__(self, name: str, type_annotation: FakeAnnotation, *, required: bool) -> None:
         self.name = name
         self.required = required
@@ -99,6 +102,8 @@ class TypeTypedDict(TypeParent, TypeDefSortable):
         stringify -- Convert type annotation to string to avoid circular deps.
     """
 
+    __slots__ = ("_stringify", "children", "docstring", "is_safe_as_class", "name")
+
     def __init__(
         self,
         name: str,
@@ -173,7 +178,7 @@ class TypeTypedDict(TypeParent, TypeDefSortable):
         """
         Get import record required for using type annotation.
         """
-        return {InternalImportRecord(ServiceModuleName.type_defs, name=self.name)}
+        return {ImportRecord.intern(Import.local(ServiceModuleName.type_defs.name), self.name)}
 
     def add_attribute(self, name: str, type_annotation: FakeAnnotation, *, required: bool) -> None:
         """
@@ -220,12 +225,14 @@ class TypeTypedDict(TypeParent, TypeDefSortable):
         """
         Create a copy of type annotation wrapper.
         """
-        return self.__class__(
+        result = self.__class__(
             self.name,
             list(self.children),
             docstring=self.docstring,
             stringify=self.is_stringified(),
         )
+        result.is_safe_as_class = self.is_safe_as_class
+        return result
 
     def is_same(self, other: Self) -> bool:
         """
@@ -237,10 +244,16 @@ class TypeTypedDict(TypeParent, TypeDefSortable):
         """
         Extract required type annotations from attributes.
         """
-        result: set[FakeAnnotation] = set()
+        return set(TypeIterator(child.type_annotation for child in self.children))
+
+    def iterate_child_types(self, *, deep: bool) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over attributes type annotations in `deep` mode.
+        """
+        if not deep:
+            return
         for child in self.children:
-            result.update(child.iterate_types())
-        return result
+            yield child.type_annotation
 
     def iterate_direct_type_annotations(self) -> Iterator[FakeAnnotation]:
         """
@@ -253,16 +266,13 @@ class TypeTypedDict(TypeParent, TypeDefSortable):
         """
         Extract required TypeLiteral list from attributes.
         """
-        result: set[TypeLiteral] = set()
         if self.name in processed:
-            return result
-        children_types = self.get_children_types()
-        for type_annotation in children_types:
-            if isinstance(type_annotation, TypeLiteral):
-                result.add(type_annotation)
-            if isinstance(type_annotation, TypeDefSortable):
-                result.update(type_annotation.get_children_literals((self.name, *processed)))
-        return result
+            return set()
+        type_iterator = TypeIterator(
+            (child.type_annotation for child in self.children),
+            deep=True,
+        )
+        return set(type_iterator.filter(TypeLiteral))
 
     def iterate_children(self) -> Generator[TypedDictAttribute]:
         """
@@ -307,3 +317,22 @@ class TypeTypedDict(TypeParent, TypeDefSortable):
             self.children[index].type_annotation = new_child
 
         return self
+
+    def replace_direct_type_annotations(
+        self,
+        get_replacement: Callable[[FakeAnnotation], FakeAnnotation],
+    ) -> Self:
+        """
+        Replace children type annotations.
+
+        Attributes are recreated, so copies of this TypedDict are not affected.
+        """
+        self.children = [
+            TypedDictAttribute(
+                child.name,
+                get_replacement(child.type_annotation),
+                required=child.required,
+            )
+            for child in self.children
+        ]
+        return self
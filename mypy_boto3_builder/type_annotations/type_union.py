@@ -4,20 +4,21 @@ Wrapper for name Union type annotations, like `MyUnion = Union[str, int]`.
 Copyright 2024 Vlad Emelianov
 """
 
-from collections.abc import Generator, Iterable
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Final, Self
 
 from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
 from mypy_boto3_builder.exceptions import TypeAnnotationError
+from mypy_boto3_builder.import_helpers.import_helper import Import
 from mypy_boto3_builder.import_helpers.import_record import ImportRecord
-from mypy_boto3_builder.import_helpers.internal_import_record import InternalImportRecord
 from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
 from mypy_boto3_builder.type_annotations.type import Type
 from mypy_boto3_builder.type_annotations.type_def_sortable import TypeDefSortable
 from mypy_boto3_builder.type_annotations.type_literal import TypeLiteral
 from mypy_boto3_builder.type_annotations.type_subscript import TypeSubscript
 from mypy_boto3_builder.utils.jinja2 import render_jinja2_template
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
 
 
 class TypeUnion(TypeSubscript, TypeDefSortable):
@@ -25,6 +26,8 @@ class TypeUnion(TypeSubscript, TypeDefSortable):
     Wrapper for name Union type annotations, like `MyUnion = Union[str, int]`.
     """
 
+    __slots__ = ("_stringify", "name")
+
     _MIN_CHILDREN: Final = 2
 
     def __init__(
@@ -90,25 +93,15 @@ class TypeUnion(TypeSubscript, TypeDefSortable):
         """
         Extract required type annotations from attributes.
         """
-        result: set[FakeAnnotation] = set()
-        for child in self.children:
-            result.update(child.iterate_types())
-        return result
+        return set(TypeIterator(self.children))
 
     def get_children_literals(self, processed: Iterable[str] = ()) -> set[TypeLiteral]:
         """
         Extract required TypeLiteral list from attributes.
         """
-        result: set[TypeLiteral] = set()
         if self.name in processed:
-            return result
-        children_types = self.get_children_types()
-        for type_annotation in children_types:
-            if isinstance(type_annotation, TypeLiteral):
-                result.add(type_annotation)
-            if isinstance(type_annotation, TypeDefSortable):
-                result.update(type_annotation.get_children_literals((self.name, *processed)))
-        return result
+            return set()
+        return set(TypeIterator(self.children, deep=True).filter(TypeLiteral))
 
     def get_definition_import_records(self) -> set[ImportRecord]:
         """
@@ -126,7 +119,7 @@ class TypeUnion(TypeSubscript, TypeDefSortable):
         Get import record required for using type annotation.
         """
         if self.is_named():
-            return {InternalImportRecord(ServiceModuleName.type_defs, name=self.name)}
+            return {ImportRecord.intern(Import.local(ServiceModuleName.type_defs.name), self.name)}
 
         return self.get_definition_import_records()
 
@@ -136,16 +129,21 @@ class TypeUnion(TypeSubscript, TypeDefSortable):
         """
         return self._get_import_records()
 
-    def iterate_types(self) -> Generator[FakeAnnotation]:
+    def is_used_type(self) -> bool:
         """
-        Extract type annotations from children.
+        Named Union is yielded by `iterate_types`, unnamed one is replaced by its children.
         """
-        if self.is_named():
-            yield self
-            return
+        return self.is_named()
 
-        for child in self.children:
-            yield from child.iterate_types()
+    def iterate_child_types(self, *, deep: bool) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over children type annotations.
+
+        Named Union children are yielded only in `deep` mode.
+        """
+        if self.is_named() and not deep:
+            return
+        yield from self.children
 
     def is_type_def(self) -> bool:
         """
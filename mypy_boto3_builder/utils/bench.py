@@ -0,0 +1,288 @@
+"""
+End-to-end build benchmarks with results history.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import datetime as dt
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from mypy_boto3_builder.constants import PROG_NAME
+from mypy_boto3_builder.enums.bench_scenario import BenchScenario
+from mypy_boto3_builder.enums.product import Product
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.utils.memory import format_memory_size
+from mypy_boto3_builder.utils.path import print_path
+from mypy_boto3_builder.utils.version import get_builder_version
+from mypy_boto3_builder.utils.version_getters import get_botocore_version
+
+if sys.platform != "win32":
+    import resource
+
+__all__ = ["BenchHistory", "BenchResult", "BenchRunner"]
+
+
+def get_children_cpu_time() -> float:
+    """
+    Get CPU time of finished child processes and their children in seconds.
+    """
+    if sys.platform == "win32":
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+@dataclass
+class BenchResult:
+    """
+    End-to-end benchmark scenario result.
+
+    Arguments:
+        scenario -- Scenario name.
+        products -- Built products.
+        services -- Number of built services.
+        files -- Number of written files.
+        wall -- Build wall time in seconds.
+        cpu -- Build CPU time in seconds, including subprocesses.
+        peak_rss -- Peak resident set size of the build process in bytes.
+        subprocesses -- Number of subprocesses started by the build.
+        builder_version -- Builder version.
+        botocore_version -- botocore version services are built from.
+        python_version -- Python version.
+        platform -- Platform name.
+        cpu_count -- Number of CPUs.
+        created -- Result creation time in ISO format.
+    """
+
+    scenario: str
+    products: list[str]
+    services: int
+    files: int
+    wall: float
+    cpu: float
+    peak_rss: int
+    subprocesses: int
+    builder_version: str
+    botocore_version: str
+    python_version: str
+    platform: str
+    cpu_count: int
+    created: str
+
+    @property
+    def services_per_second(self) -> float:
+        """
+        Built services per second of wall time.
+        """
+        return self.services / self.wall if self.wall else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        """
+        Written files per second of wall time.
+        """
+        return self.files / self.wall if self.wall else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get JSON data.
+        """
+        return {
+            **asdict(self),
+            "wall": round(self.wall, 3),
+            "cpu": round(self.cpu, 3),
+            "services_per_second": round(self.services_per_second, 3),
+            "files_per_second": round(self.files_per_second, 3),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BenchResult":
+        """
+        Create result from JSON data.
+        """
+        data = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**data)
+
+    def is_comparable(self, other: "BenchResult") -> bool:
+        """
+        Whether other result was measured for the same scenario and products.
+        """
+        return self.scenario == other.scenario and self.products == other.products
+
+    def render(self, previous: "BenchResult | None" = None) -> str:
+        """
+        Render result for logs, with a change from previous result.
+        """
+        services_change = ""
+        if previous and previous.services_per_second:
+            change = self.services_per_second * 100 / previous.services_per_second - 100
+            services_change = f" ({change:+.1f}% vs {previous.builder_version})"
+        return (
+            f"{self.scenario}: {self.services} services in {self.wall:.1f}s,"
+            f" {self.services_per_second:.2f} services/s{services_change},"
+            f" {self.files_per_second:.1f} files/s, CPU {self.cpu:.1f}s,"
+            f" peak RSS {format_memory_size(self.peak_rss)},"
+            f" {self.subprocesses} subprocesses"
+        )
+
+
+class BenchHistory:
+    """
+    Benchmark results history as a JSON lines file.
+
+    Arguments:
+        path -- History file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self) -> list[BenchResult]:
+        """
+        Load all recorded results.
+        """
+        if not self.path.exists():
+            return []
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        return [BenchResult.from_dict(json.loads(line)) for line in lines if line.strip()]
+
+    def get_previous(self, result: BenchResult) -> BenchResult | None:
+        """
+        Get the latest recorded result comparable to `result`.
+        """
+        for recorded in reversed(self.load()):
+            if recorded.is_comparable(result):
+                return recorded
+        return None
+
+    def append(self, result: BenchResult) -> None:
+        """
+        Append result to history.
+        """
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(result.to_dict()) + "\n")
+
+
+class BenchRunner:
+    """
+    Run product builds in subprocesses under controlled settings.
+
+    Builds do not use network and smart versioning, so results depend only on
+    builder version, botocore version and hardware.
+
+    Arguments:
+        products -- Products to build.
+        history -- Results history.
+        output_path -- Output directory for builds, temporary directory is used if None.
+        cache_path -- Builder cache directory.
+    """
+
+    def __init__(
+        self,
+        products: Sequence[Product],
+        history: BenchHistory,
+        output_path: Path | None = None,
+        cache_path: Path | None = None,
+    ) -> None:
+        self.products = list(products)
+        self.history = history
+        self.output_path = output_path
+        self.cache_path = cache_path
+        self.logger = get_logger()
+
+    def get_cmd(self, scenario: BenchScenario, output_path: Path, report_path: Path) -> list[str]:
+        """
+        Get builder command for scenario.
+        """
+        cmd = [
+            sys.executable,
+            "-m",
+            PROG_NAME,
+            output_path.as_posix(),
+            "--no-smart-version",
+            "--offline",
+            "--report",
+            report_path.as_posix(),
+            "--product",
+            *(i.value for i in self.products),
+            "--services",
+            *scenario.get_service_selection(),
+        ]
+        if self.cache_path:
+            cmd.extend(("--cache-dir", self.cache_path.as_posix()))
+        return cmd
+
+    def _run_build(
+        self, scenario: BenchScenario, output_path: Path, report_path: Path
+    ) -> BenchResult:
+        cmd = self.get_cmd(scenario, output_path, report_path)
+        self.logger.debug(f"Running {' '.join(cmd)}")
+        started_cpu = get_children_cpu_time()
+        started_wall = time.perf_counter()
+        try:
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        except subprocess.CalledProcessError as e:
+            raise BuildEnvError(
+                f"Benchmark {scenario.value} build failed with status {e.returncode}"
+            ) from None
+        wall = time.perf_counter() - started_wall
+        cpu = get_children_cpu_time() - started_cpu
+
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        return BenchResult(
+            scenario=scenario.value,
+            products=[i.value for i in self.products],
+            services=len([i for i in report["services"] if i]),
+            files=sum(i["files"] for i in report["stages"].values()),
+            wall=wall,
+            cpu=cpu or report["cpu"],
+            peak_rss=report["peak_rss"],
+            subprocesses=report["subprocesses"],
+            builder_version=get_builder_version(),
+            botocore_version=get_botocore_version(),
+            python_version=platform.python_version(),
+            platform=platform.platform(),
+            cpu_count=os.cpu_count() or 1,
+            created=dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+        )
+
+    def run_scenario(self, scenario: BenchScenario) -> BenchResult:
+        """
+        Build products for scenario and record result to history.
+        """
+        self.logger.info(f"Running {scenario.value} benchmark")
+        if self.output_path:
+            result = self._run_build(
+                scenario,
+                self.output_path / scenario.value,
+                self.output_path / f"{scenario.value}.json",
+            )
+        else:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_path = Path(temp_dir)
+                result = self._run_build(scenario, temp_path / "output", temp_path / "run.json")
+
+        previous = self.history.get_previous(result)
+        self.history.append(result)
+        self.logger.info(result.render(previous))
+        return result
+
+    def run(self, scenarios: Iterable[BenchScenario]) -> list[BenchResult]:
+        """
+        Run scenarios one by one.
+        """
+        result = [self.run_scenario(scenario) for scenario in scenarios]
+        self.logger.info(f"Benchmark results appended to {print_path(self.history.path)}")
+        return result
@@ -6,10 +6,8 @@ Copyright 2024 Vlad Emelianov
 
 import re
 
-import requests
-
-from mypy_boto3_builder.constants import REQUEST_TIMEOUT
 from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.http_client import HTTPClient
 
 
 class BotocoreChangelog:
@@ -25,7 +23,7 @@ class BotocoreChangelog:
 
     @classmethod
     def _get_changelog(cls) -> str:
-        response = requests.get(cls.URL, timeout=REQUEST_TIMEOUT)
+        response = HTTPClient().get(cls.URL)
         if not response.ok:
             raise BuildEnvError(
                 f"Cannot retrieve {cls.URL}: {response.status_code} {response.text}",
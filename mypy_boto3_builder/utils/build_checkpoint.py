@@ -0,0 +1,185 @@
+"""
+Checkpoint journal of completed services for resumable builds.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from mypy_boto3_builder.constants import CHECKPOINT_NAME
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.utils.path import print_path
+from mypy_boto3_builder.utils.service_fingerprints import ServiceFingerprints
+from mypy_boto3_builder.utils.version import get_builder_version
+
+__all__ = ["BuildCheckpoint", "CheckpointEntry"]
+
+
+@dataclass(frozen=True)
+class CheckpointEntry:
+    """
+    Service package completed by a build.
+
+    Arguments:
+        product -- Product name.
+        service_name -- Service name.
+        version -- Service package build version.
+        fingerprint -- Service model fingerprint.
+        builder_version -- Builder version.
+        directory_name -- Generated package directory name.
+        options_hash -- Hash of build options and service set that affect package content.
+    """
+
+    product: str
+    service_name: str
+    version: str
+    fingerprint: str
+    builder_version: str
+    directory_name: str
+    options_hash: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CheckpointEntry":
+        """
+        Create entry from JSON data.
+        """
+        return cls(**{key: str(data[key]) for key in cls.__dataclass_fields__})
+
+
+class BuildCheckpoint:
+    """
+    Checkpoint journal of completed services in an output directory.
+
+    Every completed service package is appended to the journal as soon as it is
+    written, so the journal survives interrupts and crashes. Entries that are
+    already in the journal are not appended again, so an unchanged rebuild
+    does not touch the journal.
+    On resume, a service package is skipped if it was built by the same builder
+    version from the same service model with the same package version and build options,
+    and its output directory still exists.
+
+    Arguments:
+        output_path -- Output directory.
+        fingerprints -- Current service model fingerprints.
+        options_hash -- Hash of build options and service set, see `get_options_hash`.
+    """
+
+    def __init__(
+        self, output_path: Path, fingerprints: ServiceFingerprints, options_hash: str = ""
+    ) -> None:
+        self.output_path = output_path
+        self.path = output_path / CHECKPOINT_NAME
+        self.fingerprints = fingerprints
+        self.options_hash = options_hash
+        self.builder_version = get_builder_version()
+        self.completed: dict[tuple[str, str], CheckpointEntry] = {}
+        self.resume = False
+        self._lock = threading.Lock()
+        self._logger = get_logger()
+
+    @staticmethod
+    def get_options_hash(options: dict[str, Any]) -> str:
+        """
+        Get hash of build options that affect service package content.
+
+        Arguments:
+            options -- JSON-serializable options, e.g. service names included in literals.
+        """
+        data = json.dumps(options, sort_keys=True).encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def load(self) -> list[CheckpointEntry]:
+        """
+        Load all recorded entries.
+
+        A partially written last line of an interrupted run is ignored.
+        """
+        if not self.path.exists():
+            return []
+        result: list[CheckpointEntry] = []
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                result.append(CheckpointEntry.from_dict(json.loads(line)))
+            except (ValueError, KeyError):
+                continue
+        return result
+
+    def start(self, *, resume: bool) -> None:
+        """
+        Load services completed by previous runs.
+
+        Arguments:
+            resume -- Skip services completed by a previous run.
+        """
+        self.resume = resume
+        self.completed = {}
+        for entry in self.load():
+            self.completed[entry.product, entry.service_name] = entry
+        if not resume:
+            return
+
+        self._logger.info(
+            f"Resuming build with {len(self.completed)} completed service packages"
+            f" from {print_path(self.path)}"
+        )
+
+    def get_completed(
+        self, product: str, service_name: str, version: str
+    ) -> CheckpointEntry | None:
+        """
+        Get up to date completed service package entry.
+
+        Arguments:
+            product -- Product name.
+            service_name -- Service name.
+            version -- Service package build version.
+        """
+        if not self.resume:
+            return None
+        entry = self.completed.get((product, service_name))
+        if entry is None:
+            return None
+        if (
+            entry.version != version
+            or entry.builder_version != self.builder_version
+            or entry.options_hash != self.options_hash
+            or entry.fingerprint != self.fingerprints.fingerprints.get(service_name, "")
+        ):
+            return None
+        if not (self.output_path / entry.directory_name).is_dir():
+            return None
+        return entry
+
+    def add_completed(
+        self, product: str, service_name: str, version: str, directory_name: str
+    ) -> None:
+        """
+        Record completed service package to the journal.
+
+        Arguments:
+            product -- Product name.
+            service_name -- Service name.
+            version -- Service package build version.
+            directory_name -- Generated package directory name.
+        """
+        entry = CheckpointEntry(
+            product=product,
+            service_name=service_name,
+            version=version,
+            fingerprint=self.fingerprints.fingerprints.get(service_name, ""),
+            builder_version=self.builder_version,
+            directory_name=directory_name,
+            options_hash=self.options_hash,
+        )
+        with self._lock:
+            if self.completed.get((product, service_name)) == entry:
+                return
+            self.path.parent.mkdir(exist_ok=True, parents=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(entry)) + "\n")
+            self.completed[product, service_name] = entry
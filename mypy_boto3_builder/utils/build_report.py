@@ -0,0 +1,383 @@
+"""
+Per-service and per-stage build timings report.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import contextlib
+import json
+import threading
+import time
+import tracemalloc
+from collections.abc import Generator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.utils.memory import get_peak_rss, get_rss
+from mypy_boto3_builder.utils.path import print_path
+from mypy_boto3_builder.utils.version import get_builder_version
+
+__all__ = ["BuildReport", "StageStats"]
+
+
+@dataclass
+class StageStats:
+    """
+    Accumulated stage statistics.
+
+    Arguments:
+        calls -- Number of times stage was entered.
+        wall -- Wall time in seconds, excluding nested stages.
+        cpu -- CPU time of the calling thread in seconds, excluding nested stages.
+        files -- Number of files written.
+        bytes -- Number of bytes written.
+        peak_memory -- Max traced memory growth during stage in bytes, including nested stages.
+        retained_memory -- Traced memory still allocated after stage in bytes,
+            excluding nested stages.
+    """
+
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    files: int = 0
+    bytes: int = 0
+    peak_memory: int = 0
+    retained_memory: int = 0
+
+    def add(self, other: "StageStats") -> None:
+        """
+        Add other stage statistics to this one.
+        """
+        self.calls += other.calls
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.files += other.files
+        self.bytes += other.bytes
+        self.peak_memory = max(self.peak_memory, other.peak_memory)
+        self.retained_memory += other.retained_memory
+
+    def to_dict(self, *, memory: bool = False) -> dict[str, Any]:
+        """
+        Get JSON data.
+
+        Arguments:
+            memory -- Include traced memory.
+        """
+        result: dict[str, Any] = {
+            "calls": self.calls,
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "files": self.files,
+            "bytes": self.bytes,
+        }
+        if memory:
+            result["peak_memory"] = self.peak_memory
+            result["retained_memory"] = self.retained_memory
+        return result
+
+
+class _Frame:
+    """
+    Running stage in a thread stack.
+    """
+
+    __slots__ = (
+        "child_cpu",
+        "child_retained_memory",
+        "child_wall",
+        "max_memory",
+        "name",
+        "started_cpu",
+        "started_memory",
+        "started_wall",
+    )
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+        self.started_memory = 0
+        self.max_memory = 0
+        self.child_retained_memory = 0
+        self.started_wall = time.perf_counter()
+        self.started_cpu = time.thread_time()
+
+
+class _ThreadState(threading.local):
+    """
+    Current service and stage stack of a thread.
+    """
+
+    def __init__(self) -> None:
+        self.service_name = ""
+        self.frames: list[_Frame] = []
+
+
+class BuildReport:
+    """
+    Per-service and per-stage build timings report.
+
+    Disabled by default, so instrumented code only pays for one attribute check.
+    Stages can be nested, every stage reports only its own time, so stage times
+    add up to the instrumented build time without double counting.
+    CPU time is measured for the calling thread, time spent in subprocesses
+    like `ruff` is reported only as wall time.
+    Stages outside of a service are reported under an empty service name.
+
+    With memory tracing, `tracemalloc` peak and retained memory and process RSS
+    are reported as well. Memory is traced for the whole process, so stages running
+    at the same time in other threads add to each other peaks.
+    """
+
+    _enabled: ClassVar[bool] = False
+    _trace_memory: ClassVar[bool] = False
+    _rss: ClassVar[dict[str, int]] = {}
+    _subprocesses: ClassVar[int] = 0
+    _started_wall: ClassVar[float] = 0.0
+    _started_cpu: ClassVar[float] = 0.0
+    _stats: ClassVar[dict[tuple[str, str], StageStats]] = {}
+    _lock: ClassVar = threading.Lock()
+    _state: ClassVar = _ThreadState()
+    _null_context: ClassVar = contextlib.nullcontext()
+
+    @classmethod
+    def start(cls, *, trace_memory: bool = False) -> None:
+        """
+        Reset collected statistics and start collecting new ones.
+
+        Arguments:
+            trace_memory -- Trace memory allocations with `tracemalloc`.
+        """
+        with cls._lock:
+            cls._stats = {}
+            cls._rss = {}
+            cls._subprocesses = 0
+            cls._started_wall = time.perf_counter()
+            cls._started_cpu = time.process_time()
+            cls._trace_memory = trace_memory
+            cls._enabled = True
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Stop collecting statistics.
+        """
+        cls._enabled = False
+        if cls._trace_memory:
+            cls._trace_memory = False
+            tracemalloc.stop()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """
+        Whether statistics are collected.
+        """
+        return cls._enabled
+
+    @classmethod
+    def _get_stats(cls, service_name: str, stage: str) -> StageStats:
+        key = (service_name, stage)
+        stats = cls._stats.get(key)
+        if stats is None:
+            stats = cls._stats[key] = StageStats()
+        return stats
+
+    @classmethod
+    def record(cls, stage: str, wall: float, cpu: float = 0.0, calls: int = 1) -> None:
+        """
+        Record stage time measured by caller as a nested stage of the current one.
+
+        Arguments:
+            stage -- Stage name.
+            wall -- Wall time in seconds.
+            cpu -- CPU time in seconds.
+            calls -- Number of calls.
+        """
+        if not cls._enabled:
+            return
+        state = cls._state
+        if state.frames:
+            state.frames[-1].child_wall += wall
+            state.frames[-1].child_cpu += cpu
+        with cls._lock:
+            stats = cls._get_stats(state.service_name, stage)
+            stats.calls += calls
+            stats.wall += wall
+            stats.cpu += cpu
+
+    @classmethod
+    def add_output(cls, size: int) -> None:
+        """
+        Add a written file to the current service and stage.
+
+        Arguments:
+            size -- File size in bytes.
+        """
+        if not cls._enabled:
+            return
+        state = cls._state
+        stage = state.frames[-1].name if state.frames else ""
+        with cls._lock:
+            stats = cls._get_stats(state.service_name, stage)
+            stats.files += 1
+            stats.bytes += size
+
+    @classmethod
+    def add_subprocess(cls) -> None:
+        """
+        Count a started subprocess.
+        """
+        if not cls._enabled:
+            return
+        with cls._lock:
+            cls._subprocesses += 1
+
+    @staticmethod
+    def _start_frame_memory(frame: _Frame, parent: _Frame | None) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        if parent:
+            parent.max_memory = max(parent.max_memory, peak)
+        tracemalloc.reset_peak()
+        frame.started_memory = current
+        frame.max_memory = current
+
+    @classmethod
+    def _finish_frame_memory(cls, frame: _Frame, parent: _Frame | None, stats: StageStats) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        max_memory = max(frame.max_memory, peak)
+        retained_memory = current - frame.started_memory
+        if parent:
+            parent.max_memory = max(parent.max_memory, max_memory)
+            parent.child_retained_memory += retained_memory
+        stats.peak_memory = max(stats.peak_memory, max_memory - frame.started_memory)
+        stats.retained_memory += retained_memory - frame.child_retained_memory
+        service_name = cls._state.service_name
+        cls._rss[service_name] = max(cls._rss.get(service_name, 0), get_rss())
+
+    @classmethod
+    @contextlib.contextmanager
+    def _stage(cls, name: str) -> Generator[None, None, None]:
+        frames = cls._state.frames
+        frame = _Frame(name)
+        if cls._trace_memory:
+            cls._start_frame_memory(frame, frames[-1] if frames else None)
+        frames.append(frame)
+        try:
+            yield
+        finally:
+            frames.pop()
+            wall = time.perf_counter() - frame.started_wall
+            cpu = time.thread_time() - frame.started_cpu
+            parent = frames[-1] if frames else None
+            if parent:
+                parent.child_wall += wall
+                parent.child_cpu += cpu
+            with cls._lock:
+                stats = cls._get_stats(cls._state.service_name, name)
+                stats.calls += 1
+                stats.wall += wall - frame.child_wall
+                stats.cpu += cpu - frame.child_cpu
+                if cls._trace_memory:
+                    cls._finish_frame_memory(frame, parent, stats)
+
+    @classmethod
+    def stage(cls, name: str) -> contextlib.AbstractContextManager[None]:
+        """
+        Measure time of a build stage in the current thread.
+
+        Arguments:
+            name -- Stage name.
+        """
+        if not cls._enabled:
+            return cls._null_context
+        return cls._stage(name)
+
+    @classmethod
+    @contextlib.contextmanager
+    def _service(cls, service_name: str) -> Generator[None, None, None]:
+        state = cls._state
+        previous_service_name = state.service_name
+        state.service_name = service_name
+        try:
+            yield
+        finally:
+            state.service_name = previous_service_name
+
+    @classmethod
+    def service(cls, service_name: str) -> contextlib.AbstractContextManager[None]:
+        """
+        Assign stages in the current thread to a service.
+
+        Arguments:
+            service_name -- Service name.
+        """
+        if not cls._enabled:
+            return cls._null_context
+        return cls._service(service_name)
+
+    @classmethod
+    def get_stage_totals(cls) -> dict[str, StageStats]:
+        """
+        Get statistics for each stage summed over all services.
+        """
+        result: dict[str, StageStats] = {}
+        with cls._lock:
+            for (_service_name, stage), stats in cls._stats.items():
+                result.setdefault(stage, StageStats()).add(stats)
+        return dict(sorted(result.items(), key=lambda x: -x[1].wall))
+
+    @classmethod
+    def to_dict(cls) -> dict[str, Any]:
+        """
+        Get report JSON data.
+        """
+        services: dict[str, dict[str, StageStats]] = {}
+        with cls._lock:
+            for (service_name, stage), stats in sorted(cls._stats.items()):
+                services.setdefault(service_name, {})[stage] = stats
+
+        memory = cls._trace_memory
+        services_data: dict[str, Any] = {}
+        for service_name, stages in services.items():
+            total = StageStats()
+            for stats in stages.values():
+                total.add(stats)
+            total_data = total.to_dict(memory=memory)
+            total_data.pop("calls")
+            if memory:
+                total_data["rss"] = cls._rss.get(service_name, 0)
+            services_data[service_name] = {
+                **total_data,
+                "stages": {stage: stats.to_dict(memory=memory) for stage, stats in stages.items()},
+            }
+
+        return {
+            "builder_version": get_builder_version(),
+            "wall": round(time.perf_counter() - cls._started_wall, 6),
+            "cpu": round(time.process_time() - cls._started_cpu, 6),
+            "peak_rss": get_peak_rss(),
+            "subprocesses": cls._subprocesses,
+            "stages": {
+                stage: stats.to_dict(memory=memory)
+                for stage, stats in cls.get_stage_totals().items()
+            },
+            "services": services_data,
+        }
+
+    @classmethod
+    def save(cls, path: Path) -> None:
+        """
+        Save report to a JSON file.
+        """
+        data = cls.to_dict()
+        path.parent.mkdir(exist_ok=True, parents=True)
+        path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        stages_str = ", ".join(
+            f"{stage or 'other'} {stats['wall']:.2f}s"
+            for stage, stats in list(data["stages"].items())[:5]
+        )
+        get_logger().info(f"Saved build report to {print_path(path)}: {stages_str}")
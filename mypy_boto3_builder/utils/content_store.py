@@ -0,0 +1,96 @@
+"""
+Content-addressed local store for static stubs and downloaded archives.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import hashlib
+import shutil
+import uuid
+from pathlib import Path
+
+
+class ContentStore:
+    """
+    Content-addressed local store for static stubs and downloaded archives.
+
+    Objects are saved by their SHA256 digest and never change, so output files
+    can be hardlinked to them instead of copied. Objects are read-only to protect
+    them from in-place edits through hardlinks.
+
+    Arguments:
+        path -- Store root directory.
+    """
+
+    OBJECT_MODE = 0o444
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._sizes: set[int] = set()
+
+    @staticmethod
+    def get_digest(data: bytes) -> str:
+        """
+        Get SHA256 hex digest of data.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def _get_object_path(self, digest: str) -> Path:
+        return self.path / "objects" / digest[:2] / digest[2:]
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes, mode: int | None = None) -> None:
+        path.parent.mkdir(exist_ok=True, parents=True)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            temp_path.write_bytes(data)
+            if mode is not None:
+                temp_path.chmod(mode)
+            temp_path.replace(path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def add(self, data: bytes) -> Path:
+        """
+        Add data to store if it is not there yet.
+
+        Returns:
+            Path to stored object.
+        """
+        object_path = self._get_object_path(self.get_digest(data))
+        if not object_path.exists():
+            self._write_atomic(object_path, data, mode=self.OBJECT_MODE)
+        self._sizes.add(len(data))
+        return object_path
+
+    def find(self, data: bytes) -> Path | None:
+        """
+        Find stored object with the same data.
+
+        Only objects added in this run are checked, other data is not hashed.
+        """
+        if len(data) not in self._sizes:
+            return None
+
+        object_path = self._get_object_path(self.get_digest(data))
+        if not object_path.exists():
+            return None
+        return object_path
+
+    def link(self, object_path: Path, target_path: Path) -> None:
+        """
+        Hardlink stored object to `target_path`, fall back to a copy.
+
+        `target_path` must not exist.
+        """
+        try:
+            target_path.hardlink_to(object_path)
+        except OSError:
+            shutil.copyfile(object_path, target_path)
+
+    def get_archive_path(self, data: bytes) -> Path:
+        """
+        Get directory to extract archive with this data to.
+        """
+        return self.path / "archives" / self.get_digest(data)
@@ -0,0 +1,205 @@
+"""
+Service generation cost model and progress with ETA.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, cast
+
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.service_name import ServiceName
+from mypy_boto3_builder.utils.boto3_utils import get_botocore_session
+
+
+def get_service_cost(service_name: ServiceName) -> int:
+    """
+    Estimate service generation cost as a number of operations and shapes.
+    """
+    service_data = cast(
+        "dict[str, Any]", get_botocore_session().get_service_data(service_name.boto3_name)
+    )
+    return len(service_data.get("operations", {})) + len(service_data.get("shapes", {}))
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format duration as `1h02m`, `1m05s` or `42s`.
+    """
+    total_seconds = round(seconds)
+    hours, rest = divmod(total_seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02}m"
+    if minutes:
+        return f"{minutes}m{secs:02}s"
+    return f"{secs}s"
+
+
+class CostModel:
+    """
+    Predict service generation time.
+
+    Services generated before use their recorded time. Other services are estimated
+    from a number of operations and shapes, converted to seconds with the average
+    speed of recorded services if there are any.
+
+    Arguments:
+        timings -- Service name to generation time in seconds mapping from earlier runs.
+        path -- Path to save timings to.
+    """
+
+    def __init__(
+        self, timings: Mapping[str, float] | None = None, path: Path | None = None
+    ) -> None:
+        self.timings = dict(timings or {})
+        self.path = path
+        self._units: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path | None) -> "CostModel":
+        """
+        Load timings recorded by earlier runs.
+
+        Arguments:
+            path -- Timings file, timings are not loaded or saved if None.
+        """
+        if not path or not path.exists():
+            return cls(path=path)
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data["services"], path=path)
+
+    def save(self) -> None:
+        """
+        Save recorded timings.
+        """
+        if not self.path:
+            return
+
+        with self._lock:
+            data = {"services": {k: round(v, 3) for k, v in sorted(self.timings.items())}}
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self.path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        get_logger().debug(f"Saved {len(data['services'])} service timings to {self.path}")
+
+    def record(self, service_name: ServiceName, seconds: float) -> None:
+        """
+        Record service generation time.
+        """
+        with self._lock:
+            self.timings[service_name.name] = seconds
+
+    def get_units(self, service_name: ServiceName) -> int:
+        """
+        Get service cost in operations and shapes.
+        """
+        if service_name.name not in self._units:
+            self._units[service_name.name] = max(get_service_cost(service_name), 1)
+        return self._units[service_name.name]
+
+    def _get_seconds_per_unit(self, service_names: Iterable[ServiceName]) -> float | None:
+        timed_service_names = [i for i in service_names if i.name in self.timings]
+        total_units = sum(self.get_units(i) for i in timed_service_names)
+        if not total_units:
+            return None
+        return sum(self.timings[i.name] for i in timed_service_names) / total_units
+
+    def get_costs(self, service_names: Iterable[ServiceName]) -> dict[ServiceName, float]:
+        """
+        Predict generation cost for services.
+
+        Returns:
+            Service name to cost mapping, in seconds if any of services has recorded time.
+        """
+        service_name_list = list(service_names)
+        seconds_per_unit = self._get_seconds_per_unit(service_name_list) or 1.0
+        return {
+            service_name: self.timings.get(
+                service_name.name, self.get_units(service_name) * seconds_per_unit
+            )
+            for service_name in service_name_list
+        }
+
+    def sort(self, service_names: Iterable[ServiceName]) -> list[ServiceName]:
+        """
+        Sort services by predicted cost, the most expensive first.
+        """
+        costs = self.get_costs(service_names)
+        return sorted(costs, key=lambda x: (-costs[x], x.name))
+
+    def get_progress(self, service_names: Iterable[ServiceName]) -> "CostProgress":
+        """
+        Create progress tracker for services.
+        """
+        service_name_list = list(service_names)
+        costs = self.get_costs(service_name_list)
+        return CostProgress(
+            {k.name: v for k, v in costs.items()},
+            calibrated=self._get_seconds_per_unit(service_name_list) is not None,
+        )
+
+
+class CostProgress:
+    """
+    Progress with ETA based on predicted remaining cost.
+
+    Arguments:
+        costs -- Item name to predicted cost mapping.
+        calibrated -- Whether costs are in seconds, so ETA is known before the first item is done.
+    """
+
+    def __init__(self, costs: Mapping[str, float], *, calibrated: bool) -> None:
+        self.costs = dict(costs)
+        self.calibrated = calibrated
+        self.total_cost = sum(self.costs.values())
+        self.done_cost = 0.0
+        self.started = 0.0
+        self._done: set[str] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> str:
+        """
+        Start progress timer on the first call.
+
+        Returns:
+            Progress string for logs.
+        """
+        with self._lock:
+            if not self.started:
+                self.started = time.monotonic()
+            return self._get_progress_str()
+
+    def finish(self, name: str) -> None:
+        """
+        Mark item as finished.
+        """
+        with self._lock:
+            if name in self._done:
+                return
+            self._done.add(name)
+            self.done_cost += self.costs.get(name, 0.0)
+
+    def get_eta(self) -> float | None:
+        """
+        Get predicted remaining time in seconds or None if it is not known yet.
+        """
+        remaining_cost = max(self.total_cost - self.done_cost, 0.0)
+        if self.done_cost and self.started:
+            elapsed = time.monotonic() - self.started
+            return remaining_cost * elapsed / self.done_cost
+        if self.calibrated:
+            return remaining_cost
+        return None
+
+    def _get_progress_str(self) -> str:
+        percent = self.done_cost * 100 / self.total_cost if self.total_cost else 100.0
+        eta = self.get_eta()
+        if eta is None:
+            return f"[{percent:3.0f}%]"
+        return f"[{percent:3.0f}% ETA {format_duration(eta)}]"
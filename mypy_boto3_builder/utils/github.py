@@ -4,36 +4,79 @@ GitHub-related utils.
 Copyright 2024 Vlad Emelianov
 """
 
+import shutil
+import uuid
 from io import BytesIO
 from pathlib import Path
 from zipfile import ZipFile
 
-import requests
-
 from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.content_store import ContentStore
+from mypy_boto3_builder.utils.http_client import HTTPClient
 
 
-def download_and_extract(url: str, output_path: Path) -> Path:
+def download_archive(url: str) -> bytes:
     """
-    Download and extract zip file with stubs from GitHub URL.
+    Download zip file from GitHub URL.
     """
-    response = requests.get(url, timeout=60)
-    zipfile = ZipFile(BytesIO(response.content))
-
+    response = HTTPClient().get(url, timeout=60)
     if not response.ok:
         raise BuildEnvError(f"Failed to download URL {url}: {response.status_code} {response.text}")
 
+    return response.content
+
+
+def get_project_root(zipfile: ZipFile) -> str:
+    """
+    Get directory with `py.typed` file inside zip file.
+    """
     project_roots = [
         Path(i).parent.as_posix() for i in zipfile.namelist() if Path(i).name == "py.typed"
     ]
     if len(project_roots) != 1:
         raise BuildEnvError(f"Failed to detect project root: {project_roots}")
 
-    project_root = project_roots[0]
+    return project_roots[0]
+
 
+def extract_project(zipfile: ZipFile, project_root: str, output_path: Path) -> None:
+    """
+    Extract `project_root` directory from zip file.
+    """
     for member in zipfile.namelist():
         if not member.startswith(project_root):
             continue
         zipfile.extract(member, output_path)
 
+
+def download_and_extract(url: str, output_path: Path) -> Path:
+    """
+    Download and extract zip file with stubs from GitHub URL.
+    """
+    zipfile = ZipFile(BytesIO(download_archive(url)))
+    project_root = get_project_root(zipfile)
+    extract_project(zipfile, project_root, output_path)
     return output_path / project_root
+
+
+def download_and_extract_cached(url: str, store: ContentStore) -> Path:
+    """
+    Download zip file with stubs from GitHub URL and extract it to content store.
+
+    Archive with the same content is extracted only once.
+    """
+    data = download_archive(url)
+    zipfile = ZipFile(BytesIO(data))
+    project_root = get_project_root(zipfile)
+    archive_path = store.get_archive_path(data)
+    if not archive_path.exists():
+        archive_path.parent.mkdir(exist_ok=True, parents=True)
+        temp_path = archive_path.with_name(f".{archive_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        extract_project(zipfile, project_root, temp_path)
+        try:
+            temp_path.rename(archive_path)
+        except OSError:
+            # extracted by a concurrent process
+            shutil.rmtree(temp_path)
+
+    return archive_path / project_root
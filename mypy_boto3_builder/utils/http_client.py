@@ -0,0 +1,261 @@
+"""
+Shared HTTP client with connection pooling and on-disk cache.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import hashlib
+import json
+import threading
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, ClassVar, cast
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from mypy_boto3_builder.constants import REQUEST_TIMEOUT
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.logger import get_logger
+
+__all__ = ["HTTPClient", "HTTPResponse"]
+
+
+@dataclass
+class HTTPResponse:
+    """
+    HTTP response data.
+    """
+
+    url: str
+    status_code: int
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict[str, str])
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether response status is not an error.
+        """
+        return self.status_code < HTTPStatus.BAD_REQUEST
+
+    @property
+    def text(self) -> str:
+        """
+        Response body as a string.
+        """
+        return self.content.decode()
+
+    def json(self) -> dict[str, Any]:
+        """
+        Response body parsed as JSON object.
+
+        Raises:
+            BuildEnvError -- If response body is not a JSON object.
+        """
+        data: object = json.loads(self.content)
+        if not isinstance(data, dict):
+            raise BuildEnvError(f"Response from {self.url} is not a JSON object")
+        return cast("dict[str, Any]", data)
+
+
+class HTTPClient:
+    """
+    Shared HTTP client with connection pooling and on-disk cache.
+
+    All instances share one `requests.Session`, so connections are reused.
+    If cache path is configured, successful and not found responses are saved to disk
+    and revalidated with `ETag` and `Last-Modified` headers. Cached responses are used
+    in offline mode and when the server cannot be reached.
+
+    Requests can be started in background with `prefetch`, so `get` only waits
+    for the response it needs while other work is running.
+    """
+
+    POOL_SIZE: ClassVar = 16
+    CACHED_STATUS_CODES: ClassVar = {HTTPStatus.OK, HTTPStatus.NOT_FOUND}
+
+    _session: ClassVar[requests.Session | None] = None
+    _session_lock: ClassVar = threading.Lock()
+    _cache_path: ClassVar[Path | None] = None
+    _offline: ClassVar[bool] = False
+    _prefetch_executor: ClassVar[ThreadPoolExecutor | None] = None
+    _prefetched: ClassVar[dict[str, Future[HTTPResponse]]] = {}
+    _prefetch_lock: ClassVar = threading.Lock()
+
+    def __init__(self) -> None:
+        self._logger = get_logger()
+
+    @classmethod
+    def configure(cls, cache_path: Path | None, *, offline: bool = False) -> None:
+        """
+        Set on-disk cache path and offline mode for all clients.
+
+        Arguments:
+            cache_path -- Directory for cached responses, `None` to disable cache.
+            offline -- Serve responses only from cache.
+        """
+        cls._cache_path = cache_path
+        cls._offline = offline
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Get shared session with a connection pool.
+        """
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=cls.POOL_SIZE, pool_maxsize=cls.POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+            return cls._session
+
+    def _get_cache_paths(self, url: str) -> tuple[Path, Path] | None:
+        if self._cache_path is None:
+            return None
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self._cache_path / f"{key}.json", self._cache_path / f"{key}.body"
+
+    def _get_cached(self, url: str) -> HTTPResponse | None:
+        cache_paths = self._get_cache_paths(url)
+        if not cache_paths:
+            return None
+        meta_path, body_path = cache_paths
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text())
+        except ValueError:
+            return None
+        return HTTPResponse(
+            url=url,
+            status_code=meta["status_code"],
+            content=body_path.read_bytes(),
+            headers=meta["headers"],
+            from_cache=True,
+        )
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(exist_ok=True, parents=True)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            temp_path.write_bytes(data)
+            temp_path.replace(path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def _save_cached(self, response: HTTPResponse) -> None:
+        cache_paths = self._get_cache_paths(response.url)
+        if not cache_paths or response.status_code not in self.CACHED_STATUS_CODES:
+            return
+        meta_path, body_path = cache_paths
+        meta = {"status_code": response.status_code, "headers": response.headers}
+        self._write_atomic(body_path, response.content)
+        self._write_atomic(meta_path, json.dumps(meta).encode())
+
+    @staticmethod
+    def _get_conditional_headers(cached: HTTPResponse | None) -> dict[str, str]:
+        if not cached or cached.status_code != HTTPStatus.OK:
+            return {}
+        result: dict[str, str] = {}
+        if "ETag" in cached.headers:
+            result["If-None-Match"] = cached.headers["ETag"]
+        if "Last-Modified" in cached.headers:
+            result["If-Modified-Since"] = cached.headers["Last-Modified"]
+        return result
+
+    def prefetch(self, urls: Iterable[str], timeout: float = REQUEST_TIMEOUT) -> None:
+        """
+        Start GET requests in background threads.
+
+        Next `get` call for each URL waits for the prefetched response instead of
+        sending a new request. Failed prefetches raise their error on `get`.
+
+        Arguments:
+            urls -- Request URLs.
+            timeout -- Request timeout in seconds.
+        """
+        with self._prefetch_lock:
+            for url in urls:
+                if url in self._prefetched:
+                    continue
+                if HTTPClient._prefetch_executor is None:
+                    HTTPClient._prefetch_executor = ThreadPoolExecutor(
+                        max_workers=self.POOL_SIZE,
+                        thread_name_prefix="prefetch",
+                    )
+                self._logger.debug(f"Prefetching {url}")
+                self._prefetched[url] = HTTPClient._prefetch_executor.submit(
+                    self._get, url, timeout
+                )
+
+    @classmethod
+    def cancel_prefetch(cls) -> None:
+        """
+        Cancel pending prefetches and drop responses that were not used.
+        """
+        with cls._prefetch_lock:
+            if cls._prefetch_executor is not None:
+                cls._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+                cls._prefetch_executor = None
+            cls._prefetched.clear()
+
+    def get(self, url: str, timeout: float = REQUEST_TIMEOUT) -> HTTPResponse:
+        """
+        Send GET request or get prefetched or cached response.
+
+        Arguments:
+            url -- Request URL.
+            timeout -- Request timeout in seconds.
+        """
+        with self._prefetch_lock:
+            future = self._prefetched.pop(url, None)
+        if future is not None:
+            return future.result()
+
+        return self._get(url, timeout)
+
+    def _get(self, url: str, timeout: float) -> HTTPResponse:
+        cached = self._get_cached(url)
+        if self._offline:
+            if cached is None:
+                raise BuildEnvError(f"Cannot retrieve {url} in offline mode: not cached")
+            return cached
+
+        try:
+            raw_response = self.get_session().get(
+                url,
+                headers=self._get_conditional_headers(cached),
+                timeout=timeout,
+            )
+        except requests.RequestException as e:
+            if cached is None:
+                raise BuildEnvError(f"Cannot retrieve {url}: {e}") from None
+            self._logger.warning(f"Cannot retrieve {url}, using cached response: {e}")
+            return cached
+
+        if cached and raw_response.status_code == HTTPStatus.NOT_MODIFIED:
+            self._logger.debug(f"Using cached {url}: not modified")
+            return cached
+
+        response = HTTPResponse(
+            url=url,
+            status_code=raw_response.status_code,
+            content=raw_response.content,
+            headers={
+                key: raw_response.headers[key]
+                for key in ("ETag", "Last-Modified", "Content-Type")
+                if key in raw_response.headers
+            },
+        )
+        self._save_cached(response)
+        return response
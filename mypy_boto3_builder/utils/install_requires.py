@@ -4,8 +4,10 @@ InstallRequires container.
 Copyright 2024 Vlad Emelianov
 """
 
+import copy
 from collections.abc import Iterable, Iterator
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from typing import Self
 
 from mypy_boto3_builder.utils.version import sort_versions
 
@@ -119,3 +121,15 @@ class InstallRequires:
         Clear install_requires.
         """
         self.items = []
+
+    def copy(self) -> Self:
+        """
+        Copy install_requires with all items.
+        """
+        return copy.copy(self)
+
+    def __copy__(self) -> Self:
+        """
+        Copy install_requires with all items.
+        """
+        return self.__class__(replace(item) for item in self.items)
@@ -0,0 +1,150 @@
+"""
+Process memory usage and memory budget.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import gc
+import os
+import re
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import ClassVar
+
+from mypy_boto3_builder.logger import get_logger
+
+if sys.platform != "win32":
+    import resource
+
+__all__ = ["MemoryBudget", "format_memory_size", "get_peak_rss", "get_rss", "parse_memory_size"]
+
+_MEMORY_SIZE_RE = re.compile(r"^(?P<value>\d+(\.\d+)?)\s*(?P<unit>[KMGT]?)i?B?$", re.IGNORECASE)
+_MEMORY_UNITS = ("", "K", "M", "G", "T")
+_MEMORY_UNIT_SIZE = 1024
+
+
+def parse_memory_size(value: str) -> int:
+    """
+    Parse memory size like `512M`, `4G` or `4GiB` to bytes.
+
+    Raises:
+        ValueError -- If value is not a memory size.
+    """
+    match = _MEMORY_SIZE_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid memory size {value}, expected a number with K, M, G or T unit")
+    power = _MEMORY_UNITS.index(match.group("unit").upper())
+    return int(float(match.group("value")) * _MEMORY_UNIT_SIZE**power)
+
+
+def format_memory_size(size: int) -> str:
+    """
+    Format memory size as `1.5G`, `512.0M` or `100B`.
+    """
+    value = float(size)
+    power = 0
+    while abs(value) >= _MEMORY_UNIT_SIZE and power < len(_MEMORY_UNITS) - 1:
+        value /= _MEMORY_UNIT_SIZE
+        power += 1
+    if not power:
+        return f"{size}B"
+    return f"{value:.1f}{_MEMORY_UNITS[power]}"
+
+
+def get_peak_rss() -> int:
+    """
+    Get peak resident set size of the process in bytes, 0 if it is not available.
+    """
+    if sys.platform == "win32":
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return max_rss
+    return max_rss * _MEMORY_UNIT_SIZE
+
+
+def get_rss() -> int:
+    """
+    Get current resident set size of the process in bytes.
+
+    Falls back to peak resident set size if current one is not available.
+    """
+    statm_path = Path("/proc/self/statm")
+    if statm_path.exists():
+        pages = int(statm_path.read_text(encoding="utf-8").split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    return get_peak_rss()
+
+
+class MemoryBudget:
+    """
+    Process memory budget.
+
+    When resident set size approaches the budget, registered caches are released
+    and `is_exceeded` tells schedulers to stop starting new work in parallel.
+    """
+
+    THRESHOLD: ClassVar = 0.9
+
+    _limit: ClassVar[int | None] = None
+    _release_callbacks: ClassVar[list[Callable[[], None]]] = []
+    _lock: ClassVar = threading.Lock()
+
+    @classmethod
+    def configure(cls, limit: int | None) -> None:
+        """
+        Set memory budget for the process.
+
+        Arguments:
+            limit -- Memory budget in bytes, `None` to disable.
+        """
+        cls._limit = limit
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """
+        Whether memory budget is set.
+        """
+        return cls._limit is not None
+
+    @classmethod
+    def on_release(cls, callback: Callable[[], None]) -> None:
+        """
+        Register a callback that releases caches when budget is approached.
+        """
+        if callback not in cls._release_callbacks:
+            cls._release_callbacks.append(callback)
+
+    @classmethod
+    def is_exceeded(cls) -> bool:
+        """
+        Whether resident set size is above `THRESHOLD` of the budget.
+        """
+        if cls._limit is None:
+            return False
+        return get_rss() >= cls._limit * cls.THRESHOLD
+
+    @classmethod
+    def check(cls) -> bool:
+        """
+        Release caches if budget is approached.
+
+        Returns:
+            Whether budget is still approached after caches are released.
+        """
+        if not cls.is_exceeded():
+            return False
+
+        with cls._lock:
+            rss = get_rss()
+            for callback in cls._release_callbacks:
+                callback()
+            gc.collect()
+            released_rss = get_rss()
+        get_logger().debug(
+            f"Memory budget {format_memory_size(cls._limit or 0)} is approached,"
+            f" released caches: {format_memory_size(rss)} -> {format_memory_size(released_rss)}"
+        )
+        return cls.is_exceeded()
@@ -1,100 +1,412 @@
 """
-Package builder powered by setuptools.
+Native builder for wheel and sdist packages.
 
 Copyright 2024 Vlad Emelianov
 """
 
-import shutil
-import subprocess
-import sys
+import ast
+import base64
+import csv
+import fnmatch
+import gzip
+import hashlib
+import io
+import itertools
+import os
+import re
 import tarfile
+import time
 import zipfile
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Literal
+from typing import Any, Final
 
+from mypy_boto3_builder.constants import PACKAGE_NAME
 from mypy_boto3_builder.enums.output_type import OutputType
 from mypy_boto3_builder.exceptions import BuildInternalError
 from mypy_boto3_builder.logger import get_logger
 from mypy_boto3_builder.structures.package import Package
+from mypy_boto3_builder.utils.build_report import BuildReport
 from mypy_boto3_builder.utils.path import print_path
+from mypy_boto3_builder.writers.sinks.base import BaseSink
+from mypy_boto3_builder.writers.sinks.directory import DirectorySink
 
-_Target = Literal["sdist", "bdist_wheel"]
+# ZIP archives do not support timestamps before 1980
+MIN_TIMESTAMP: Final = 315532800
+SETUP_FILE_NAME: Final = "setup.py"
+README_FILE_NAME: Final = "README.md"
+LICENSE_FILE_NAME: Final = "LICENSE"
+WHEEL_TAG: Final = "py3-none-any"
+# `License-File` field requires core metadata 2.4
+METADATA_VERSION: Final = "2.4"
+FILE_MODE: Final = 0o644
+
+
+def get_source_date_epoch() -> int:
+    """
+    Get timestamp for archive entries from `SOURCE_DATE_EPOCH` or a fixed value.
+    """
+    value = os.environ.get("SOURCE_DATE_EPOCH", "")
+    if not value.isdigit():
+        return MIN_TIMESTAMP
+    return max(int(value), MIN_TIMESTAMP)
+
+
+@dataclass
+class PackageMetadata:
+    """
+    Core metadata parsed from generated `setup.py`.
+    """
+
+    name: str
+    version: str
+    summary: str = ""
+    home_page: str = ""
+    author: str = ""
+    author_email: str = ""
+    license: str = ""
+    keywords: str = ""
+    classifiers: list[str] = field(default_factory=list[str])
+    project_urls: dict[str, str] = field(default_factory=dict[str, str])
+    requires_python: str = ""
+    install_requires: list[str] = field(default_factory=list[str])
+    extras_require: dict[str, list[str]] = field(default_factory=dict[str, list[str]])
+    packages: list[str] = field(default_factory=list[str])
+    package_data: dict[str, list[str]] = field(default_factory=dict[str, list[str]])
+    license_files: list[str] = field(default_factory=list[str])
+    long_description: str = ""
+    long_description_content_type: str = ""
+
+    @classmethod
+    def from_setup_py(cls, sink: BaseSink, package_path: Path) -> "PackageMetadata":
+        """
+        Get `setup` call arguments from generated `setup.py` without running it.
+
+        Arguments:
+            sink -- Output sink with generated package.
+            package_path -- Path to generated package.
+        """
+        setup_path = package_path / SETUP_FILE_NAME
+        kwargs = cls._parse_setup_kwargs(setup_path, sink.read_text(setup_path))
+        readme_path = package_path / README_FILE_NAME
+        long_description = sink.read_text(readme_path) if sink.exists(readme_path) else ""
+        license_files = [LICENSE_FILE_NAME] if sink.exists(package_path / LICENSE_FILE_NAME) else []
+        try:
+            return cls(
+                name=kwargs["name"],
+                version=kwargs["version"],
+                summary=kwargs.get("description", ""),
+                home_page=kwargs.get("url", ""),
+                author=kwargs.get("author", ""),
+                author_email=kwargs.get("author_email", ""),
+                license=kwargs.get("license", ""),
+                keywords=kwargs.get("keywords", ""),
+                classifiers=list(kwargs.get("classifiers", [])),
+                project_urls=dict(kwargs.get("project_urls", {})),
+                requires_python=kwargs.get("python_requires", ""),
+                install_requires=list(kwargs.get("install_requires", [])),
+                extras_require={k: list(v) for k, v in kwargs.get("extras_require", {}).items()},
+                packages=list(kwargs.get("packages", [])),
+                package_data={k: list(v) for k, v in kwargs.get("package_data", {}).items()},
+                license_files=license_files,
+                long_description=long_description,
+                long_description_content_type=kwargs.get("long_description_content_type", ""),
+            )
+        except KeyError as e:
+            raise BuildInternalError(f"{print_path(setup_path)} has no {e} argument") from None
+
+    @staticmethod
+    def _parse_setup_kwargs(setup_path: Path, content: str) -> dict[str, Any]:
+        tree = ast.parse(content, filename=setup_path.as_posix())
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            if not isinstance(node.func, ast.Name) or node.func.id != "setup":
+                continue
+            result: dict[str, Any] = {}
+            for keyword in node.keywords:
+                if keyword.arg is None or isinstance(keyword.value, ast.Name):
+                    continue
+                try:
+                    result[keyword.arg] = ast.literal_eval(keyword.value)
+                except ValueError:
+                    raise BuildInternalError(
+                        f"{print_path(setup_path)} argument {keyword.arg} is not a literal"
+                    ) from None
+            return result
+
+        raise BuildInternalError(f"{print_path(setup_path)} has no setup call")
+
+    @property
+    def distribution_name(self) -> str:
+        """
+        Normalized name for wheel and sdist file names.
+        """
+        return re.sub(r"[-_.]+", "_", self.name).lower()
+
+    @property
+    def distribution_version(self) -> str:
+        """
+        Version for wheel and sdist file names.
+        """
+        return self.version.replace("-", "_")
+
+    def iterate_requires_dist(self) -> Iterator[str]:
+        """
+        Iterate over `Requires-Dist` values including extras.
+        """
+        yield from self.install_requires
+        for extra_name, requirements in self.extras_require.items():
+            for requirement in requirements:
+                name, _, marker = requirement.partition(";")
+                extra_marker = f'extra == "{extra_name}"'
+                if marker.strip():
+                    extra_marker = f"({marker.strip()}) and {extra_marker}"
+                yield f"{name.strip()}; {extra_marker}"
+
+    def render(self) -> str:
+        """
+        Render `METADATA` and `PKG-INFO` file content.
+        """
+        headers: list[tuple[str, str]] = [
+            ("Metadata-Version", METADATA_VERSION),
+            ("Name", self.name),
+            ("Version", self.version),
+            ("Summary", self.summary),
+            ("Home-page", self.home_page),
+            ("Author", self.author),
+            ("Author-email", self.author_email),
+            ("License", self.license),
+        ]
+        headers.extend(("Project-URL", f"{k}, {v}") for k, v in self.project_urls.items())
+        headers.append(("Keywords", self.keywords))
+        headers.extend(("Classifier", classifier) for classifier in self.classifiers)
+        headers.extend(
+            (
+                ("Requires-Python", self.requires_python),
+                ("Description-Content-Type", self.long_description_content_type),
+            )
+        )
+        headers.extend(("License-File", license_file) for license_file in self.license_files)
+        headers.extend(("Provides-Extra", extra_name) for extra_name in self.extras_require)
+        headers.extend(
+            ("Requires-Dist", requirement) for requirement in self.iterate_requires_dist()
+        )
+        lines = [f"{key}: {value}" for key, value in headers if value]
+        return "\n".join(lines) + "\n\n" + self.long_description
 
 
 class PackageBuilder:
     """
-    Package builder powered by setuptools.
+    Native builder for wheel and sdist packages.
+
+    Archives are created from generated package sources without running `setup.py`.
+    Entries are sorted and have fixed timestamps, so equal sources produce
+    byte-to-byte equal packages.
+
+    Arguments:
+        build_path -- Path with generated packages.
+        output_path -- Path to save built packages.
+        sink -- Output sink with generated packages, a real directory by default.
+        max_workers -- Number of packages to build in parallel.
     """
 
-    def __init__(self, build_path: Path, output_path: Path) -> None:
+    def __init__(
+        self,
+        build_path: Path,
+        output_path: Path,
+        sink: BaseSink | None = None,
+        max_workers: int | None = None,
+    ) -> None:
         self.build_path = build_path
         self.output_path = output_path
+        self.sink = sink or DirectorySink()
+        self.max_workers = max_workers
+        self.timestamp = get_source_date_epoch()
         self._logger = get_logger()
 
+    def _iterate_package_files(
+        self, package_path: Path, metadata: PackageMetadata
+    ) -> Iterator[Path]:
+        for package_name in metadata.packages:
+            package_dir = package_path.joinpath(*package_name.split("."))
+            masks = ("*.py", *metadata.package_data.get(package_name, []))
+            for path in self.sink.iterate_files(package_dir):
+                relative_parts = path.relative_to(package_dir).parts
+                if any(self._match_mask(relative_parts, mask) for mask in masks):
+                    yield path
+
     @staticmethod
-    def _check_wheel(file_path: Path) -> None:
-        try:
-            _l = zipfile.ZipFile(file_path).filelist
-        except zipfile.BadZipFile:
-            raise BuildInternalError(
-                f"Failed to build package: {file_path} is not a valid wheel package"
-            ) from None
+    def _match_mask(relative_parts: Sequence[str], mask: str) -> bool:
+        mask_parts = mask.split("/")
+        if len(mask_parts) != len(relative_parts):
+            return False
+        return all(
+            itertools.starmap(fnmatch.fnmatchcase, zip(relative_parts, mask_parts, strict=True))
+        )
+
+    def _get_package_files(self, package_path: Path, metadata: PackageMetadata) -> dict[str, Path]:
+        result: dict[str, Path] = {}
+        for path in self._iterate_package_files(package_path, metadata):
+            result[path.relative_to(package_path).as_posix()] = path
+        return dict(sorted(result.items()))
 
     @staticmethod
-    def _check_sdist(file_path: Path) -> None:
-        try:
-            with tarfile.open(file_path, "r:gz") as f:
-                _l = f.getnames()
-        except zipfile.BadZipFile:
-            raise BuildInternalError(
-                f"Failed to build package: {file_path} is not a valid sdist package"
-            ) from None
+    def _get_record_hash(data: bytes) -> str:
+        digest = hashlib.sha256(data).digest()
+        return "sha256=" + base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
 
-    @classmethod
-    def _check_package(cls, file_path: Path) -> bool:
-        if file_path.suffix == ".whl":
-            cls._check_wheel(file_path)
-            return True
-        if file_path.suffix == ".gz":
-            cls._check_sdist(file_path)
-            return True
-
-        return False
-
-    def _build(self, package: Package, targets: Sequence[_Target]) -> None:
-        package_path = self.build_path / package.directory_name
-        self._logger.debug(f"Building package {print_path(package_path)}")
-        dist_path = package_path / "dist"
-        if dist_path.exists():
-            shutil.rmtree(dist_path)
-        try:
-            subprocess.check_output(
-                [sys.executable, "setup.py", *targets],
-                cwd=package_path,
-                stderr=subprocess.STDOUT,
+    def _get_zip_info(self, name: str) -> zipfile.ZipInfo:
+        result = zipfile.ZipInfo(name, date_time=time.gmtime(self.timestamp)[:6])
+        result.external_attr = (0o100000 | FILE_MODE) << 16
+        result.compress_type = zipfile.ZIP_DEFLATED
+        return result
+
+    @staticmethod
+    def _render_wheel() -> str:
+        lines = (
+            "Wheel-Version: 1.0",
+            f"Generator: {PACKAGE_NAME}",
+            "Root-Is-Purelib: true",
+            f"Tag: {WHEEL_TAG}",
+        )
+        return "\n".join(lines) + "\n"
+
+    def build_wheel(self, package_path: Path, metadata: PackageMetadata) -> Path:
+        """
+        Build wheel package with `METADATA`, `WHEEL` and `RECORD` files.
+
+        Arguments:
+            package_path -- Path to generated package.
+            metadata -- Package metadata.
+        """
+        base_name = f"{metadata.distribution_name}-{metadata.distribution_version}"
+        dist_info = f"{base_name}.dist-info"
+        top_level = sorted({name.split(".")[0] for name in metadata.packages})
+        entries: dict[str, bytes] = {
+            name: self.sink.read_bytes(path)
+            for name, path in self._get_package_files(package_path, metadata).items()
+        }
+        for license_file in metadata.license_files:
+            entries[f"{dist_info}/licenses/{license_file}"] = self.sink.read_bytes(
+                package_path / license_file
             )
-        except subprocess.CalledProcessError as e:
-            raise BuildInternalError(f"Failed to build package: {e.output.decode()}") from None
+        entries[f"{dist_info}/METADATA"] = metadata.render().encode()
+        entries[f"{dist_info}/WHEEL"] = self._render_wheel().encode()
+        entries[f"{dist_info}/top_level.txt"] = "".join(f"{i}\n" for i in top_level).encode()
 
-        for file_path in dist_path.iterdir():
-            if not file_path.is_file():
-                continue
+        record = io.StringIO()
+        writer = csv.writer(record, lineterminator="\n")
+        for name, data in entries.items():
+            writer.writerow((name, self._get_record_hash(data), len(data)))
+        record_name = f"{dist_info}/RECORD"
+        writer.writerow((record_name, "", ""))
+        entries[record_name] = record.getvalue().encode()
 
-            if not self._check_package(file_path):
-                continue
+        target_path = self.output_path / f"{base_name}-{WHEEL_TAG}.whl"
+        with zipfile.ZipFile(target_path, "w") as archive:
+            for name, data in entries.items():
+                archive.writestr(self._get_zip_info(name), data)
+        return target_path
 
-            target_path = self.output_path / file_path.name
-            file_path.rename(target_path)
-            self._logger.debug(f"Built package {print_path(target_path)}")
+    def _get_tar_info(self, name: str, size: int) -> tarfile.TarInfo:
+        result = tarfile.TarInfo(name)
+        result.size = size
+        result.mtime = self.timestamp
+        result.mode = FILE_MODE
+        result.uid = result.gid = 0
+        result.uname = result.gname = ""
+        return result
+
+    def build_sdist(self, package_path: Path, metadata: PackageMetadata) -> Path:
+        """
+        Build sdist package with `PKG-INFO` and `setup.py`.
+
+        Arguments:
+            package_path -- Path to generated package.
+            metadata -- Package metadata.
+        """
+        base_name = f"{metadata.distribution_name}-{metadata.distribution_version}"
+        entries: dict[str, bytes] = {"PKG-INFO": metadata.render().encode()}
+        for file_name in (LICENSE_FILE_NAME, README_FILE_NAME, SETUP_FILE_NAME):
+            path = package_path / file_name
+            if self.sink.exists(path):
+                entries[file_name] = self.sink.read_bytes(path)
+        for name, path in self._get_package_files(package_path, metadata).items():
+            entries[name] = self.sink.read_bytes(path)
+
+        target_path = self.output_path / f"{base_name}.tar.gz"
+        with (
+            target_path.open("wb") as file_obj,
+            gzip.GzipFile(filename="", mode="wb", fileobj=file_obj, mtime=self.timestamp) as gz,
+            tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as archive,
+        ):
+            for name in sorted(entries):
+                data = entries[name]
+                archive.addfile(
+                    self._get_tar_info(f"{base_name}/{name}", len(data)), io.BytesIO(data)
+                )
+        return target_path
 
     def build(self, package: Package, output_types: Sequence[OutputType]) -> None:
         """
-        Build wheel package.
+        Build wheel and sdist packages.
         """
-        targets: list[_Target] = []
+        self.build_directory(package.directory_name, output_types)
+
+    def build_directory(self, directory_name: str, output_types: Sequence[OutputType]) -> None:
+        """
+        Build wheel and sdist packages from a generated package directory.
+
+        Arguments:
+            directory_name -- Package directory name in build path.
+            output_types -- Output types to build.
+        """
+        package_path = self.build_path / directory_name
+        self._logger.debug(f"Building package {print_path(package_path)}")
+        metadata = PackageMetadata.from_setup_py(self.sink, package_path)
+        self.output_path.mkdir(exist_ok=True, parents=True)
+        target_paths: list[Path] = []
         if OutputType.wheel in output_types:
-            targets.append("bdist_wheel")
+            with BuildReport.stage("package:wheel"):
+                target_paths.append(self.build_wheel(package_path, metadata))
+                BuildReport.add_output(target_paths[-1].stat().st_size)
         if OutputType.sdist in output_types:
-            targets.append("sdist")
-        self._build(package, targets)
+            with BuildReport.stage("package:sdist"):
+                target_paths.append(self.build_sdist(package_path, metadata))
+                BuildReport.add_output(target_paths[-1].stat().st_size)
+        for target_path in target_paths:
+            self._logger.debug(f"Built package {print_path(target_path)}")
+
+    def build_packages(
+        self,
+        packages: Sequence[Package],
+        output_types: Sequence[OutputType],
+    ) -> None:
+        """
+        Build wheel and sdist packages in parallel.
+        """
+        self.build_directories([package.directory_name for package in packages], output_types)
+
+    def build_directories(
+        self,
+        directory_names: Sequence[str],
+        output_types: Sequence[OutputType],
+    ) -> None:
+        """
+        Build wheel and sdist packages from generated package directories in parallel.
+        """
+        if len(directory_names) <= 1:
+            for directory_name in directory_names:
+                self.build_directory(directory_name, output_types)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.build_directory, directory_name, output_types)
+                for directory_name in directory_names
+            ]
+            for future in futures:
+                future.result()
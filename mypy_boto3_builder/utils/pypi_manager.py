@@ -4,10 +4,10 @@ Version manager for PyPI packages.
 Copyright 2024 Vlad Emelianov
 """
 
-import requests
+from http import HTTPStatus
 
-from mypy_boto3_builder.constants import REQUEST_TIMEOUT
 from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.http_client import HTTPClient
 from mypy_boto3_builder.utils.version import bump_postrelease, get_release_version, sort_versions
 
 
@@ -39,7 +39,7 @@ class PyPIManager:
         Arguments:
             version -- Target version
         """
-        return version in self._get_versions()
+        return version in self.get_versions()
 
     def get_next_version(self, version: str) -> str:
         """
@@ -48,7 +48,7 @@ class PyPIManager:
         Arguments:
             version -- Target version
         """
-        versions = self._get_versions()
+        versions = self.get_versions()
         new_version = version
         while new_version in versions:
             new_version = bump_postrelease(new_version)
@@ -58,19 +58,24 @@ class PyPIManager:
         """
         Get latest stable package version from PyPI.
         """
-        versions = self._get_versions()
+        versions = self.get_versions()
         sorted_versions = sort_versions(versions)
         if not versions:
             raise BuildEnvError(f"No versions found for {self.package}")
 
         return get_release_version(sorted_versions[-1])
 
-    def _get_versions(self) -> set[str]:
+    def get_versions(self) -> set[str]:
+        """
+        Get all package versions from PyPI.
+
+        Result is cached, missing package has no versions.
+        """
         if self._versions is not None:
             return self._versions
 
-        response = requests.get(self.json_url, timeout=REQUEST_TIMEOUT)
-        if response.status_code == requests.codes.not_found:
+        response = HTTPClient().get(self.json_url)
+        if response.status_code == HTTPStatus.NOT_FOUND:
             return set()
         if not response.ok:
             raise BuildEnvError(
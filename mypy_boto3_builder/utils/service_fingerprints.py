@@ -0,0 +1,171 @@
+"""
+Botocore service model fingerprints for local updated services detection.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import json
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from mypy_boto3_builder.constants import SERVICE_FINGERPRINTS_NAME
+from mypy_boto3_builder.enums.file_status import FileStatus
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.writers.sinks.directory import DirectorySink
+
+
+class ServiceFingerprints:
+    """
+    Botocore service model fingerprints for local updated services detection.
+
+    Fingerprint is a SHA256 digest of service models that affect generated stubs:
+    service shapes, paginators, waiters and boto3 resources.
+
+    Arguments:
+        fingerprints -- Service name to fingerprint mapping.
+        library_names -- Libraries with data used for fingerprints.
+    """
+
+    MODEL_NAMES = ("service-2", "paginators-1", "waiters-2", "resources-1")
+    LIBRARY_NAMES = ("botocore", "boto3")
+
+    def __init__(
+        self,
+        fingerprints: Mapping[str, str],
+        library_names: Iterable[str] = LIBRARY_NAMES,
+    ) -> None:
+        self.fingerprints = dict(fingerprints)
+        self.library_names = tuple(library_names)
+
+    @staticmethod
+    def get_installed_data_path(library_name: str) -> Path | None:
+        """
+        Get data directory of installed library.
+        """
+        spec = importlib.util.find_spec(library_name)
+        if not spec or not spec.origin:
+            return None
+        data_path = Path(spec.origin).parent / "data"
+        if not data_path.is_dir():
+            return None
+        return data_path
+
+    @classmethod
+    def _get_model_paths(cls, service_path: Path) -> list[Path]:
+        version_paths = sorted(i for i in service_path.iterdir() if i.is_dir())
+        if not version_paths:
+            return []
+        return sorted(
+            path
+            for path in version_paths[-1].iterdir()
+            if path.name.split(".", 1)[0] in cls.MODEL_NAMES
+        )
+
+    @staticmethod
+    def _get_model_digest(path: Path) -> str:
+        data = path.read_bytes()
+        if path.suffix == ".gz":
+            data = gzip.decompress(data)
+        return hashlib.sha256(data).hexdigest()
+
+    @classmethod
+    def from_data_paths(cls, data_paths: Mapping[str, Path]) -> "ServiceFingerprints":
+        """
+        Calculate fingerprints for all services in data directories.
+
+        Arguments:
+            data_paths -- Library name to its data directory mapping.
+        """
+        model_digests: dict[str, list[str]] = {}
+        for library_name, data_path in data_paths.items():
+            for service_path in sorted(data_path.iterdir()):
+                if not service_path.is_dir():
+                    continue
+                for model_path in cls._get_model_paths(service_path):
+                    model_name = model_path.name.removesuffix(".gz")
+                    digest = cls._get_model_digest(model_path)
+                    model_digests.setdefault(service_path.name, []).append(
+                        f"{library_name}/{model_name}:{digest}"
+                    )
+
+        return cls(
+            {
+                name: hashlib.sha256("\n".join(digests).encode()).hexdigest()
+                for name, digests in sorted(model_digests.items())
+            },
+            library_names=data_paths.keys(),
+        )
+
+    @classmethod
+    def from_installed(cls, library_names: Iterable[str] = LIBRARY_NAMES) -> "ServiceFingerprints":
+        """
+        Calculate fingerprints for installed libraries.
+
+        Arguments:
+            library_names -- Libraries to include, `botocore` and `boto3` by default.
+        """
+        data_paths: dict[str, Path] = {}
+        for library_name in library_names:
+            data_path = cls.get_installed_data_path(library_name)
+            if data_path:
+                data_paths[library_name] = data_path
+        return cls.from_data_paths(data_paths)
+
+    @classmethod
+    def load(cls, path: Path) -> "ServiceFingerprints":
+        """
+        Load fingerprints from a manifest file, previous output directory or `botocore` data.
+
+        Arguments:
+            path -- Manifest file, directory with a manifest or `botocore/data` directory.
+        """
+        if path.is_dir() and (path / SERVICE_FINGERPRINTS_NAME).exists():
+            path /= SERVICE_FINGERPRINTS_NAME
+        if path.is_dir():
+            return cls.from_data_paths({"botocore": path})
+        if not path.exists():
+            raise BuildEnvError(f"Service fingerprints not found: {path}")
+
+        data = json.loads(path.read_text())
+        return cls(data["services"], library_names=data["libraries"])
+
+    def save(self, path: Path) -> None:
+        """
+        Save fingerprints to a manifest file, unchanged manifest is not rewritten.
+
+        Arguments:
+            path -- Manifest file or directory to save it to.
+        """
+        if path.is_dir():
+            path /= SERVICE_FINGERPRINTS_NAME
+        data = {
+            "libraries": list(self.library_names),
+            "services": dict(sorted(self.fingerprints.items())),
+        }
+        status = DirectorySink().write_text(path, json.dumps(data, indent=2) + "\n")
+        if status != FileStatus.unchanged:
+            get_logger().debug(f"Saved {len(self.fingerprints)} service fingerprints to {path}")
+
+    def update(self, other: "ServiceFingerprints", service_names: Iterable[str]) -> None:
+        """
+        Update fingerprints for selected services from `other`.
+        """
+        for service_name in service_names:
+            if service_name in other.fingerprints:
+                self.fingerprints[service_name] = other.fingerprints[service_name]
+
+    def get_updated(self, previous: "ServiceFingerprints") -> list[str]:
+        """
+        Get service names with models changed since `previous` fingerprints.
+
+        New services are considered updated.
+        """
+        return [
+            name
+            for name, fingerprint in self.fingerprints.items()
+            if previous.fingerprints.get(name) != fingerprint
+        ]
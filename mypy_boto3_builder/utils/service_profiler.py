@@ -0,0 +1,299 @@
+"""
+Per-service profiler with flamegraph export.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import pstats
+import sys
+import threading
+from collections import Counter
+from collections.abc import Generator, Iterable
+from pathlib import Path
+from types import FrameType
+from typing import Any, ClassVar
+
+from mypy_boto3_builder.constants import PACKAGE_NAME, PROFILE_SAMPLE_INTERVAL, ROOT_PATH
+from mypy_boto3_builder.enums.profile_mode import ProfileMode
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.utils.path import print_path
+from mypy_boto3_builder.utils.version import get_builder_version
+
+__all__ = ["ServiceProfiler", "StackFrame"]
+
+StackFrame = tuple[str, str, int]
+Stack = tuple[StackFrame, ...]
+
+
+class _ThreadState(threading.local):
+    """
+    Service names stack of a thread.
+    """
+
+    def __init__(self) -> None:
+        self.service_names: list[str] = []
+
+
+class ServiceProfiler:
+    """
+    Per-service profiler with flamegraph export.
+
+    Code in `service` context is attributed to a service, so every service unit
+    of work is profiled separately, even if it runs in a worker thread.
+
+    In `sampling` mode a background thread takes stacks of threads that work on
+    services every `interval` seconds. Results are saved as collapsed stacks
+    (`<service>.collapsed`, for `flamegraph.pl` and compatible tools) and
+    speedscope profiles (`<service>.speedscope.json`) per service,
+    and aggregated for all services as `all.*`.
+
+    In `cprofile` mode every call is traced with `cProfile` and saved as
+    `<service>.prof` and `all.prof` `pstats` files. Only one `cProfile` can be
+    active at a time, so services are processed one by one in this mode.
+    """
+
+    AGGREGATED_NAME: ClassVar = "all"
+
+    _path: ClassVar[Path | None] = None
+    _mode: ClassVar[ProfileMode] = ProfileMode.sampling
+    _interval: ClassVar[float] = PROFILE_SAMPLE_INTERVAL
+    _lock: ClassVar = threading.Lock()
+    _cprofile_lock: ClassVar = threading.RLock()
+    _state: ClassVar = _ThreadState()
+    _null_context: ClassVar = contextlib.nullcontext()
+    _threads: ClassVar[dict[int, str]] = {}
+    _samples: ClassVar[dict[str, Counter[Stack]]] = {}
+    _profiles: ClassVar[dict[str, cProfile.Profile]] = {}
+    _sampler: ClassVar[threading.Thread | None] = None
+    _stop_event: ClassVar = threading.Event()
+
+    @classmethod
+    def start(
+        cls,
+        path: Path,
+        mode: ProfileMode = ProfileMode.sampling,
+        interval: float = PROFILE_SAMPLE_INTERVAL,
+    ) -> None:
+        """
+        Start profiling services.
+
+        Arguments:
+            path -- Directory to save profiles to.
+            mode -- Profiler mode.
+            interval -- Interval between stack samples in seconds.
+        """
+        cls._path = path
+        cls._mode = mode
+        cls._interval = interval
+        cls._threads = {}
+        cls._samples = {}
+        cls._profiles = {}
+        if mode == ProfileMode.sampling:
+            cls._stop_event.clear()
+            cls._sampler = threading.Thread(
+                target=cls._sample_loop, name="service-profiler", daemon=True
+            )
+            cls._sampler.start()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """
+        Whether services are profiled.
+        """
+        return cls._path is not None
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Stop profiling and save collected profiles.
+        """
+        path = cls._path
+        if path is None:
+            return
+
+        cls._path = None
+        if cls._sampler:
+            cls._stop_event.set()
+            cls._sampler.join()
+            cls._sampler = None
+
+        path.mkdir(exist_ok=True, parents=True)
+        if cls._mode == ProfileMode.cprofile:
+            cls._save_pstats(path)
+        else:
+            cls._save_samples(path)
+        get_logger().info(f"Saved service profiles to {print_path(path)}")
+
+    @classmethod
+    def service(cls, service_name: str) -> contextlib.AbstractContextManager[None]:
+        """
+        Profile code in context as a part of service work.
+
+        Arguments:
+            service_name -- Service name.
+        """
+        if cls._path is None:
+            return cls._null_context
+        if cls._mode == ProfileMode.cprofile:
+            return cls._profile_service(service_name)
+        return cls._sample_service(service_name)
+
+    @classmethod
+    @contextlib.contextmanager
+    def _sample_service(cls, service_name: str) -> Generator[None, None, None]:
+        thread_id = threading.get_ident()
+        service_names = cls._state.service_names
+        service_names.append(service_name)
+        cls._threads[thread_id] = service_name
+        try:
+            yield
+        finally:
+            service_names.pop()
+            if service_names:
+                cls._threads[thread_id] = service_names[-1]
+            else:
+                cls._threads.pop(thread_id, None)
+
+    @classmethod
+    @contextlib.contextmanager
+    def _profile_service(cls, service_name: str) -> Generator[None, None, None]:
+        service_names = cls._state.service_names
+        with cls._cprofile_lock:
+            if service_names and service_names[-1] == service_name:
+                service_names.append(service_name)
+                try:
+                    yield
+                finally:
+                    service_names.pop()
+                return
+
+            parent_profile = cls._profiles.get(service_names[-1]) if service_names else None
+            if parent_profile:
+                parent_profile.disable()
+            profile = cls._profiles.setdefault(service_name, cProfile.Profile())
+            service_names.append(service_name)
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                service_names.pop()
+                if parent_profile:
+                    parent_profile.enable()
+
+    @classmethod
+    def _sample_loop(cls) -> None:
+        while not cls._stop_event.wait(cls._interval):
+            threads = dict(cls._threads)
+            if not threads:
+                continue
+            # the only stdlib API to get frames of other running threads
+            frames = sys._current_frames()  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+            for thread_id, service_name in threads.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = cls._get_stack(frame)
+                with cls._lock:
+                    cls._samples.setdefault(service_name, Counter())[stack] += 1
+
+    @staticmethod
+    @functools.cache
+    def _get_file_name(file_name: str) -> str:
+        path = Path(file_name)
+        if path.is_relative_to(ROOT_PATH.parent):
+            return path.relative_to(ROOT_PATH.parent).as_posix()
+        if "site-packages" in path.parts:
+            index = path.parts.index("site-packages")
+            return Path(*path.parts[index + 1 :]).as_posix()
+        return path.as_posix()
+
+    @classmethod
+    def _get_stack(cls, frame: FrameType) -> Stack:
+        result: list[StackFrame] = []
+        current: FrameType | None = frame
+        while current is not None:
+            code = current.f_code
+            result.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+            current = current.f_back
+        result.reverse()
+        return tuple(result)
+
+    @classmethod
+    def _get_frame_label(cls, frame: StackFrame) -> str:
+        name, file_name, line = frame
+        return f"{name} ({cls._get_file_name(file_name)}:{line})"
+
+    @classmethod
+    def _render_collapsed(cls, samples: Counter[Stack]) -> str:
+        lines = [
+            f"{';'.join(cls._get_frame_label(frame) for frame in stack)} {count}"
+            for stack, count in samples.most_common()
+        ]
+        return "".join(f"{line}\n" for line in lines)
+
+    @classmethod
+    def _get_speedscope_data(cls, profiles: Iterable[tuple[str, Counter[Stack]]]) -> dict[str, Any]:
+        frame_indexes: dict[StackFrame, int] = {}
+        profiles_data: list[dict[str, Any]] = []
+        for name, samples in profiles:
+            stacks: list[list[int]] = []
+            weights: list[float] = []
+            for stack, count in samples.most_common():
+                stacks.append(
+                    [frame_indexes.setdefault(frame, len(frame_indexes)) for frame in stack]
+                )
+                weights.append(round(count * cls._interval, 6))
+            profiles_data.append(
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 6),
+                    "samples": stacks,
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": f"{PACKAGE_NAME} {get_builder_version()}",
+            "shared": {
+                "frames": [
+                    {"name": name, "file": cls._get_file_name(file_name), "line": line}
+                    for name, file_name, line in frame_indexes
+                ]
+            },
+            "profiles": profiles_data,
+        }
+
+    @classmethod
+    def _save_sample_files(cls, path: Path, name: str, samples: Counter[Stack]) -> None:
+        (path / f"{name}.collapsed").write_text(cls._render_collapsed(samples), encoding="utf-8")
+        (path / f"{name}.speedscope.json").write_text(
+            json.dumps(cls._get_speedscope_data([(name, samples)])) + "\n",
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def _save_samples(cls, path: Path) -> None:
+        total: Counter[Stack] = Counter()
+        with cls._lock:
+            samples = dict(sorted(cls._samples.items()))
+        for service_name, service_samples in samples.items():
+            cls._save_sample_files(path, service_name, service_samples)
+            total.update(service_samples)
+        cls._save_sample_files(path, cls.AGGREGATED_NAME, total)
+
+    @classmethod
+    def _save_pstats(cls, path: Path) -> None:
+        profiles = dict(sorted(cls._profiles.items()))
+        for service_name, profile in profiles.items():
+            profile.dump_stats(path / f"{service_name}.prof")
+        if profiles:
+            stats = pstats.Stats(*profiles.values())
+            stats.dump_stats(path / f"{cls.AGGREGATED_NAME}.prof")
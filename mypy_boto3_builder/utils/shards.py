@@ -0,0 +1,257 @@
+"""
+Static sharding of service builds and shard manifests for merge.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import heapq
+import json
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from mypy_boto3_builder.constants import SHARD_MANIFEST_NAME
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.service_name import ServiceName
+from mypy_boto3_builder.utils.cost_model import get_service_cost
+from mypy_boto3_builder.utils.install_requires import InstallRequiresItem
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Shard of a build.
+
+    Arguments:
+        index -- Shard number, starts from 1.
+        count -- Total number of shards.
+    """
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        """
+        Validate shard number.
+        """
+        if self.count < 1 or not 1 <= self.index <= self.count:
+            raise ValueError(f"Invalid shard {self}, expected K/N with 1 <= K <= N")
+
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        """
+        Parse shard from `K/N` string.
+        """
+        index, _, count = value.partition("/")
+        if not index.isdigit() or not count.isdigit():
+            raise ValueError(f"Invalid shard {value}, expected K/N")
+        return cls(int(index), int(count))
+
+    def __str__(self) -> str:
+        """
+        Render shard as `K/N` string.
+        """
+        return f"{self.index}/{self.count}"
+
+
+def split_service_names(
+    service_names: Sequence[ServiceName],
+    count: int,
+    get_cost: Callable[[ServiceName], int] = get_service_cost,
+) -> list[list[ServiceName]]:
+    """
+    Split service names into `count` shards with balanced total cost.
+
+    The most expensive services are assigned first, each to the cheapest shard so far.
+    Result depends only on service names and costs, so every CI node gets the same split.
+    Services in each shard keep their original order.
+
+    Arguments:
+        service_names -- Service names to split.
+        count -- Number of shards.
+        get_cost -- Service cost getter.
+    """
+    order = {service_name.name: index for index, service_name in enumerate(service_names)}
+    costs = {service_name.name: get_cost(service_name) for service_name in service_names}
+    loads = [(0, index) for index in range(count)]
+    result: list[list[ServiceName]] = [[] for _ in range(count)]
+    for service_name in sorted(service_names, key=lambda x: (-costs[x.name], x.name)):
+        load, index = heapq.heappop(loads)
+        result[index].append(service_name)
+        heapq.heappush(loads, (load + costs[service_name.name], index))
+    for shard_service_names in result:
+        shard_service_names.sort(key=lambda x: order[x.name])
+    return result
+
+
+def get_shard_service_names(
+    service_names: Sequence[ServiceName],
+    shard: Shard,
+    get_cost: Callable[[ServiceName], int] = get_service_cost,
+) -> list[ServiceName]:
+    """
+    Get service names assigned to a shard.
+    """
+    return split_service_names(service_names, shard.count, get_cost)[shard.index - 1]
+
+
+@dataclass
+class ShardFullPackage:
+    """
+    Service directories generated by a shard for a full or custom package.
+
+    Arguments:
+        service_directories -- Service directory names inside the package directory.
+        install_requires -- Requirements added by these services as `InstallRequiresItem` fields.
+    """
+
+    service_directories: list[str] = field(default_factory=list[str])
+    install_requires: list[dict[str, str | None]] = field(
+        default_factory=list[dict[str, str | None]]
+    )
+
+    def add_install_requires(self, items: Iterable[InstallRequiresItem]) -> None:
+        """
+        Add requirements added by a service.
+        """
+        self.install_requires.extend(
+            {
+                "name": item.name,
+                "drop_python_version": item.drop_python_version,
+                "min_version": item.min_version,
+            }
+            for item in items
+        )
+
+    def get_install_requires(self) -> list[InstallRequiresItem]:
+        """
+        Get requirements added by these services.
+        """
+        return [
+            InstallRequiresItem(
+                name=str(item["name"]),
+                drop_python_version=item.get("drop_python_version"),
+                min_version=item.get("min_version"),
+            )
+            for item in self.install_requires
+        ]
+
+
+@dataclass
+class ShardProduct:
+    """
+    Product output of a shard.
+
+    Arguments:
+        package_directories -- Generated service package directory names.
+        full_packages -- Full package directory name to its shard services mapping.
+    """
+
+    package_directories: list[str] = field(default_factory=list[str])
+    full_packages: dict[str, ShardFullPackage] = field(default_factory=dict[str, ShardFullPackage])
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ShardProduct":
+        """
+        Create product output from its JSON data.
+        """
+        return cls(
+            package_directories=list(data["package_directories"]),
+            full_packages={
+                name: ShardFullPackage(**full_package_data)
+                for name, full_package_data in data["full_packages"].items()
+            },
+        )
+
+
+@dataclass
+class ShardManifest:
+    """
+    Partial manifest saved by a shard to its output directory.
+
+    Arguments:
+        shard -- Shard of the build.
+        service_names -- Service names built by shard.
+        products -- Product name to its shard output mapping.
+        output_path -- Shard output directory.
+        selected_service_names -- Service names selected for the whole build in their order.
+    """
+
+    shard: Shard
+    service_names: list[str] = field(default_factory=list[str])
+    products: dict[str, ShardProduct] = field(default_factory=dict[str, ShardProduct])
+    output_path: Path = Path()
+    selected_service_names: list[str] = field(default_factory=list[str])
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get manifest JSON data.
+        """
+        return {
+            "shard": str(self.shard),
+            "service_names": self.service_names,
+            "selected_service_names": self.selected_service_names,
+            "products": {name: asdict(product) for name, product in self.products.items()},
+        }
+
+    def save(self, path: Path) -> None:
+        """
+        Save manifest to a shard output directory.
+        """
+        manifest_path = path / SHARD_MANIFEST_NAME
+        manifest_path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        get_logger().debug(f"Saved shard {self.shard} manifest to {manifest_path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "ShardManifest":
+        """
+        Load manifest from a shard output directory.
+        """
+        manifest_path = path / SHARD_MANIFEST_NAME
+        if not manifest_path.exists():
+            raise BuildEnvError(f"Shard manifest not found: {manifest_path}")
+
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        return cls(
+            shard=Shard.parse(data["shard"]),
+            service_names=list(data["service_names"]),
+            selected_service_names=list(data.get("selected_service_names", [])),
+            products={
+                name: ShardProduct.from_dict(product_data)
+                for name, product_data in data["products"].items()
+            },
+            output_path=path,
+        )
+
+    @classmethod
+    def load_all(cls, paths: Iterable[Path]) -> list["ShardManifest"]:
+        """
+        Load manifests of all shards of a build sorted by shard number.
+
+        Raises:
+            BuildEnvError -- If shards are missing, duplicated or from different builds.
+        """
+        manifests = sorted((cls.load(path) for path in paths), key=lambda x: x.shard.index)
+        if not manifests:
+            raise BuildEnvError("No shard outputs to merge")
+
+        count = manifests[0].shard.count
+        indexes = [manifest.shard.index for manifest in manifests]
+        if any(manifest.shard.count != count for manifest in manifests):
+            raise BuildEnvError("Shard outputs are from builds with different shard counts")
+        if indexes != list(range(1, count + 1)):
+            raise BuildEnvError(f"Expected outputs of shards 1-{count}, got {indexes}")
+        return manifests
+
+    def get_product(self, product_name: str) -> ShardProduct:
+        """
+        Get shard output for a product.
+
+        Raises:
+            BuildEnvError -- If product was not built by shard.
+        """
+        if product_name not in self.products:
+            raise BuildEnvError(f"Shard {self.shard} has no {product_name} output")
+        return self.products[product_name]
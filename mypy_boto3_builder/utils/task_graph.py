@@ -0,0 +1,385 @@
+"""
+Task graph executor with worker pools per resource class.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Any
+
+from mypy_boto3_builder.enums.resource_class import ResourceClass
+from mypy_boto3_builder.enums.task_status import TaskStatus
+from mypy_boto3_builder.exceptions import BuildInternalError
+from mypy_boto3_builder.logger import get_logger
+
+TaskRunResult = tuple[Any, float, float, str]
+
+
+def _run_task(func: Callable[..., Any], args: tuple[object, ...]) -> TaskRunResult:
+    """
+    Run task function in a worker and measure its time.
+    """
+    started = time.time()
+    result = func(*args)
+    worker = f"{os.getpid()}/{threading.current_thread().name}"
+    return result, started, time.time(), worker
+
+
+class Task:
+    """
+    Task graph node.
+
+    Task function is called with `args` followed by results of `dependencies`.
+
+    Arguments:
+        index -- Task order in graph, lower index runs first when possible.
+        name -- Unique task name.
+        func -- Task function.
+        args -- Task function arguments.
+        dependencies -- Tasks that should be finished first.
+        resource_class -- Worker pool to run task on.
+        keep_result -- Keep result after all dependents are finished.
+    """
+
+    def __init__(
+        self,
+        *,
+        index: int,
+        name: str,
+        func: Callable[..., Any],
+        args: tuple[object, ...],
+        dependencies: tuple["Task", ...],
+        resource_class: ResourceClass,
+        keep_result: bool,
+    ) -> None:
+        self.index = index
+        self.name = name
+        self.func = func
+        self.args = args
+        self.dependencies = dependencies
+        self.resource_class = resource_class
+        self.keep_result = keep_result
+        self.status = TaskStatus.pending
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.started = 0.0
+        self.finished = 0.0
+        self.worker = ""
+
+    @property
+    def duration(self) -> float:
+        """
+        Task run time in seconds.
+        """
+        if not self.finished:
+            return 0.0
+        return self.finished - self.started
+
+    def get_call_args(self) -> tuple[object, ...]:
+        """
+        Get task function arguments including dependency results.
+        """
+        return (*self.args, *(dependency.result for dependency in self.dependencies))
+
+    def __lt__(self, other: "Task") -> bool:
+        """
+        Order tasks by index.
+        """
+        return self.index < other.index
+
+    def __repr__(self) -> str:
+        """
+        Represent task as a string for debugging.
+        """
+        return f"<Task {self.name} {self.resource_class.value} {self.status.value}>"
+
+
+class TaskGraph:
+    """
+    Task graph executor with worker pools per resource class.
+
+    Tasks run as soon as their dependencies are finished and their worker pool has
+    a free worker. Among ready tasks, the ones added to graph first run first,
+    so a per-item chain of tasks finishes before the next item is started.
+
+    Arguments:
+        name -- Graph name for logs and dumps.
+        max_workers -- Number of workers per resource class.
+        use_processes -- Run CPU tasks in a process pool, functions and arguments
+            should be picklable.
+        throttle -- Check called before a task without dependencies is started,
+            if it returns True, the task waits until other running tasks are finished.
+        keep_going -- Do not stop on failed tasks, cancel only tasks that depend on them.
+    """
+
+    DEFAULT_MAX_WORKERS: Mapping[ResourceClass, int] = {
+        ResourceClass.cpu: os.cpu_count() or 1,
+        ResourceClass.subprocess: os.cpu_count() or 1,
+        ResourceClass.io: 4,
+    }
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: Mapping[ResourceClass, int] | None = None,
+        *,
+        use_processes: bool = False,
+        throttle: Callable[[], bool] | None = None,
+        keep_going: bool = False,
+    ) -> None:
+        self.name = name
+        self.max_workers = {**self.DEFAULT_MAX_WORKERS, **(max_workers or {})}
+        self.use_processes = use_processes
+        self.throttle = throttle
+        self.keep_going = keep_going
+        self.tasks: list[Task] = []
+        self.started = 0.0
+        self.finished = 0.0
+        self._task_names: set[str] = set()
+        self._logger = get_logger()
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args: object,
+        dependencies: Iterable[Task] = (),
+        resource_class: ResourceClass = ResourceClass.cpu,
+        keep_result: bool = False,
+    ) -> Task:
+        """
+        Add a task to graph.
+
+        Arguments:
+            name -- Unique task name.
+            func -- Task function.
+            args -- Task function arguments, dependency results are added after them.
+            dependencies -- Tasks that should be finished first.
+            resource_class -- Worker pool to run task on.
+            keep_result -- Keep result after all dependents are finished.
+
+        Returns:
+            Added task.
+        """
+        if name in self._task_names:
+            raise BuildInternalError(f"Task {name} is already added to {self.name}")
+        task_dependencies = tuple(dependencies)
+        for dependency in task_dependencies:
+            if dependency.name not in self._task_names:
+                raise BuildInternalError(f"Task {name} depends on unknown task {dependency.name}")
+
+        task = Task(
+            index=len(self.tasks),
+            name=name,
+            func=func,
+            args=args,
+            dependencies=task_dependencies,
+            resource_class=resource_class,
+            keep_result=keep_result,
+        )
+        self.tasks.append(task)
+        self._task_names.add(name)
+        return task
+
+    def _create_executor(self, resource_class: ResourceClass) -> Executor:
+        max_workers = self.max_workers[resource_class]
+        if resource_class == ResourceClass.cpu and self.use_processes:
+            return ProcessPoolExecutor(max_workers=max_workers)
+        return ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"{self.name}-{resource_class.value}",
+        )
+
+    def _prepare_run(self) -> None:
+        self._dependents: dict[str, list[Task]] = {task.name: [] for task in self.tasks}
+        self._remaining_dependencies: dict[str, int] = {}
+        for task in self.tasks:
+            self._remaining_dependencies[task.name] = len(task.dependencies)
+            for dependency in task.dependencies:
+                self._dependents[dependency.name].append(task)
+        self._remaining_dependents = {
+            name: len(dependents) for name, dependents in self._dependents.items()
+        }
+        self._ready: dict[ResourceClass, list[Task]] = {i: [] for i in ResourceClass}
+        for task in self.tasks:
+            if not task.dependencies:
+                heapq.heappush(self._ready[task.resource_class], task)
+        self._executors: dict[ResourceClass, Executor] = {}
+        self._running: dict[Future[TaskRunResult], Task] = {}
+        self._running_counts = dict.fromkeys(ResourceClass, 0)
+
+    def _is_throttled(self, task: Task) -> bool:
+        if not self.throttle or not self._running or task.dependencies:
+            return False
+        return self.throttle()
+
+    def _submit_ready_tasks(self) -> None:
+        for resource_class, ready_tasks in self._ready.items():
+            while (
+                ready_tasks
+                and self._running_counts[resource_class] < self.max_workers[resource_class]
+            ):
+                if self._is_throttled(ready_tasks[0]):
+                    break
+                task = heapq.heappop(ready_tasks)
+                if resource_class not in self._executors:
+                    self._executors[resource_class] = self._create_executor(resource_class)
+                future = self._executors[resource_class].submit(
+                    _run_task, task.func, task.get_call_args()
+                )
+                task.status = TaskStatus.running
+                self._running[future] = task
+                self._running_counts[resource_class] += 1
+
+    def _complete_task(self, future: Future[TaskRunResult]) -> None:
+        task = self._running.pop(future)
+        self._running_counts[task.resource_class] -= 1
+        self._finish_task(task, future)
+        self._release_dependencies(task)
+        if task.status == TaskStatus.failed:
+            self._cancel_dependents(task)
+            return
+        for dependent in self._dependents[task.name]:
+            self._remaining_dependencies[dependent.name] -= 1
+            if not self._remaining_dependencies[dependent.name]:
+                heapq.heappush(self._ready[dependent.resource_class], dependent)
+
+    def _release_dependencies(self, task: Task) -> None:
+        for dependency in task.dependencies:
+            self._remaining_dependents[dependency.name] -= 1
+            if not self._remaining_dependents[dependency.name] and not dependency.keep_result:
+                dependency.result = None
+
+    def _cancel_dependents(self, task: Task) -> None:
+        for dependent in self._dependents[task.name]:
+            if dependent.status == TaskStatus.cancelled:
+                continue
+            dependent.status = TaskStatus.cancelled
+            self._release_dependencies(dependent)
+            self._cancel_dependents(dependent)
+
+    def _stop_run(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+        for task in self.tasks:
+            if task.status in {TaskStatus.pending, TaskStatus.running}:
+                task.status = TaskStatus.cancelled
+        self._executors.clear()
+        self._running.clear()
+
+    def run(self) -> None:
+        """
+        Run all tasks and wait for them to finish.
+
+        The first failed task stops scheduling, its error is raised after running tasks finish.
+        With `keep_going`, tasks that depend on a failed task are cancelled, other tasks
+        still run, and errors are kept in `Task.error`.
+        Interrupts are always raised.
+        """
+        self._prepare_run()
+        self.started = time.time()
+        try:
+            while self._running or any(self._ready.values()):
+                self._submit_ready_tasks()
+                done_futures, _ = wait(self._running, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    self._complete_task(future)
+        finally:
+            self._stop_run()
+            self.finished = time.time()
+
+        self._logger.debug(f"Task graph {self.name}: {self.get_summary()}")
+
+    def _finish_task(self, task: Task, future: Future[TaskRunResult]) -> None:
+        try:
+            result, started, finished, worker = future.result()
+        except BaseException as e:
+            task.status = TaskStatus.failed
+            task.finished = time.time()
+            task.error = e
+            if not self.keep_going or not isinstance(e, Exception):
+                raise
+            self._logger.debug(f"Task {task.name} failed: {e}")
+            return
+        task.result = result
+        task.started = started
+        task.finished = finished
+        task.worker = worker
+        task.status = TaskStatus.done
+
+    def get_summary(self) -> str:
+        """
+        Get run time and busy time per resource class as a string.
+        """
+        busy_times = dict.fromkeys(ResourceClass, 0.0)
+        for task in self.tasks:
+            busy_times[task.resource_class] += task.duration
+        busy_str = ", ".join(
+            f"{resource_class.value} {busy_time:.2f}s"
+            for resource_class, busy_time in busy_times.items()
+        )
+        return f"{len(self.tasks)} tasks in {self.finished - self.started:.2f}s ({busy_str})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get executed graph with task timings relative to graph start.
+        """
+        return {
+            "name": self.name,
+            "duration": round(self.finished - self.started, 6),
+            "max_workers": {key.value: value for key, value in self.max_workers.items()},
+            "tasks": [
+                {
+                    "name": task.name,
+                    "resource_class": task.resource_class.value,
+                    "status": task.status.value,
+                    "dependencies": [dependency.name for dependency in task.dependencies],
+                    "worker": task.worker,
+                    "error": str(task.error) if task.error else None,
+                    "start": round(task.started - self.started, 6) if task.started else None,
+                    "duration": round(task.duration, 6),
+                }
+                for task in self.tasks
+            ],
+        }
+
+    def to_dot(self) -> str:
+        """
+        Get executed graph in Graphviz DOT format.
+        """
+        lines = [f"digraph {json.dumps(self.name)} {{"]
+        for task in self.tasks:
+            label = f"{task.name}\\n{task.resource_class.value} {task.duration:.3f}s"
+            lines.append(f'  {json.dumps(task.name)} [label="{label}"];')
+        lines.extend(
+            f"  {json.dumps(dependency.name)} -> {json.dumps(task.name)};"
+            for task in self.tasks
+            for dependency in task.dependencies
+        )
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: Path) -> None:
+        """
+        Save executed graph with timings as JSON or as Graphviz DOT for `.dot` paths.
+        """
+        content = (
+            self.to_dot() if path.suffix == ".dot" else json.dumps(self.to_dict(), indent=2) + "\n"
+        )
+        path.parent.mkdir(exist_ok=True, parents=True)
+        path.write_text(content, encoding="utf-8")
+        self._logger.debug(f"Task graph {self.name} saved to {path}")
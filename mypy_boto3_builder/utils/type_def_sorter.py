@@ -7,7 +7,7 @@ Copyright 2024 Vlad Emelianov
 from collections.abc import Iterable
 from graphlib import CycleError, TopologicalSorter
 
-from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.logger import get_logger, is_debug_enabled
 from mypy_boto3_builder.type_annotations.type_def_sortable import TypeDefSortable
 
 
@@ -50,10 +50,11 @@ class TypeDefSorter:
                 result = self._sort_topological()
             except CycleError as e:
                 for type_def in self._get(*e.args[-1]):
-                    self.logger.debug(
-                        f"Stringifying {type_def.name}: unsortable children"
-                        f" {self.typed_def_map[type_def.name]}",
-                    )
+                    if is_debug_enabled():
+                        self.logger.debug(
+                            f"Stringifying {type_def.name}: unsortable children"
+                            f" {self.typed_def_map[type_def.name]}",
+                        )
                     type_def.stringify()
             else:
                 if attempt:
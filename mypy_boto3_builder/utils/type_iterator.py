@@ -0,0 +1,58 @@
+"""
+Non-recursive deduplicating iterator over type annotation trees.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
+
+_T = TypeVar("_T", bound=FakeAnnotation)
+
+
+class TypeIterator:
+    """
+    Non-recursive deduplicating iterator over type annotation trees.
+
+    Yields the same type annotations as `FakeAnnotation.iterate_types` in the same order,
+    but every type annotation object is yielded and descended into only once.
+    Uses an explicit stack, so deep and cyclic trees are safe.
+
+    Arguments:
+        type_annotations -- Root type annotations.
+        deep -- Descend into named TypeDefs children as well.
+    """
+
+    def __init__(self, type_annotations: Iterable[FakeAnnotation], *, deep: bool = False) -> None:
+        self.type_annotations = type_annotations
+        self.deep = deep
+
+    def __iter__(self) -> Iterator[FakeAnnotation]:
+        """
+        Iterate over unique type annotations in pre-order.
+        """
+        deep = self.deep
+        visited: set[int] = set()
+        stack: list[FakeAnnotation] = list(reversed(tuple(self.type_annotations)))
+        while stack:
+            type_annotation = stack.pop()
+            key = id(type_annotation)
+            if key in visited:
+                continue
+            visited.add(key)
+            if type_annotation.is_used_type():
+                yield type_annotation
+            stack.extend(reversed(tuple(type_annotation.iterate_child_types(deep=deep))))
+
+    def filter(self, kind: type[_T]) -> Iterator[_T]:
+        """
+        Iterate over unique type annotations of a given class.
+
+        Arguments:
+            kind -- Type annotation class, e.g. `TypeTypedDict`, `TypeLiteral` or `ExternalImport`.
+        """
+        for type_annotation in self:
+            if isinstance(type_annotation, kind):
+                yield type_annotation
@@ -0,0 +1,92 @@
+"""
+Copy-on-write replacer for shared type annotation trees.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from collections.abc import Callable, Iterable
+
+from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
+from mypy_boto3_builder.type_annotations.type_parent import TypeParent
+
+
+class TypeReplacer:
+    """
+    Copy-on-write replacer for shared type annotation trees.
+
+    Type annotations are never changed in place. Every parent that has a replaced
+    type annotation somewhere below is copied, so other owners of the same tree
+    keep the original version.
+
+    Arguments:
+        get_replacement -- Function that returns a replacement or `None` to keep type annotation.
+    """
+
+    def __init__(self, get_replacement: Callable[[FakeAnnotation], FakeAnnotation | None]) -> None:
+        self._get_replacement = get_replacement
+        self._nodes: dict[int, FakeAnnotation] = {}
+        self._parents: dict[int, list[TypeParent]] = {}
+        self._replacements: dict[int, FakeAnnotation] = {}
+
+    def scan(self, type_annotations: Iterable[FakeAnnotation]) -> None:
+        """
+        Find replacements in type annotations trees and copy their parents.
+
+        Arguments:
+            type_annotations -- Root type annotations.
+        """
+        replaced_keys = self._find_replacements(type_annotations)
+        dirty_parents = self._find_dirty_parents(replaced_keys)
+        for key, parent in dirty_parents.items():
+            self._replacements[key] = parent.copy()
+        for key in dirty_parents:
+            replacement = self._replacements[key]
+            if isinstance(replacement, TypeParent):
+                replacement.replace_direct_type_annotations(self.get)
+
+    def _find_replacements(self, type_annotations: Iterable[FakeAnnotation]) -> list[int]:
+        result: list[int] = []
+        stack: list[FakeAnnotation] = []
+        for type_annotation in type_annotations:
+            if id(type_annotation) in self._nodes:
+                continue
+            self._nodes[id(type_annotation)] = type_annotation
+            stack.append(type_annotation)
+
+        while stack:
+            type_annotation = stack.pop()
+            replacement = self._get_replacement(type_annotation)
+            if replacement is not None:
+                self._replacements[id(type_annotation)] = replacement
+                result.append(id(type_annotation))
+                continue
+            if not isinstance(type_annotation, TypeParent):
+                continue
+            for child in type_annotation.iterate_direct_type_annotations():
+                self._parents.setdefault(id(child), []).append(type_annotation)
+                if id(child) in self._nodes:
+                    continue
+                self._nodes[id(child)] = child
+                stack.append(child)
+
+        return result
+
+    def _find_dirty_parents(self, keys: Iterable[int]) -> dict[int, TypeParent]:
+        result: dict[int, TypeParent] = {}
+        stack = list(keys)
+        while stack:
+            key = stack.pop()
+            for parent in self._parents.get(key, ()):
+                parent_key = id(parent)
+                if parent_key in result or parent_key in self._replacements:
+                    continue
+                result[parent_key] = parent
+                stack.append(parent_key)
+
+        return result
+
+    def get(self, type_annotation: FakeAnnotation) -> FakeAnnotation:
+        """
+        Get replacement for a scanned type annotation or type annotation itself.
+        """
+        return self._replacements.get(id(type_annotation), type_annotation)
@@ -0,0 +1,125 @@
+"""
+Concurrent build version resolution for PyPI packages.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.utils.pypi_manager import PyPIManager
+
+
+@dataclass
+class VersionPlan:
+    """
+    Build versions for PyPI packages.
+
+    Arguments:
+        versions -- PyPI package name to build version mapping.
+        published -- PyPI package names skipped as already published.
+    """
+
+    versions: dict[str, str] = field(default_factory=dict[str, str])
+    published: list[str] = field(default_factory=list[str])
+
+    def get_version(self, pypi_name: str) -> str | None:
+        """
+        Get build version for a package or `None` if package should be skipped.
+        """
+        return self.versions.get(pypi_name)
+
+
+class VersionPlanner:
+    """
+    Resolve build versions for PyPI packages concurrently.
+
+    Arguments:
+        version -- Target build version.
+        skip_published -- Skip packages that already have target version on PyPI.
+        max_workers -- Number of concurrent PyPI requests.
+        retries -- Number of attempts for each PyPI request.
+        retry_delay -- Delay before the second attempt in seconds, doubles after each attempt.
+    """
+
+    MAX_WORKERS = 16
+    RETRIES = 3
+    RETRY_DELAY = 1.0
+
+    def __init__(
+        self,
+        version: str,
+        *,
+        skip_published: bool,
+        max_workers: int = MAX_WORKERS,
+        retries: int = RETRIES,
+        retry_delay: float = RETRY_DELAY,
+    ) -> None:
+        self.version = version
+        self.skip_published = skip_published
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._logger = get_logger()
+
+    def _get_versions(self, pypi_manager: PyPIManager) -> set[str]:
+        delay = self.retry_delay
+        for attempt in range(1, self.retries + 1):
+            try:
+                return pypi_manager.get_versions()
+            except BuildEnvError as e:
+                if attempt >= self.retries:
+                    raise
+                self._logger.debug(
+                    f"Attempt {attempt} to get {pypi_manager.package} versions failed: {e}",
+                    tags=pypi_manager.package,
+                )
+                time.sleep(delay)
+                delay *= 2
+
+        raise BuildEnvError(f"Cannot get {pypi_manager.package} versions")
+
+    def _resolve_version(self, pypi_name: str) -> str | None:
+        pypi_manager = PyPIManager(pypi_name)
+        versions = self._get_versions(pypi_manager)
+        if self.version not in versions:
+            return self.version
+        if self.skip_published:
+            return None
+        return pypi_manager.get_next_version(self.version)
+
+    def resolve(self, pypi_names: Iterable[str]) -> VersionPlan:
+        """
+        Resolve build versions for all packages.
+
+        Arguments:
+            pypi_names -- PyPI package names.
+
+        Returns:
+            Version plan with build versions and skipped packages.
+        """
+        unique_pypi_names = list(dict.fromkeys(pypi_names))
+        result = VersionPlan()
+        if not unique_pypi_names:
+            return result
+
+        start = time.perf_counter()
+        max_workers = min(self.max_workers, len(unique_pypi_names))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            versions = list(executor.map(self._resolve_version, unique_pypi_names))
+
+        for pypi_name, version in zip(unique_pypi_names, versions, strict=True):
+            if version is None:
+                result.published.append(pypi_name)
+                continue
+            result.versions[pypi_name] = version
+
+        self._logger.debug(
+            f"Resolved versions for {len(unique_pypi_names)} packages"
+            f" in {time.perf_counter() - start:.2f}s",
+        )
+        return result
@@ -0,0 +1,328 @@
+"""
+Work-stealing job queue in a shared directory.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.logger import get_logger
+
+
+@dataclass
+class WorkJob:
+    """
+    Service package job.
+
+    Arguments:
+        job_id -- Unique job ID, jobs are claimed in ID order.
+        product -- Product name.
+        service_name -- Service name.
+        version -- Package build version.
+        output_path -- Shared output directory.
+        attempt -- Number of previous claims that expired.
+    """
+
+    job_id: str
+    product: str
+    service_name: str
+    version: str
+    output_path: str
+    attempt: int = 0
+
+
+@dataclass
+class WorkResult:
+    """
+    Finished job result.
+
+    Arguments:
+        job_id -- Job ID.
+        worker -- Name of the worker that processed the job.
+        duration -- Processing time in seconds.
+        directory_name -- Written package directory name.
+        error -- Error message for failed jobs.
+    """
+
+    job_id: str
+    worker: str
+    duration: float
+    directory_name: str = ""
+    error: str = ""
+
+
+class WorkQueue:
+    """
+    Work-stealing job queue in a shared directory.
+
+    Every job is a JSON file in `pending` directory. Workers on any host with access
+    to the directory claim jobs by an atomic rename to `running` directory,
+    so an idle worker always takes the next job and each job is processed once.
+    Results are saved to `done` or `failed` directory.
+
+    A worker holds a lease on a claimed job and renews it by touching the job file
+    while the job is processed. If a worker dies, its lease expires and the job
+    is returned to `pending` directory, or failed after `MAX_ATTEMPTS` claims.
+
+    Arguments:
+        path -- Queue directory.
+        worker -- Name of this worker, host name and PID by default.
+        poll_interval -- Delay between checks for new jobs and results in seconds.
+        lease_time -- Time in seconds after which a claimed job without renewals is released.
+    """
+
+    POLL_INTERVAL = 0.5
+    LEASE_TIME = 120.0
+    RENEWALS_PER_LEASE = 4
+    MAX_ATTEMPTS = 2
+    CLOSED_NAME = "closed"
+
+    def __init__(
+        self,
+        path: Path,
+        worker: str = "",
+        poll_interval: float = POLL_INTERVAL,
+        lease_time: float = LEASE_TIME,
+    ) -> None:
+        self.path = path
+        self.worker = worker or f"{socket.gethostname()}/{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.lease_time = lease_time
+        self.pending_path = path / "pending"
+        self.running_path = path / "running"
+        self.done_path = path / "done"
+        self.failed_path = path / "failed"
+        self._logger = get_logger()
+
+    def _create_dirs(self) -> None:
+        for dir_path in (self.pending_path, self.running_path, self.done_path, self.failed_path):
+            dir_path.mkdir(exist_ok=True, parents=True)
+
+    @staticmethod
+    def _get_file_name(job_id: str) -> str:
+        return f"{job_id}.json"
+
+    @staticmethod
+    def _write_json(path: Path, data: dict[str, Any]) -> None:
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        temp_path.replace(path)
+
+    @staticmethod
+    def _read_json(path: Path) -> dict[str, Any]:
+        data: object = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            raise BuildEnvError(f"Queue file is not a JSON object: {path}")
+        return cast("dict[str, Any]", data)
+
+    def open(self) -> None:
+        """
+        Create queue directories and allow workers to wait for jobs.
+        """
+        self._create_dirs()
+        (self.path / self.CLOSED_NAME).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """
+        Tell workers to exit after pending jobs are finished.
+        """
+        self._create_dirs()
+        (self.path / self.CLOSED_NAME).touch()
+
+    def is_closed(self) -> bool:
+        """
+        Whether queue has no more jobs coming.
+        """
+        return (self.path / self.CLOSED_NAME).exists()
+
+    def put(self, jobs: Iterable[WorkJob]) -> None:
+        """
+        Add jobs to queue, results of previous jobs with the same IDs are removed.
+        """
+        self._create_dirs()
+        for job in jobs:
+            file_name = self._get_file_name(job.job_id)
+            (self.done_path / file_name).unlink(missing_ok=True)
+            (self.failed_path / file_name).unlink(missing_ok=True)
+            self._write_json(self.pending_path / file_name, asdict(job))
+
+    def claim(self) -> WorkJob | None:
+        """
+        Claim the first pending job.
+
+        Returns:
+            Claimed job or None if there are no pending jobs.
+        """
+        if not self.pending_path.exists():
+            return None
+        for path in sorted(self.pending_path.glob("*.json")):
+            running_path = self.running_path / path.name
+            try:
+                path.rename(running_path)
+                # rename keeps modification time of pending job, start a new lease
+                os.utime(running_path)
+            except FileNotFoundError:
+                continue
+            return WorkJob(**self._read_json(running_path))
+        return None
+
+    def _renew_lease(self, job: WorkJob, stop: threading.Event) -> None:
+        running_path = self.running_path / self._get_file_name(job.job_id)
+        while not stop.wait(self.lease_time / self.RENEWALS_PER_LEASE):
+            try:
+                os.utime(running_path)
+            except FileNotFoundError:
+                return
+
+    def release_expired(self) -> list[WorkJob]:
+        """
+        Requeue claimed jobs with expired leases, fail them after `MAX_ATTEMPTS` claims.
+
+        Returns:
+            Released jobs.
+        """
+        if not self.running_path.exists():
+            return []
+        result: list[WorkJob] = []
+        now = time.time()
+        for path in sorted(self.running_path.glob("*.json")):
+            try:
+                if now - path.stat().st_mtime < self.lease_time:
+                    continue
+                job = WorkJob(**self._read_json(path))
+            except FileNotFoundError:
+                continue
+
+            job.attempt += 1
+            if job.attempt < self.MAX_ATTEMPTS:
+                self._logger.warning(f"Job {job.job_id} lease expired, requeued", tags=job.job_id)
+                self._write_json(self.pending_path / path.name, asdict(job))
+                path.unlink(missing_ok=True)
+            else:
+                error = f"Lease expired after {job.attempt} attempts"
+                self._logger.warning(f"Job {job.job_id} failed: {error}", tags=job.job_id)
+                self._finish(
+                    job, WorkResult(job_id=job.job_id, worker="", duration=0.0, error=error)
+                )
+            result.append(job)
+        return result
+
+    def _finish(self, job: WorkJob, result: WorkResult) -> None:
+        file_name = self._get_file_name(job.job_id)
+        target_path = self.failed_path if result.error else self.done_path
+        self._write_json(target_path / file_name, asdict(result))
+        (self.running_path / file_name).unlink(missing_ok=True)
+
+    def process(self, job: WorkJob, handler: Callable[[WorkJob], str]) -> WorkResult:
+        """
+        Process claimed job and save its result.
+
+        Arguments:
+            job -- Claimed job.
+            handler -- Job handler that returns written package directory name.
+        """
+        started = time.perf_counter()
+        result = WorkResult(job_id=job.job_id, worker=self.worker, duration=0.0)
+        stop_renewal = threading.Event()
+        renewal = threading.Thread(
+            target=self._renew_lease, args=(job, stop_renewal), name="WorkQueueLease", daemon=True
+        )
+        renewal.start()
+        try:
+            result.directory_name = handler(job)
+        except Exception as e:  # noqa: BLE001
+            result.error = f"{e.__class__.__name__}: {e}"
+            self._logger.warning(f"Job {job.job_id} failed: {result.error}", tags=job.job_id)
+        finally:
+            stop_renewal.set()
+            renewal.join()
+        result.duration = time.perf_counter() - started
+        self._finish(job, result)
+        return result
+
+    def get_result(self, job_id: str) -> WorkResult | None:
+        """
+        Get result of a finished job.
+        """
+        file_name = self._get_file_name(job_id)
+        for dir_path in (self.done_path, self.failed_path):
+            path = dir_path / file_name
+            if path.exists():
+                return WorkResult(**self._read_json(path))
+        return None
+
+    def run(self, jobs: Iterable[WorkJob], handler: Callable[[WorkJob], str]) -> list[WorkResult]:
+        """
+        Add jobs to queue and process them together with other workers until all are finished.
+
+        Jobs of workers that died are requeued or failed when their leases expire.
+
+        Arguments:
+            jobs -- Jobs to add.
+            handler -- Job handler that returns written package directory name.
+
+        Returns:
+            Job results in jobs order.
+
+        Raises:
+            BuildEnvError -- If any job failed.
+        """
+        job_list = list(jobs)
+        self.put(job_list)
+        results: dict[str, WorkResult] = {}
+        while len(results) < len(job_list):
+            self.release_expired()
+            job = self.claim()
+            if job:
+                self.process(job, handler)
+            for pending_job in job_list:
+                if pending_job.job_id in results:
+                    continue
+                result = self.get_result(pending_job.job_id)
+                if result:
+                    results[pending_job.job_id] = result
+            if not job and len(results) < len(job_list):
+                time.sleep(self.poll_interval)
+
+        failed = [result for result in results.values() if result.error]
+        if failed:
+            failed_str = ", ".join(f"{i.job_id} ({i.worker}: {i.error})" for i in failed)
+            raise BuildEnvError(f"{len(failed)} queue jobs failed: {failed_str}")
+        return [results[job.job_id] for job in job_list]
+
+    def work(self, handler: Callable[[WorkJob], str], idle_timeout: float | None = None) -> int:
+        """
+        Process jobs until queue is closed or no jobs appear for `idle_timeout` seconds.
+
+        Arguments:
+            handler -- Job handler that returns written package directory name.
+            idle_timeout -- Exit after this many seconds without jobs, wait forever if None.
+
+        Returns:
+            Number of processed jobs.
+        """
+        self._create_dirs()
+        processed = 0
+        idle_since = time.monotonic()
+        while True:
+            job = self.claim()
+            if job:
+                self.process(job, handler)
+                processed += 1
+                idle_since = time.monotonic()
+                continue
+            if self.is_closed():
+                break
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            time.sleep(self.poll_interval)
+        return processed
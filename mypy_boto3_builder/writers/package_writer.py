@@ -4,20 +4,23 @@ Writer for package static and template files.
 Copyright 2024 Vlad Emelianov
 """
 
-import filecmp
-import shutil
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
 from typing import Final
 
 from mypy_boto3_builder.constants import TEMPLATES_PATH
+from mypy_boto3_builder.enums.file_status import FileStatus
 from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
-from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.logger import get_logger, is_debug_enabled
 from mypy_boto3_builder.structures.package import Package
 from mypy_boto3_builder.structures.packages.service_package import ServicePackage
+from mypy_boto3_builder.utils.build_report import BuildReport
 from mypy_boto3_builder.utils.markdown import fix_pypi_headers
 from mypy_boto3_builder.utils.path import print_path, walk_path
+from mypy_boto3_builder.utils.service_profiler import ServiceProfiler
 from mypy_boto3_builder.writers.ruff_formatter import RuffFormatter
+from mypy_boto3_builder.writers.sinks.base import BaseSink
+from mypy_boto3_builder.writers.sinks.directory import DirectorySink
 from mypy_boto3_builder.writers.utils import (
     format_md,
     insert_md_toc,
@@ -49,6 +52,7 @@ class PackageWriter:
         generate_package -- Whether to generate setup files
         cleanup -- Whether to remove unknown files
         is_typings -- Whether to generate typings without `-stubs` suffix
+        sink -- Output sink, writes to a real directory by default
     """
 
     _PY_EXTENSIONS: Final = {".py", ".pyi"}
@@ -61,8 +65,10 @@ class PackageWriter:
         generate_package: bool,
         cleanup: bool,
         is_typings: bool = True,
+        sink: BaseSink | None = None,
     ) -> None:
         self.output_path = output_path
+        self.sink = sink or DirectorySink()
         self.is_package = generate_package
         self.is_typings = is_typings
         self.cleanup = cleanup
@@ -86,29 +92,24 @@ class PackageWriter:
     def _get_setup_path(self, package: Package) -> Path:
         return self.output_path / package.directory_name
 
-    def _write_static_paths(
+    def _read_static_files(
         self,
         static_files_path: Path | None,
         package: Package,
         exclude_paths: Iterable[Path],
-    ) -> list[Path]:
+    ) -> dict[Path, str]:
         if not static_files_path:
-            return []
+            return {}
         package_path = self._get_package_path(package)
-        result: list[Path] = []
-        for static_path in static_files_path.glob("**/*.pyi"):
+        result: dict[Path, str] = {}
+        for static_path in sorted(static_files_path.glob("**/*.pyi")):
             relative_output_path = static_path.relative_to(static_files_path)
             file_path = package_path / relative_output_path
             if file_path in exclude_paths:
                 continue
-            result.append(file_path)
-            file_path.parent.mkdir(exist_ok=True, parents=True)
-            if not file_path.exists():
-                shutil.copy(static_path, file_path)
-                self.logger.debug(f"Created {print_path(file_path)}")
-            elif not filecmp.cmp(static_path, file_path):
-                shutil.copy(static_path, file_path)
-                self.logger.debug(f"Updated {print_path(file_path)}")
+            content = static_path.read_text()
+            self.sink.add_static_content(content.encode())
+            result[file_path] = content
         return result
 
     def _get_setup_template_paths(
@@ -156,30 +157,43 @@ class PackageWriter:
         template_path: Path,
         render_paths: Iterable[Path],
         package: Package,
-    ) -> None:
-        content = render_jinja2_package_template(template_path, package=package)
+    ) -> dict[Path, str]:
+        result: dict[Path, str] = {}
+        with BuildReport.stage(f"render:{template_path.name}"):
+            content = render_jinja2_package_template(template_path, package=package)
         for output_path in render_paths:
             file_suffix = output_path.suffix.lower()
             if file_suffix in self._MD_EXTENSIONS:
-                content = insert_md_toc(content)
-                content = fix_pypi_headers(content)
-                content = format_md(content)
-            self._write_template(output_path, content)
+                with BuildReport.stage("markdown"):
+                    content = insert_md_toc(content)
+                    content = fix_pypi_headers(content)
+                    content = format_md(content)
+            result[output_path] = content
+        return result
 
     def _render_templates(
         self,
         package: Package,
         template_renders: Iterable[TemplateRender],
-    ) -> None:
+    ) -> dict[Path, str]:
+        result: dict[Path, str] = {}
         for template_render in template_renders:
-            self._render_template(template_render.template_path, template_render.paths, package)
+            result.update(
+                self._render_template(template_render.template_path, template_render.paths, package)
+            )
+        return result
 
     def _write_template(self, path: Path, content: str) -> None:
-        if not path.parent.exists():
-            path.parent.mkdir(exist_ok=True, parents=True)
+        status = self.sink.write_text(path, content)
+        if status == FileStatus.unchanged or not is_debug_enabled():
+            return
+        path_str = print_path(path)
+        self.logger.debug(f"{status.value.capitalize()} {path_str}", tags=path_str)
 
-        path.write_text(content)
-        self.logger.debug(f"Rendered {print_path(path)}", tags=print_path(path))
+    def _write_files(self, contents: Mapping[Path, str]) -> None:
+        with BuildReport.stage("write"):
+            for path, content in contents.items():
+                self._write_template(path, content)
 
     def _render_docs_templates(
         self,
@@ -187,16 +201,19 @@ class PackageWriter:
         template_renders: Iterable[TemplateRender],
     ) -> None:
         for template_render in template_renders:
-            content = render_jinja2_package_template(template_render.template_path, package=package)
-            for output_path in template_render.paths:
-                self._write_template(output_path, content)
+            with BuildReport.stage(f"render:{template_render.template_path.name}"):
+                content = render_jinja2_package_template(
+                    template_render.template_path, package=package
+                )
+            self._write_files(dict.fromkeys(template_render.paths, content))
 
-    def _cleanup(self, valid_paths: Sequence[Path], output_path: Path) -> None:
-        if not self.cleanup or not output_path.exists():
+    def _cleanup(self, output_path: Path) -> None:
+        """
+        Delete unknown files from `output_path` on `BaseSink.cleanup`.
+        """
+        if not self.cleanup:
             return
-        for unknown_path in walk_path(output_path, valid_paths):
-            unknown_path.unlink()
-            self.logger.debug(f"Deleted {print_path(unknown_path)}", tags=print_path(unknown_path))
+        self.sink.add_cleanup_path(output_path)
 
     def write_package(
         self,
@@ -237,17 +254,15 @@ class PackageWriter:
         exclude_static_paths: set[Path] = set()
         for template_render in template_renders:
             exclude_static_paths.update(template_render.paths)
-        static_paths = self._write_static_paths(static_files_path, package, exclude_static_paths)
-        self._render_templates(package, template_renders)
-
-        rendered_paths = [path for t in template_renders for path in t.paths]
-        valid_paths = (*rendered_paths, *static_paths)
-
-        self._format_output(package, valid_paths)
+        contents = {
+            **self._read_static_files(static_files_path, package, exclude_static_paths),
+            **self._render_templates(package, template_renders),
+        }
+        self._write_files(self._format_output(package, contents))
 
         cleanup_path = self._get_cleanup_path(package)
         if cleanup_path:
-            self._cleanup(valid_paths, cleanup_path)
+            self._cleanup(cleanup_path)
 
     def _get_cleanup_path(self, package: Package) -> Path | None:
         if self.is_package:
@@ -258,7 +273,7 @@ class PackageWriter:
 
         return None
 
-    def _format_output(self, package: Package, paths: Sequence[Path]) -> None:
+    def _format_output(self, package: Package, contents: Mapping[Path, str]) -> dict[Path, str]:
         ruff_formatter = RuffFormatter(
             known_first_party=[package.name] if package.has_main_package() else [],
             known_third_party=[
@@ -269,27 +284,25 @@ class PackageWriter:
                 *[package.data.get_service_package_name(i) for i in package.service_names],
             ],
         )
-        existing_paths = [path for path in paths if path.exists()]
-        format_python_paths = [
-            path for path in existing_paths if path.suffix.lower() in self._PY_EXTENSIONS
-        ]
-        if format_python_paths:
-            ruff_formatter.format_python(format_python_paths)
-
-        format_md_paths = [
-            path for path in existing_paths if path.suffix.lower() in self._MD_EXTENSIONS
-        ]
-        if format_md_paths:
-            for path in format_md_paths:
-                content = path.read_text()
-                content = ruff_formatter.format_markdown(content)
-                path.write_text(content)
+        result = dict(contents)
+        python_sources = {
+            path: content
+            for path, content in contents.items()
+            if path.suffix.lower() in self._PY_EXTENSIONS
+        }
+        if python_sources:
+            result.update(ruff_formatter.format_python_sources(python_sources))
+
+        for path, content in contents.items():
+            if path.suffix.lower() in self._MD_EXTENSIONS:
+                with BuildReport.stage("markdown"):
+                    result[path] = ruff_formatter.format_markdown(content)
+        return result
 
     def write_docs(self, package: Package, templates_path: Path) -> None:
         """
         Generate docs for a package.
         """
-        self.output_path.mkdir(exist_ok=True, parents=True)
         template_renders: list[TemplateRender] = []
         for template_path in templates_path.glob("**/*.jinja2"):
             file_name = template_path.stem
@@ -381,29 +394,80 @@ class PackageWriter:
             )
         return file_paths
 
-    def write_service_package(self, package: ServicePackage, templates_path: Path) -> None:
+    def render_service_package(
+        self, package: ServicePackage, templates_path: Path
+    ) -> dict[Path, str]:
         """
-        Create stubs files for service.
+        Render stubs files for service without formatting.
 
         Arguments:
             package -- Service package.
+            templates_path -- Path to Jinja templates for service package.
+
+        Returns:
+            Output path to content mapping.
         """
         template_renders: list[TemplateRender] = [
             *self._get_setup_template_paths(package, templates_path),
             *self._get_service_package_template_paths(package, templates_path),
         ]
-        self._render_templates(package, template_renders)
+        with (
+            BuildReport.service(package.service_name.name),
+            ServiceProfiler.service(package.service_name.name),
+        ):
+            return self._render_templates(package, template_renders)
+
+    def format_service_package(
+        self, package: ServicePackage, contents: Mapping[Path, str]
+    ) -> dict[Path, str]:
+        """
+        Format rendered stubs files for service.
 
-        valid_paths = [path for t in template_renders for path in t.paths]
+        Arguments:
+            package -- Service package.
+            contents -- Output path to rendered content mapping.
+
+        Returns:
+            Output path to formatted content mapping.
+        """
+        with (
+            BuildReport.service(package.service_name.name),
+            ServiceProfiler.service(package.service_name.name),
+        ):
+            return self._format_output(package, contents)
+
+    def write_service_package_files(
+        self, package: ServicePackage, contents: Mapping[Path, str]
+    ) -> None:
+        """
+        Write formatted stubs files for service to sink.
 
-        self._format_output(package, valid_paths)
+        Arguments:
+            package -- Service package.
+            contents -- Output path to formatted content mapping.
+        """
+        with (
+            BuildReport.service(package.service_name.name),
+            ServiceProfiler.service(package.service_name.name),
+        ):
+            self._write_files(contents)
 
         output_path = (
             self._get_setup_path(package)
             if self.is_package
             else self._get_service_package_path(package)
         )
-        self._cleanup(valid_paths, output_path)
+        self._cleanup(output_path)
+
+    def write_service_package(self, package: ServicePackage, templates_path: Path) -> None:
+        """
+        Create stubs files for service.
+
+        Arguments:
+            package -- Service package.
+        """
+        contents = self.render_service_package(package, templates_path)
+        self.write_service_package_files(package, self.format_service_package(package, contents))
 
     def write_service_docs(self, package: ServicePackage, templates_path: Path) -> None:
         """
@@ -414,7 +478,6 @@ class PackageWriter:
             output_path -- Path to output directory.
         """
         docs_path = self.output_path / package.name
-        docs_path.mkdir(exist_ok=True, parents=True)
         template_renders: list[TemplateRender] = [
             TemplateRender(templates_path / "README.md.jinja2", docs_path / "README.md"),
             TemplateRender(templates_path / "client.md.jinja2", docs_path / "client.md"),
@@ -452,6 +515,9 @@ class PackageWriter:
                 ),
             )
 
-        self._render_docs_templates(package, template_renders)
-        valid_paths = [path for t in template_renders for path in t.paths]
-        self._cleanup(valid_paths, docs_path)
+        with (
+            BuildReport.service(package.service_name.name),
+            ServiceProfiler.service(package.service_name.name),
+        ):
+            self._render_docs_templates(package, template_renders)
+        self._cleanup(docs_path)
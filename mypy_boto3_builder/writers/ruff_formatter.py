@@ -5,14 +5,16 @@ Copyright 2024 Vlad Emelianov
 """
 
 import json
+import os
 import subprocess
 import sys
 import tempfile
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
 
 from mypy_boto3_builder.constants import LINE_LENGTH, SUPPORTED_PY_VERSIONS
 from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.utils.build_report import BuildReport
 from mypy_boto3_builder.utils.path import print_path
 
 
@@ -52,6 +54,33 @@ class RuffFormatter:
         self._sort_imports(paths)
         self._run_format(paths)
 
+    def format_python_sources(self, sources: Mapping[Path, str]) -> dict[Path, str]:
+        """
+        Format python sources with `ruff` without writing them to output.
+
+        Sources are formatted in a scratch directory that keeps their relative layout.
+
+        Arguments:
+            sources -- Output path to source code mapping.
+
+        Returns:
+            Output path to formatted source code mapping.
+        """
+        if not sources:
+            return {}
+
+        common_path = Path(os.path.commonpath([path.parent for path in sources]))
+        with tempfile.TemporaryDirectory() as dir_name:
+            temp_paths: dict[Path, Path] = {}
+            for path, source in sources.items():
+                temp_path = Path(dir_name) / path.relative_to(common_path)
+                temp_path.parent.mkdir(exist_ok=True, parents=True)
+                temp_path.write_text(source)
+                temp_paths[path] = temp_path
+
+            self.format_python(list(temp_paths.values()))
+            return {path: temp_path.read_text() for path, temp_path in temp_paths.items()}
+
     def _get_config_cli(self) -> list[str]:
         overrides = [
             f'target-version = "{self._target_version}"',
@@ -83,7 +112,9 @@ class RuffFormatter:
             *(path.as_posix() for path in paths),
         )
         try:
-            subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+            with BuildReport.stage("ruff:check"):
+                BuildReport.add_subprocess()
+                subprocess.check_output(cmd, stderr=subprocess.STDOUT)
         except subprocess.CalledProcessError as e:
             self.logger.warning(
                 f"Ruff check failed for paths {[print_path(path) for path in paths]}",
@@ -114,7 +145,9 @@ class RuffFormatter:
             *(path.as_posix() for path in paths),
         )
         try:
-            subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+            with BuildReport.stage("ruff:format"):
+                BuildReport.add_subprocess()
+                subprocess.check_output(cmd, stderr=subprocess.STDOUT)
         except subprocess.CalledProcessError as e:
             self.logger.warning(
                 f"Ruff format failed for paths {[print_path(path) for path in paths]}",
@@ -0,0 +1,3 @@
+"""
+Output sinks store files produced by package writers.
+"""
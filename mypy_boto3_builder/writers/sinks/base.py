@@ -0,0 +1,217 @@
+"""
+Base output sink.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
+from typing import cast
+
+from mypy_boto3_builder.enums.file_status import FileStatus
+from mypy_boto3_builder.logger import get_logger
+from mypy_boto3_builder.utils.build_report import BuildReport
+from mypy_boto3_builder.utils.path import print_path
+
+
+class BaseSink(ABC):
+    """
+    Base output sink.
+
+    Stores files produced by `PackageWriter` and read by `PackageBuilder`.
+    Paths are output paths as if files were written to a real directory.
+    Counts created, updated, unchanged and deleted files.
+
+    Arguments:
+        manifest_path -- Output manifest file with files written to cleanup directories,
+            used to delete only files written by previous runs. Not used if None.
+    """
+
+    def __init__(self, manifest_path: Path | None = None) -> None:
+        self.manifest_path = manifest_path
+        self.counts: dict[FileStatus, int] = dict.fromkeys(FileStatus, 0)
+        self._written_paths: set[Path] = set()
+        self._cleanup_paths: set[Path] = set()
+        self._logger = get_logger()
+
+    def write_bytes(self, path: Path, data: bytes) -> FileStatus:
+        """
+        Write file data if it has changed, create parent directories if needed.
+
+        Returns:
+            File status after write.
+        """
+        status = self._write_bytes(path, data)
+        self.counts[status] += 1
+        self._written_paths.add(path)
+        BuildReport.add_output(len(data))
+        return status
+
+    @abstractmethod
+    def _write_bytes(self, path: Path, data: bytes) -> FileStatus:
+        """
+        Write file data if it has changed.
+        """
+
+    def write_text(self, path: Path, content: str) -> FileStatus:
+        """
+        Write file text content if it has changed.
+
+        Returns:
+            File status after write.
+        """
+        return self.write_bytes(path, content.encode())
+
+    def add_static_content(self, data: bytes) -> None:
+        """
+        Register content of a static file that is likely to be written as-is.
+
+        Does nothing by default.
+        """
+        return
+
+    @abstractmethod
+    def read_bytes(self, path: Path) -> bytes:
+        """
+        Read file data.
+        """
+
+    def read_text(self, path: Path) -> str:
+        """
+        Read file text content.
+        """
+        return self.read_bytes(path).decode()
+
+    @abstractmethod
+    def exists(self, path: Path) -> bool:
+        """
+        Whether file exists.
+        """
+
+    @abstractmethod
+    def iterate_files(self, parent: Path) -> Iterator[Path]:
+        """
+        Iterate over all files in `parent` directory recursively.
+        """
+
+    def delete(self, path: Path) -> None:
+        """
+        Delete file.
+        """
+        self._delete(path)
+        self.counts[FileStatus.deleted] += 1
+
+    @abstractmethod
+    def _delete(self, path: Path) -> None:
+        """
+        Delete file.
+        """
+
+    def add_cleanup_path(self, parent: Path) -> None:
+        """
+        Delete files in `parent` directory that are not written in this run on `cleanup`.
+        """
+        self._cleanup_paths.add(parent)
+
+    def _get_written_paths_by_parent(self) -> dict[Path, set[Path]]:
+        result: dict[Path, set[Path]] = {parent: set() for parent in self._cleanup_paths}
+        for path in self._written_paths:
+            for parent in path.parents:
+                if parent in result:
+                    result[parent].add(path)
+                    break
+        return result
+
+    def _read_manifest(self) -> dict[Path, set[Path]]:
+        """
+        Read files written to cleanup directories by previous runs.
+
+        Returns:
+            Directory to its written files mapping.
+        """
+        manifest_path = self.manifest_path
+        if manifest_path is None or not self.exists(manifest_path):
+            return {}
+
+        root_path = manifest_path.parent
+        result: dict[Path, set[Path]] = {}
+        for parent_str, path_strs in self._load_manifest_data(manifest_path).items():
+            if not self._is_relative(parent_str):
+                continue
+            parent = root_path / parent_str
+            result[parent] = {
+                parent / path_str for path_str in path_strs if self._is_relative(path_str)
+            }
+        return result
+
+    def _load_manifest_data(self, manifest_path: Path) -> dict[str, list[str]]:
+        try:
+            data: object = json.loads(self.read_text(manifest_path))
+        except ValueError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        result: dict[str, list[str]] = {}
+        for parent_str, path_strs in cast("dict[object, object]", data).items():
+            if not isinstance(parent_str, str) or not isinstance(path_strs, list):
+                continue
+            result[parent_str] = [
+                path_str
+                for path_str in cast("list[object]", path_strs)
+                if isinstance(path_str, str)
+            ]
+        return result
+
+    @staticmethod
+    def _is_relative(path_str: str) -> bool:
+        path = Path(path_str)
+        return bool(path_str) and not path.is_absolute() and ".." not in path.parts
+
+    def _write_manifest(self, manifest: dict[Path, set[Path]]) -> None:
+        manifest_path = self.manifest_path
+        if manifest_path is None:
+            return
+        root_path = manifest_path.parent
+        data = {
+            parent.relative_to(root_path).as_posix(): sorted(
+                path.relative_to(parent).as_posix() for path in paths
+            )
+            for parent, paths in sorted(manifest.items())
+            if parent.is_relative_to(root_path)
+        }
+        self._write_bytes(manifest_path, (json.dumps(data, indent=2) + "\n").encode())
+
+    def cleanup(self) -> None:
+        """
+        Delete stale files from directories added with `add_cleanup_path`.
+
+        Runs after all packages are written, so files written by
+        different writers to the same directory are preserved.
+        Stale files are the ones listed in the output manifest of the previous run,
+        but not written in this run. If there is no manifest entry for a directory,
+        it is scanned for unknown files instead.
+        Files written in this run are saved to the output manifest.
+        """
+        manifest = self._read_manifest()
+        for parent, written_paths in sorted(self._get_written_paths_by_parent().items()):
+            previous_paths = manifest.get(parent)
+            if previous_paths is None:
+                previous_paths = set(self.iterate_files(parent))
+            for path in sorted(previous_paths - written_paths):
+                if not self.exists(path):
+                    continue
+                self.delete(path)
+                self._logger.debug(f"Deleted {print_path(path)}", tags=print_path(path))
+            manifest[parent] = written_paths
+        if self._cleanup_paths:
+            self._write_manifest(manifest)
+        self._cleanup_paths.clear()
+
+    def get_summary(self) -> str:
+        """
+        Get created, updated, unchanged and deleted files counts as a string.
+        """
+        return ", ".join(f"{count} {status.value}" for status, count in self.counts.items())
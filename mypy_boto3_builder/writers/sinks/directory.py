@@ -0,0 +1,103 @@
+"""
+Output sink that writes files to a real directory.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+import os
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+from mypy_boto3_builder.enums.file_status import FileStatus
+from mypy_boto3_builder.utils.content_store import ContentStore
+from mypy_boto3_builder.utils.path import walk_path
+from mypy_boto3_builder.writers.sinks.base import BaseSink
+
+
+class DirectorySink(BaseSink):
+    """
+    Output sink that writes files to a real directory.
+
+    Files with the same content are not touched, so their modification time is preserved.
+    Changed files are written to a temporary file next to the target and atomically renamed,
+    so readers never see a partially written file.
+
+    Arguments:
+        store -- Content store to hardlink static files from instead of writing them.
+            Linked files are read-only and shared with the store, not used if None.
+        manifest_path -- Output manifest file, see `BaseSink`.
+    """
+
+    def __init__(
+        self, store: ContentStore | None = None, manifest_path: Path | None = None
+    ) -> None:
+        super().__init__(manifest_path=manifest_path)
+        self.store = store
+
+    def add_static_content(self, data: bytes) -> None:
+        """
+        Add content of a static file to content store.
+        """
+        if self.store:
+            self.store.add(data)
+
+    def _write_bytes(self, path: Path, data: bytes) -> FileStatus:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            if not path.parent.exists():
+                path.parent.mkdir(exist_ok=True, parents=True)
+            self._replace(path, data, mode=None)
+            return FileStatus.created
+
+        if stat.st_size == len(data) and path.read_bytes() == data:
+            return FileStatus.unchanged
+
+        # hardlinked files have store object permissions
+        mode = stat.st_mode & 0o777 if stat.st_nlink == 1 else None
+        self._replace(path, data, mode=mode)
+        return FileStatus.updated
+
+    def _replace(self, path: Path, data: bytes, mode: int | None) -> None:
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        object_path = self.store.find(data) if self.store else None
+        try:
+            if self.store and object_path:
+                self.store.link(object_path, temp_path)
+            else:
+                self._write_new(temp_path, data, mode)
+            temp_path.replace(path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _write_new(path: Path, data: bytes, mode: int | None) -> None:
+        # new files get default permissions with umask applied, like `Path.write_bytes`
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        with os.fdopen(fd, "wb") as file_obj:
+            file_obj.write(data)
+        if mode is not None:
+            path.chmod(mode)
+
+    def read_bytes(self, path: Path) -> bytes:
+        """
+        Read file data.
+        """
+        return path.read_bytes()
+
+    def exists(self, path: Path) -> bool:
+        """
+        Whether file exists.
+        """
+        return path.is_file()
+
+    def iterate_files(self, parent: Path) -> Iterator[Path]:
+        """
+        Iterate over all files in `parent` directory recursively.
+        """
+        yield from walk_path(parent)
+
+    def _delete(self, path: Path) -> None:
+        path.unlink()
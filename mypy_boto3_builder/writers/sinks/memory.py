@@ -0,0 +1,68 @@
+"""
+Output sink that keeps files in memory.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+from mypy_boto3_builder.enums.file_status import FileStatus
+from mypy_boto3_builder.writers.sinks.base import BaseSink
+
+
+class MemorySink(BaseSink):
+    """
+    Output sink that keeps files in memory.
+
+    Used when generated packages are only needed to build wheels and sdists,
+    so package sources are never written to disk.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._files: dict[Path, bytes] = {}
+
+    def _write_bytes(self, path: Path, data: bytes) -> FileStatus:
+        old_data = self._files.get(path)
+        if old_data == data:
+            return FileStatus.unchanged
+
+        self._files[path] = data
+        return FileStatus.created if old_data is None else FileStatus.updated
+
+    def read_bytes(self, path: Path) -> bytes:
+        """
+        Read file data.
+        """
+        try:
+            return self._files[path]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+    def exists(self, path: Path) -> bool:
+        """
+        Whether file exists.
+        """
+        return path in self._files
+
+    def iterate_files(self, parent: Path) -> Iterator[Path]:
+        """
+        Iterate over all files in `parent` directory recursively.
+        """
+        for path in tuple(self._files):
+            if path.is_relative_to(parent) and path != parent:
+                yield path
+
+    def _delete(self, path: Path) -> None:
+        try:
+            del self._files[path]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+    def clear(self, parent: Path) -> None:
+        """
+        Delete all files in `parent` directory to free memory.
+        """
+        for path in tuple(self.iterate_files(parent)):
+            del self._files[path]
@@ -0,0 +1,657 @@
+#!/usr/bin/env python
+"""
+Micro-benchmarks for builder components.
+
+Measures time and traced memory of service parsing and of the hottest builder
+components on the largest botocore models. Runs offline against the locally
+installed `botocore`.
+
+Usage:
+    python scripts/benchmark.py run -o baseline.json
+    python scripts/benchmark.py run -o current.json --compare baseline.json
+    python scripts/benchmark.py compare baseline.json current.json --threshold 10
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import botocore
+from mypy_boto3_builder.constants import TemplatePath
+from mypy_boto3_builder.enums.service_module_name import ServiceModuleName
+from mypy_boto3_builder.logger import get_logger, setup_logger
+from mypy_boto3_builder.main import initialize_jinja_manager
+from mypy_boto3_builder.package_data import TypesBoto3PackageData
+from mypy_boto3_builder.parsers.service_package_parser import ServicePackageParser
+from mypy_boto3_builder.parsers.shape_parser import ShapeParser
+from mypy_boto3_builder.postprocessors.botocore import BotocorePostprocessor
+from mypy_boto3_builder.type_maps.method_type_map import (
+    get_default_value_stub,
+    get_method_type_stub,
+)
+from mypy_boto3_builder.type_maps.shape_type_map import (
+    get_output_shape_type_stub,
+    get_shape_type_stub,
+)
+from mypy_boto3_builder.utils.boto3_utils import get_available_service_names
+from mypy_boto3_builder.utils.http_client import HTTPClient
+from mypy_boto3_builder.utils.type_def_sorter import TypeDefSorter
+from mypy_boto3_builder.utils.version import get_builder_version
+from mypy_boto3_builder.writers.utils import render_jinja2_package_template
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Sequence
+
+    from mypy_boto3_builder.import_helpers.import_record_group import ImportRecordGroup
+    from mypy_boto3_builder.service_name import ServiceName
+    from mypy_boto3_builder.structures.packages.service_package import ServicePackage
+
+DEFAULT_SERVICE_NAMES = ("ec2", "sagemaker")
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 10.0
+VERSION = "1.0.0"
+
+logger = get_logger()
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings and traced memory of a benchmark.
+
+    Arguments:
+        name -- Benchmark name.
+        service_name -- Service name the benchmark ran on.
+        times -- Wall time of every run in seconds.
+        calls -- Number of measured calls per run.
+        peak_memory -- Max traced memory growth during a run in bytes.
+    """
+
+    name: str
+    service_name: str
+    times: list[float] = field(default_factory=list[float])
+    calls: int = 0
+    peak_memory: int = 0
+
+    @property
+    def key(self) -> str:
+        """
+        Unique key to compare results by.
+        """
+        return f"{self.name}[{self.service_name}]"
+
+    @property
+    def best(self) -> float:
+        """
+        The fastest run time.
+        """
+        return min(self.times) if self.times else 0.0
+
+    @property
+    def median(self) -> float:
+        """
+        Median run time.
+        """
+        return statistics.median(self.times) if self.times else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get JSON data.
+        """
+        data = asdict(self)
+        data["times"] = [round(i, 6) for i in self.times]
+        data["best"] = round(self.best, 6)
+        data["median"] = round(self.median, 6)
+        return data
+
+
+class MemoryTracer:
+    """
+    Traced memory peaks of nested measurements.
+
+    `tracemalloc` has one peak counter, so every measurement resets it and
+    propagates seen peaks to outer measurements.
+    """
+
+    def __init__(self) -> None:
+        self._frames: list[list[int]] = []
+
+    @staticmethod
+    def is_tracing() -> bool:
+        """
+        Whether memory is traced.
+        """
+        return tracemalloc.is_tracing()
+
+    def _update_peaks(self, peak: int) -> None:
+        for frame in self._frames:
+            frame[1] = max(frame[1], peak)
+
+    @contextlib.contextmanager
+    def measure(self, result: list[int]) -> Generator[None, None, None]:
+        """
+        Append traced memory peak growth in context to `result`.
+        """
+        if not self.is_tracing():
+            yield
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        self._update_peaks(peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        self._frames.append(frame)
+        try:
+            yield
+        finally:
+            _current, peak = tracemalloc.get_traced_memory()
+            self._update_peaks(peak)
+            self._frames.pop()
+            self._update_peaks(frame[1])
+            result.append(frame[1] - frame[0])
+
+
+class CallRecorder:
+    """
+    Record wall time and traced memory of calls to wrapped methods.
+
+    Used for components that mutate parser state and cannot be called
+    repeatedly, so they are measured as a part of a full service parse.
+    """
+
+    def __init__(self, tracer: MemoryTracer) -> None:
+        self.tracer = tracer
+        self.times: dict[str, list[float]] = {}
+        self.memory: dict[str, list[int]] = {}
+
+    def reset(self) -> None:
+        """
+        Forget recorded calls.
+        """
+        self.times = {name: [] for name in self.times}
+        self.memory = {name: [] for name in self.memory}
+
+    @contextlib.contextmanager
+    def wrap(self, owner: type, method_name: str) -> Generator[None, None, None]:
+        """
+        Record calls to `owner.method_name` in context.
+        """
+        name = f"{owner.__name__}.{method_name}"
+        original = getattr(owner, method_name)
+        self.times[name] = []
+        self.memory[name] = []
+
+        @functools.wraps(original)
+        def wrapper(*args: object, **kwargs: object) -> object:
+            with self.tracer.measure(self.memory[name]):
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.times[name].append(time.perf_counter() - start)
+
+        setattr(owner, method_name, wrapper)
+        try:
+            yield
+        finally:
+            setattr(owner, method_name, original)
+
+
+def measure(
+    name: str,
+    service_name: ServiceName,
+    func: Callable[[], object],
+    repeat: int,
+    calls: int = 1,
+) -> BenchmarkResult:
+    """
+    Measure `repeat` runs of `func` and one more run with traced memory.
+    """
+    result = BenchmarkResult(name=name, service_name=service_name.name, calls=calls)
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        result.times.append(time.perf_counter() - start)
+
+    memory: list[int] = []
+    tracemalloc.start()
+    try:
+        with MemoryTracer().measure(memory):
+            func()
+    finally:
+        tracemalloc.stop()
+    result.peak_memory = max(memory)
+    return result
+
+
+def parse_service_package(service_name: ServiceName) -> ServicePackage:
+    """
+    Parse and postprocess `types-boto3` service package.
+    """
+    package = ServicePackageParser(service_name, TypesBoto3PackageData(), VERSION).parse()
+    postprocessor = BotocorePostprocessor(package, [service_name])
+    postprocessor.postprocess_parsed()
+    postprocessor.postprocess()
+    package.mark_safe_typed_dicts()
+    return package
+
+
+def bench_parse(service_name: ServiceName, repeat: int) -> list[BenchmarkResult]:
+    """
+    Measure full service parse and components that mutate parser state.
+    """
+    tracer = MemoryTracer()
+    recorder = CallRecorder(tracer)
+    wrapped = (
+        (ShapeParser, "fix_typed_dict_names"),
+        (ShapeParser, "convert_input_arguments_to_unions"),
+        (TypeDefSorter, "sort"),
+    )
+    parse_result = BenchmarkResult(
+        name="ServicePackageParser.parse", service_name=service_name.name
+    )
+    results = {
+        f"{owner.__name__}.{method_name}": BenchmarkResult(
+            name=f"{owner.__name__}.{method_name}", service_name=service_name.name
+        )
+        for owner, method_name in wrapped
+    }
+
+    def parse() -> None:
+        ServicePackageParser(service_name, TypesBoto3PackageData(), VERSION).parse()
+
+    with contextlib.ExitStack() as stack:
+        for owner, method_name in wrapped:
+            stack.enter_context(recorder.wrap(owner, method_name))
+
+        for _ in range(repeat):
+            gc.collect()
+            recorder.reset()
+            start = time.perf_counter()
+            parse()
+            parse_result.times.append(time.perf_counter() - start)
+            for name, times in recorder.times.items():
+                results[name].times.append(sum(times))
+                results[name].calls = len(times)
+
+        recorder.reset()
+        memory: list[int] = []
+        tracemalloc.start()
+        try:
+            with tracer.measure(memory):
+                parse()
+        finally:
+            tracemalloc.stop()
+        parse_result.calls = 1
+        parse_result.peak_memory = max(memory)
+        for name, call_memory in recorder.memory.items():
+            results[name].peak_memory = max(call_memory, default=0)
+
+    return [parse_result, *results.values()]
+
+
+def bench_shape_parser(service_name: ServiceName, repeat: int) -> BenchmarkResult:
+    """
+    Measure `ShapeParser.parse_shape` for all operation input and output shapes.
+    """
+    service_model = ShapeParser(service_name).service_model
+    operation_models = [service_model.operation_model(i) for i in service_model.operation_names]
+
+    def parse_shapes() -> None:
+        shape_parser = ShapeParser(service_name)
+        for operation_model in operation_models:
+            if operation_model.input_shape:
+                shape_parser.parse_shape(operation_model.input_shape)
+            if operation_model.output_shape:
+                shape_parser.parse_shape(operation_model.output_shape, is_output=True)
+
+    return measure(
+        "ShapeParser.parse_shape", service_name, parse_shapes, repeat, len(operation_models)
+    )
+
+
+def bench_postprocess_parsed(service_name: ServiceName, repeat: int) -> BenchmarkResult:
+    """
+    Measure product-independent postprocessing of a freshly parsed service package.
+    """
+    result = BenchmarkResult(name="postprocess_parsed", service_name=service_name.name, calls=1)
+
+    def get_postprocessor() -> BotocorePostprocessor:
+        package = ServicePackageParser(service_name, TypesBoto3PackageData(), VERSION).parse()
+        return BotocorePostprocessor(package, [service_name])
+
+    for _ in range(repeat):
+        postprocessor = get_postprocessor()
+        gc.collect()
+        start = time.perf_counter()
+        postprocessor.postprocess_parsed()
+        result.times.append(time.perf_counter() - start)
+
+    postprocessor = get_postprocessor()
+    memory: list[int] = []
+    tracemalloc.start()
+    try:
+        with MemoryTracer().measure(memory):
+            postprocessor.postprocess_parsed()
+    finally:
+        tracemalloc.stop()
+    result.peak_memory = max(memory)
+    return result
+
+
+def bench_render_definition(package: ServicePackage, repeat: int) -> BenchmarkResult:
+    """
+    Measure `render_definition` of all type definitions and literals.
+    """
+    type_defs = [*package.type_defs, *package.literals]
+
+    def render() -> None:
+        for type_def in type_defs:
+            type_def.render_definition()
+
+    return measure("render_definition", package.service_name, render, repeat, len(type_defs))
+
+
+def get_import_record_groups(package: ServicePackage) -> list[ImportRecordGroup]:
+    """
+    Get import record groups of all service package modules.
+    """
+    return [
+        package.get_init_import_records(),
+        package.get_client_required_import_records(),
+        package.get_service_resource_required_import_records(),
+        package.get_paginator_required_import_records(),
+        package.get_waiter_required_import_records(),
+        package.get_type_defs_required_import_records(),
+        package.get_literals_required_import_records(),
+    ]
+
+
+def bench_import_record_group(package: ServicePackage, repeat: int) -> BenchmarkResult:
+    """
+    Measure `ImportRecordGroup` rendering for all service package modules.
+    """
+    groups = get_import_record_groups(package)
+
+    def render() -> None:
+        for group in groups:
+            list(group)
+
+    return measure("ImportRecordGroup.render", package.service_name, render, repeat, len(groups))
+
+
+def bench_lookup_dict(package: ServicePackage, repeat: int) -> BenchmarkResult:
+    """
+    Measure `LookupDict.get` with type map lookups parser does for the package.
+    """
+    service_name = package.service_name
+    argument_keys = [
+        (parent_class.name, method.name, argument.name)
+        for parent_class, method in package.iterate_methods()
+        for argument in method.arguments
+    ]
+    shape_names = sorted(ShapeParser(service_name).service_model.shape_names)
+
+    def lookup() -> None:
+        for class_name, method_name, argument_name in argument_keys:
+            get_method_type_stub(service_name, class_name, method_name, argument_name)
+            get_default_value_stub(service_name, class_name, method_name, argument_name)
+        for shape_name in shape_names:
+            get_shape_type_stub(service_name, "Client", shape_name)
+            get_output_shape_type_stub(service_name, "Client", shape_name)
+
+    calls = len(argument_keys) * 2 + len(shape_names) * 2
+    return measure("LookupDict.get", service_name, lookup, repeat, calls)
+
+
+def bench_templates(package: ServicePackage, repeat: int) -> BenchmarkResult:
+    """
+    Measure rendering of all service package templates.
+    """
+    template_paths = sorted(TemplatePath.types_boto3_service.glob("**/*.jinja2"))
+    if not package.service_resource:
+        template_paths = [
+            i for i in template_paths if i.name != ServiceModuleName.service_resource.template_name
+        ]
+
+    def render() -> None:
+        for template_path in template_paths:
+            render_jinja2_package_template(template_path, package)
+
+    return measure(
+        "render_jinja2_package_template", package.service_name, render, repeat, len(template_paths)
+    )
+
+
+def bench_log_format(package: ServicePackage, repeat: int) -> BenchmarkResult:
+    """
+    Measure emitting plain and tagged debug records through the builder log handler.
+    """
+    names = [type_def.name for type_def in [*package.type_defs, *package.literals]]
+
+    def log() -> None:
+        for name in names:
+            logger.debug(f"Rendered {name}")
+            logger.debug(f"Rendered {name}", tags=name)
+
+    with Path(os.devnull).open("w", encoding="utf-8") as stream:
+        with contextlib.redirect_stderr(stream):
+            setup_logger(name="benchmark")
+        try:
+            return measure("log_format", package.service_name, log, repeat, len(names) * 2)
+        finally:
+            setup_logger(name="benchmark")
+
+
+BENCHMARKS: tuple[Callable[[ServicePackage, int], BenchmarkResult], ...] = (
+    bench_render_definition,
+    bench_import_record_group,
+    bench_lookup_dict,
+    bench_templates,
+    bench_log_format,
+)
+
+
+def run_benchmarks(service_name: ServiceName, repeat: int) -> list[BenchmarkResult]:
+    """
+    Run all benchmarks for a service.
+    """
+    logger.info(f"Benchmarking {service_name.name}")
+    results = [
+        *bench_parse(service_name, repeat),
+        bench_shape_parser(service_name, repeat),
+        bench_postprocess_parsed(service_name, repeat),
+    ]
+    package = parse_service_package(service_name)
+    results.extend(benchmark(package, repeat) for benchmark in BENCHMARKS)
+    for result in results:
+        logger.info(
+            f"  {result.key}: best {result.best * 1000:.2f}ms,"
+            f" median {result.median * 1000:.2f}ms,"
+            f" peak {result.peak_memory / 1024:.0f} KiB, {result.calls} calls"
+        )
+    return results
+
+
+def get_service_names(names: Sequence[str]) -> list[ServiceName]:
+    """
+    Get service names by their botocore names.
+    """
+    available_map = {i.name: i for i in get_available_service_names()}
+    result: list[ServiceName] = []
+    for name in names:
+        if name not in available_map:
+            logger.warning(f"Service {name} is not available, skipping")
+            continue
+        result.append(available_map[name])
+    return result
+
+
+def get_environment() -> dict[str, str]:
+    """
+    Get environment results depend on.
+    """
+    return {
+        "builder_version": get_builder_version(),
+        "botocore_version": botocore.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """
+    Load benchmark results with environment from a JSON file.
+    """
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def get_change(baseline: float, current: float) -> float:
+    """
+    Get relative change in percent.
+    """
+    if not baseline:
+        return 0.0
+    return (current - baseline) * 100 / baseline
+
+
+def compare(baseline_path: Path, current_path: Path, threshold: float) -> list[str]:
+    """
+    Compare benchmark results with a baseline.
+
+    Arguments:
+        baseline_path -- Baseline results path.
+        current_path -- Current results path.
+        threshold -- Allowed slowdown or memory growth in percent.
+
+    Returns:
+        Keys of regressed benchmarks.
+    """
+    baseline = load_results(baseline_path)
+    current = load_results(current_path)
+    for key in ("builder_version", "botocore_version", "python_version", "platform"):
+        if baseline.get(key) != current.get(key):
+            logger.warning(f"Different {key}: {baseline.get(key)} -> {current.get(key)}")
+
+    regressions: list[str] = []
+    for key, current_data in current["results"].items():
+        baseline_data = baseline["results"].get(key)
+        if baseline_data is None:
+            logger.info(f"{key}: new benchmark")
+            continue
+        time_change = get_change(baseline_data["best"], current_data["best"])
+        memory_change = get_change(baseline_data["peak_memory"], current_data["peak_memory"])
+        is_regression = time_change > threshold or memory_change > threshold
+        message = (
+            f"{key}: time {baseline_data['best'] * 1000:.2f}ms ->"
+            f" {current_data['best'] * 1000:.2f}ms ({time_change:+.1f}%),"
+            f" peak memory {baseline_data['peak_memory'] / 1024:.0f} KiB ->"
+            f" {current_data['peak_memory'] / 1024:.0f} KiB ({memory_change:+.1f}%)"
+        )
+        if is_regression:
+            regressions.append(key)
+            logger.warning(f"{message} REGRESSION")
+        else:
+            logger.info(message)
+
+    if regressions:
+        logger.warning(f"{len(regressions)} benchmarks regressed more than {threshold}%")
+    else:
+        logger.info(f"No benchmarks regressed more than {threshold}%")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse CLI arguments.
+    """
+    parser = argparse.ArgumentParser(__file__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument(
+        "services",
+        nargs="*",
+        default=DEFAULT_SERVICE_NAMES,
+        help=f"Service names to benchmark, default: {' '.join(DEFAULT_SERVICE_NAMES)}",
+    )
+    run_parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Number of timed runs, default: {DEFAULT_REPEAT}",
+    )
+    run_parser.add_argument("-o", "--output", type=Path, help="Save JSON results to this path")
+    run_parser.add_argument("--compare", type=Path, help="Compare results with this baseline")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare results with a baseline")
+    compare_parser.add_argument("baseline", type=Path, help="Baseline results path")
+    compare_parser.add_argument("current", type=Path, help="Current results path")
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument(
+            "-t",
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help=f"Allowed regression in percent, default: {DEFAULT_THRESHOLD}",
+        )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Run main entrypoint.
+    """
+    setup_logger(name="benchmark")
+    args = parse_args()
+    if args.command == "compare":
+        regressions = compare(args.baseline, args.current, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    HTTPClient.configure(None, offline=True)
+    initialize_jinja_manager()
+    results: list[BenchmarkResult] = []
+    for service_name in get_service_names(args.services):
+        results.extend(run_benchmarks(service_name, args.repeat))
+
+    output_path: Path | None = args.output
+    if output_path is None and args.compare:
+        output_path = args.compare.with_name(f"{args.compare.stem}.current.json")
+    if output_path is None:
+        return
+
+    data = {
+        **get_environment(),
+        "repeat": args.repeat,
+        "results": {i.key: i.to_dict() for i in results},
+    }
+    output_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    logger.info(f"Results saved to {output_path}")
+
+    if args.compare:
+        regressions = compare(args.compare, output_path, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+Memory benchmark for parsed service packages.
+
+Parses each service and reports how many type annotation, import and structure
+objects stay alive and how many bytes they take.
+
+Copyright 2024 Vlad Emelianov
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mypy_boto3_builder.import_helpers.import_record import ImportRecord
+from mypy_boto3_builder.import_helpers.import_string import ImportString
+from mypy_boto3_builder.logger import get_logger, setup_logger
+from mypy_boto3_builder.package_data import TypesBoto3PackageData
+from mypy_boto3_builder.parsers.service_package_parser import ServicePackageParser
+from mypy_boto3_builder.structures.argument import Argument
+from mypy_boto3_builder.structures.attribute import Attribute
+from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
+from mypy_boto3_builder.type_annotations.type_typed_dict import TypedDictAttribute
+from mypy_boto3_builder.utils.boto3_utils import get_available_service_names
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from mypy_boto3_builder.service_name import ServiceName
+
+DEFAULT_SERVICE_NAMES = ("ec2", "sagemaker")
+TRACKED_CLASSES = (
+    FakeAnnotation,
+    TypedDictAttribute,
+    Argument,
+    Attribute,
+    ImportRecord,
+    ImportString,
+)
+
+logger = get_logger()
+
+
+@dataclass
+class ServiceMemoryReport:
+    """
+    Memory usage of a parsed service package.
+    """
+
+    service_name: str
+    parse_seconds: float = 0.0
+    current_bytes: int = 0
+    peak_bytes: int = 0
+    object_count: int = 0
+    object_bytes: int = 0
+    objects: dict[str, int] = field(default_factory=dict[str, int])
+    bytes: dict[str, int] = field(default_factory=dict[str, int])
+
+
+def get_object_size(obj: object) -> int:
+    """
+    Get object size including its `__dict__` if present.
+    """
+    result = sys.getsizeof(obj)
+    obj_dict = getattr(obj, "__dict__", None)
+    if obj_dict is not None:
+        result += sys.getsizeof(obj_dict)
+    return result
+
+
+def measure_service(service_name: ServiceName) -> ServiceMemoryReport:
+    """
+    Parse service package and measure memory held by tracked objects.
+    """
+    report = ServiceMemoryReport(service_name=service_name.name)
+    gc.collect()
+    known_ids = {id(obj) for obj in gc.get_objects() if isinstance(obj, TRACKED_CLASSES)}
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    service_package = ServicePackageParser(service_name, TypesBoto3PackageData(), "1.0.0").parse()
+    report.parse_seconds = time.perf_counter() - start
+    gc.collect()
+    report.current_bytes, report.peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for obj in gc.get_objects():
+        if not isinstance(obj, TRACKED_CLASSES) or id(obj) in known_ids:
+            continue
+        class_name = obj.__class__.__name__
+        size = get_object_size(obj)
+        report.objects[class_name] = report.objects.get(class_name, 0) + 1
+        report.bytes[class_name] = report.bytes.get(class_name, 0) + size
+        report.object_count += 1
+        report.object_bytes += size
+
+    report.objects = dict(sorted(report.objects.items()))
+    report.bytes = dict(sorted(report.bytes.items()))
+    del service_package
+    return report
+
+
+def get_service_names(names: Sequence[str]) -> list[ServiceName]:
+    """
+    Get service names by their botocore names.
+    """
+    available_map = {i.name: i for i in get_available_service_names()}
+    result: list[ServiceName] = []
+    for name in names:
+        if name not in available_map:
+            logger.warning(f"Service {name} is not available, skipping")
+            continue
+        result.append(available_map[name])
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse CLI arguments.
+    """
+    parser = argparse.ArgumentParser(__file__)
+    parser.add_argument(
+        "services",
+        nargs="*",
+        default=DEFAULT_SERVICE_NAMES,
+        help=f"Service names to measure, default: {' '.join(DEFAULT_SERVICE_NAMES)}",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Save JSON report to this path")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Run main entrypoint.
+    """
+    setup_logger(name="memory_benchmark")
+    args = parse_args()
+    reports = [measure_service(i) for i in get_service_names(args.services)]
+    for report in reports:
+        logger.info(
+            f"{report.service_name}: {report.object_count} objects,"
+            f" {report.object_bytes / 1024 / 1024:.2f} MiB in objects,"
+            f" {report.current_bytes / 1024 / 1024:.2f} MiB retained,"
+            f" {report.peak_bytes / 1024 / 1024:.2f} MiB peak,"
+            f" parsed in {report.parse_seconds:.2f}s",
+        )
+        for class_name, count in report.objects.items():
+            logger.debug(
+                f"  {class_name}: {count} objects, {report.bytes[class_name] / 1024:.1f} KiB",
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps([asdict(i) for i in reports], indent=2) + "\n")
+        logger.info(f"Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -76,3 +76,12 @@ class TestImportRecord:
             "str",
             fallback=ImportRecord(ImportString("source"), "name"),
         ).is_implicit()
+
+    def test_intern(self) -> None:
+        source = ImportString("source")
+        fallback = ImportRecord(ImportString("builtins"), "object", "name")
+        import_record = ImportRecord.intern(source, "name", fallback=fallback)
+        assert import_record == ImportRecord(source, "name", fallback=fallback)
+        assert ImportRecord.intern(source, "name", fallback=fallback.copy()) is import_record
+        assert ImportRecord.intern(source, "name") is not import_record
+        assert ImportRecord.intern(source, "name", "alias") is not import_record
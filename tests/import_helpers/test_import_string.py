@@ -99,3 +99,10 @@ class TestImportString:
             assert ImportString("boto3") + ""
         with pytest.raises(StructureError):
             assert ImportString("boto3") + "test.test2"
+
+    def test_intern(self) -> None:
+        import_string = ImportString.intern("boto3", "test")
+        assert import_string == ImportString("boto3", "test")
+        assert ImportString.intern("boto3", "test") is import_string
+        assert ImportString.intern("boto3") + "test" is import_string
+        assert ImportString.intern("boto3", "other") is not import_string
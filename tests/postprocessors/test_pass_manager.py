@@ -0,0 +1,42 @@
+from unittest.mock import Mock
+
+from mypy_boto3_builder.postprocessors.pass_manager import PassManager
+from mypy_boto3_builder.structures.attribute import Attribute
+from mypy_boto3_builder.structures.class_record import ClassRecord
+from mypy_boto3_builder.structures.method import Method
+from mypy_boto3_builder.type_annotations.type import Type
+
+
+class TestPassManager:
+    def test_run(self) -> None:
+        client = ClassRecord(
+            "Client",
+            methods=[Method("method", [], Type.none)],
+            attributes=[Attribute("attr", Type.str)],
+        )
+        package = Mock()
+        package.client = client
+        package.paginators = []
+        package.waiters = []
+        package.service_resource = None
+        calls: list[str] = []
+
+        pass_manager = PassManager(package)
+        pass_manager.on_class_record("first", lambda x: calls.append(f"enter {x.name}"))
+        pass_manager.on_method("first", lambda x, y: calls.append(f"method {x.name}.{y.name}"))
+        pass_manager.on_method("second", lambda _, y: calls.append(f"method2 {y.name}"))
+        pass_manager.on_attribute("second", lambda _, y: calls.append(f"attr {y.name}"))
+        pass_manager.on_class_record_exit("second", lambda x: calls.append(f"exit {x.name}"))
+        pass_manager.on_package("third", lambda: calls.append("package"))
+        pass_manager.run()
+
+        assert calls == [
+            "enter Client",
+            "method Client.method",
+            "method2 method",
+            "attr attr",
+            "exit Client",
+            "package",
+        ]
+        assert list(pass_manager.timings) == ["first", "second", "third"]
+        assert list(pass_manager.cpu_timings) == ["first", "second", "third"]
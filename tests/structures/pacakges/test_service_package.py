@@ -3,7 +3,7 @@ from unittest.mock import Mock
 import pytest
 
 from mypy_boto3_builder.exceptions import StructureError
-from mypy_boto3_builder.package_data import Boto3StubsPackageData
+from mypy_boto3_builder.package_data import Boto3StubsPackageData, TypesAioBotocorePackageData
 from mypy_boto3_builder.service_name import ServiceNameCatalog
 from mypy_boto3_builder.structures.argument import Argument
 from mypy_boto3_builder.structures.client import Client
@@ -12,6 +12,8 @@ from mypy_boto3_builder.structures.packages.service_package import ServicePackag
 from mypy_boto3_builder.structures.paginator import Paginator
 from mypy_boto3_builder.structures.service_resource import ServiceResource
 from mypy_boto3_builder.structures.waiter import Waiter
+from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
+from mypy_boto3_builder.type_annotations.type import Type
 from mypy_boto3_builder.type_annotations.type_literal import TypeLiteral
 from mypy_boto3_builder.type_annotations.type_typed_dict import TypeTypedDict
 
@@ -153,3 +155,33 @@ class TestServicePackage:
             self.service_package.get_local_doc_link()
             == "https://youtype.github.io/boto3_stubs_docs/mypy_boto3_s3/"
         )
+
+    def test_fork(self) -> None:
+        self.service_package.helper_functions.clear()
+        service_package = self.service_package.fork(TypesAioBotocorePackageData(), "2.3.4")
+        assert service_package.name == "types_aiobotocore_s3"
+        assert service_package.version == "2.3.4"
+        assert service_package.client is not self.service_package.client
+        assert service_package.client.methods[0] is not self.service_package.client.methods[0]
+        assert service_package.type_defs == self.service_package.type_defs
+        assert service_package.type_defs is not self.service_package.type_defs
+
+        service_package.client.methods[0].is_async = True
+        assert not self.service_package.client.methods[0].is_async
+
+    def test_replace_type_annotations(self) -> None:
+        self.service_package.helper_functions.clear()
+        self.service_package.type_defs[0].add_attribute("key", Type.str, required=True)
+        service_package = self.service_package.fork(TypesAioBotocorePackageData(), "2.3.4")
+
+        def get_replacement(type_annotation: FakeAnnotation) -> FakeAnnotation | None:
+            return Type.int if type_annotation is Type.str else None
+
+        service_package.replace_type_annotations(get_replacement)
+        new_type_def = service_package.type_defs[0]
+        old_type_def = self.service_package.type_defs[0]
+        assert new_type_def is not old_type_def
+        assert isinstance(new_type_def, TypeTypedDict)
+        assert isinstance(old_type_def, TypeTypedDict)
+        assert new_type_def.children[0].type_annotation is Type.int
+        assert old_type_def.children[0].type_annotation is Type.str
@@ -68,3 +68,28 @@ class TestClassRecord:
             "from typing import Any",
             "from builtins import list as List",
         ]
+
+    def test_copy(self) -> None:
+        class_record = self.class_record.copy()
+        assert class_record is not self.class_record
+        assert class_record.name == "Name"
+        assert class_record.methods[0] is not self.class_record.methods[0]
+        assert class_record.attributes[0] is not self.class_record.attributes[0]
+        assert class_record.bases[0] is not self.class_record.bases[0]
+
+        class_record.methods.clear()
+        assert self.class_record.method_names == ["my_method"]
+
+    def test_replace_direct_type_annotations(self) -> None:
+        assert list(self.class_record.iterate_direct_type_annotations()) == [
+            Type.none,
+            Type.str,
+            Type.ListAny,
+            Type.Any,
+            Type.Any,
+        ]
+        self.class_record.replace_direct_type_annotations(
+            lambda x: Type.int if x == Type.Any else x,
+        )
+        assert self.class_record.attributes[0].type_annotation is Type.int
+        assert self.class_record.bases[0].annotation is Type.int
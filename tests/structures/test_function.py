@@ -120,3 +120,12 @@ class TestFunction:
         test_function = self.function.copy()
         test_function.remove_argument("my_str", "lst")
         assert len(test_function.arguments) == 1
+
+    def test_copy(self) -> None:
+        self.function.set_boto3_doc_link("link")
+        self.function.create_request_type_annotation("Name")
+        test_function = self.function.copy()
+        assert test_function is not self.function
+        assert test_function.arguments[1] is not self.function.arguments[1]
+        assert test_function.boto3_doc_link == "link"
+        assert test_function.request_type_annotation_name == "Name"
@@ -0,0 +1,39 @@
+import logging
+
+import pytest
+
+from mypy_boto3_builder.logger import (
+    disable_logger,
+    enable_logger,
+    get_logger,
+    is_debug_enabled,
+    setup_logger,
+)
+
+
+class TestLogger:
+    def teardown_method(self) -> None:
+        setup_logger()
+        disable_logger()
+
+    def test_is_debug_enabled(self) -> None:
+        enable_logger()
+        setup_logger(logging.DEBUG)
+        assert is_debug_enabled()
+        setup_logger(logging.INFO)
+        assert not is_debug_enabled()
+        setup_logger(logging.DEBUG)
+        disable_logger()
+        assert not is_debug_enabled()
+
+    def test_formatter(self, capsys: pytest.CaptureFixture[str]) -> None:
+        setup_logger(name="test")
+        logger = get_logger()
+        logger.debug("Plain message")
+        logger.info("Write path/to path", tags=("path", "path", ""))
+        logger.info("Write path/to path", tags="to")
+        lines = capsys.readouterr().err.splitlines()
+        assert len(lines) == 3
+        assert lines[0].endswith("| DEBUG    | test - Plain message")
+        assert lines[1].endswith("| INFO     | test - Write path/to path")
+        assert lines[2].endswith("| INFO     | test - Write path/to path")
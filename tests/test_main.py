@@ -1,9 +1,23 @@
 import sys
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from mypy_boto3_builder.main import get_selected_service_names, main
+import pytest
+
+from mypy_boto3_builder.cli_parser import CLINamespace
+from mypy_boto3_builder.enums.output_type import OutputType
+from mypy_boto3_builder.exceptions import BuildError
+from mypy_boto3_builder.main import (
+    get_build_checkpoint,
+    get_merged_service_names,
+    get_selected_service_names,
+    main,
+    report_failed_services,
+)
 from mypy_boto3_builder.service_name import ServiceName
 from mypy_boto3_builder.utils.botocore_changelog import BotocoreChangelog
+from mypy_boto3_builder.utils.service_fingerprints import ServiceFingerprints
+from mypy_boto3_builder.utils.shards import Shard, ShardManifest
 
 
 class TestMain:
@@ -37,6 +51,46 @@ class TestMain:
                 )
             ] == ["ec2", "ecs"]
 
+    def test_get_merged_service_names(self) -> None:
+        available = [ServiceName("ec2", "EC2"), ServiceName("s3", "S3"), ServiceName("sqs", "SQS")]
+        manifests = [
+            ShardManifest(
+                shard=Shard(1, 2), service_names=["sqs"], selected_service_names=["sqs", "ec2"]
+            ),
+            ShardManifest(
+                shard=Shard(2, 2), service_names=["ec2"], selected_service_names=["sqs", "ec2"]
+            ),
+        ]
+        assert [i.name for i in get_merged_service_names(manifests, available)] == ["sqs", "ec2"]
+        manifests = [ShardManifest(shard=Shard(1, 1), service_names=["sqs", "ec2"])]
+        assert [i.name for i in get_merged_service_names(manifests, available)] == ["ec2", "sqs"]
+
+    def test_get_build_checkpoint(self, tmp_path: Path) -> None:
+        args = CLINamespace(
+            log_level=0,
+            output_path=tmp_path,
+            service_names=[],
+            build_version="",
+            output_types=[OutputType.package],
+            products=[],
+            resume=True,
+        )
+        fingerprints = ServiceFingerprints({})
+        checkpoint = get_build_checkpoint(args, [ServiceName("ec2", "EC2")], fingerprints)
+        assert checkpoint
+        assert checkpoint.resume
+        for output_types in ([OutputType.wheel, OutputType.sdist], [OutputType.installed]):
+            args.output_types = output_types
+            assert get_build_checkpoint(args, [], fingerprints) is None
+
+    def test_report_failed_services(self) -> None:
+        generator = MagicMock()
+        generator.failed_services = {}
+        report_failed_services([generator])
+        generator.failed_services = {ServiceName("ec2", "EC2"): RuntimeError("ruff failed")}
+        with pytest.raises(BuildError, match="1 service packages failed"):
+            report_failed_services([generator])
+
     @patch("mypy_boto3_builder.main.get_available_service_names")
     @patch("mypy_boto3_builder.main.Boto3Generator")
     @patch.object(sys, "argv", ["-o", "/tmp", "-b", "1.2.3.post4"])  # noqa: S108
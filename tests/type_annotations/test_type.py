@@ -0,0 +1,24 @@
+from mypy_boto3_builder.type_annotations.type import Type, is_shared_subscript
+from mypy_boto3_builder.type_annotations.type_subscript import TypeSubscript
+from mypy_boto3_builder.type_annotations.type_typed_dict import TypeTypedDict
+
+
+class TestType:
+    def test_subscript(self) -> None:
+        sequence = Type.subscript(Type.Sequence, [Type.str])
+        assert sequence.render() == "Sequence[str]"
+        assert Type.subscript(Type.Sequence, [Type.str]) is sequence
+        assert is_shared_subscript(sequence)
+        assert not is_shared_subscript(sequence.copy())
+        assert not is_shared_subscript(TypeSubscript(Type.Sequence, [Type.str]))
+
+        mapping = Type.subscript(Type.Mapping, [Type.str, sequence])
+        assert Type.subscript(Type.Mapping, [Type.str, sequence]) is mapping
+        assert Type.subscript(Type.Mapping, [Type.str, sequence.copy()]) is not mapping
+
+    def test_subscript_type_def(self) -> None:
+        typed_dict = TypeTypedDict("MyTypedDict")
+        sequence = Type.subscript(Type.Sequence, [typed_dict])
+        assert sequence.render() == "Sequence[MyTypedDict]"
+        assert Type.subscript(Type.Sequence, [typed_dict]) is not sequence
+        assert not is_shared_subscript(sequence)
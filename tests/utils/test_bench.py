@@ -0,0 +1,114 @@
+import json
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mypy_boto3_builder.enums.bench_scenario import BenchScenario
+from mypy_boto3_builder.enums.product import Product
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.bench import BenchHistory, BenchResult, BenchRunner
+
+
+def get_result(scenario: str = "single", wall: float = 10.0) -> BenchResult:
+    return BenchResult(
+        scenario=scenario,
+        products=["types-boto3-services"],
+        services=5,
+        files=100,
+        wall=wall,
+        cpu=12.0,
+        peak_rss=512 * 1024 * 1024,
+        subprocesses=10,
+        builder_version="1.0.0",
+        botocore_version="1.35.0",
+        python_version="3.12.0",
+        platform="Linux",
+        cpu_count=4,
+        created="2024-01-01T00:00:00+00:00",
+    )
+
+
+class TestBench:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.history = BenchHistory(self.path / "history.jsonl")
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_result(self) -> None:
+        result = get_result()
+        assert result.services_per_second == pytest.approx(0.5)
+        assert result.files_per_second == pytest.approx(10.0)
+        assert result.to_dict()["services_per_second"] == pytest.approx(0.5)
+        assert BenchResult.from_dict(result.to_dict()) == result
+        assert result.render() == (
+            "single: 5 services in 10.0s, 0.50 services/s, 10.0 files/s,"
+            " CPU 12.0s, peak RSS 512.0M, 10 subprocesses"
+        )
+        assert "services/s (+100.0% vs 1.0.0)" in result.render(get_result(wall=20.0))
+        assert get_result(wall=0).services_per_second == 0
+
+    def test_history(self) -> None:
+        assert self.history.load() == []
+        self.history.append(get_result(wall=20.0))
+        self.history.append(get_result("all"))
+        self.history.append(get_result(wall=15.0))
+        assert len(self.history.load()) == 3
+        previous = self.history.get_previous(get_result())
+        assert previous
+        assert previous.wall == pytest.approx(15.0)
+        assert self.history.get_previous(get_result("essential")) is None
+
+    @patch("mypy_boto3_builder.utils.bench.platform")
+    @patch("mypy_boto3_builder.utils.bench.subprocess.run")
+    def test_runner(self, run_mock: MagicMock, platform_mock: MagicMock) -> None:
+        def run(cmd: list[str], **_kwargs: object) -> None:
+            report_path = Path(cmd[cmd.index("--report") + 1])
+            report_path.parent.mkdir(exist_ok=True, parents=True)
+            report_path.write_text(
+                json.dumps(
+                    {
+                        "cpu": 1.0,
+                        "peak_rss": 1024,
+                        "subprocesses": 3,
+                        "stages": {"write": {"files": 20}, "render": {"files": 0}},
+                        "services": {"": {}, "ec2": {}},
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+        run_mock.side_effect = run
+        platform_mock.platform.return_value = "Linux"
+        platform_mock.python_version.return_value = "3.12.0"
+        runner = BenchRunner(
+            [Product.types_boto3_services], self.history, cache_path=self.path / "cache"
+        )
+        results = runner.run([BenchScenario.single])
+        cmd = run_mock.call_args[0][0]
+        assert cmd[cmd.index("--services") + 1] == "ec2"
+        assert "--offline" in cmd
+        assert "--no-smart-version" in cmd
+        assert len(results) == 1
+        assert results[0].services == 1
+        assert results[0].files == 20
+        assert results[0].subprocesses == 3
+        assert results[0].peak_rss == 1024
+        assert [i.scenario for i in self.history.load()] == ["single"]
+
+        runner = BenchRunner([Product.types_boto3_services], self.history, self.path / "output")
+        runner.run_scenario(BenchScenario.essential)
+        assert (self.path / "output" / "essential.json").exists()
+
+    @patch("mypy_boto3_builder.utils.bench.subprocess.run")
+    def test_runner_failed(self, run_mock: MagicMock) -> None:
+        run_mock.side_effect = subprocess.CalledProcessError(1, "cmd")
+        runner = BenchRunner([Product.types_boto3_services], self.history)
+        with pytest.raises(BuildEnvError, match="build failed"):
+            runner.run_scenario(BenchScenario.all)
+        assert self.history.load() == []
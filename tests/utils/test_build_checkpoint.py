@@ -0,0 +1,80 @@
+import os
+import tempfile
+from pathlib import Path
+
+from mypy_boto3_builder.constants import CHECKPOINT_NAME
+from mypy_boto3_builder.utils.build_checkpoint import BuildCheckpoint
+from mypy_boto3_builder.utils.service_fingerprints import ServiceFingerprints
+
+
+class TestBuildCheckpoint:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.fingerprints = ServiceFingerprints({"s3": "s3-hash", "ec2": "ec2-hash"})
+        (self.path / "types_boto3_s3_package").mkdir()
+        (self.path / "types_boto3_ec2_package").mkdir()
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _get_checkpoint(self, *, resume: bool, options_hash: str = "hash") -> BuildCheckpoint:
+        checkpoint = BuildCheckpoint(self.path, self.fingerprints, options_hash)
+        checkpoint.start(resume=resume)
+        return checkpoint
+
+    def test_resume(self) -> None:
+        checkpoint = self._get_checkpoint(resume=False)
+        checkpoint.add_completed("types-boto3-services", "s3", "1.0.0", "types_boto3_s3_package")
+        checkpoint.add_completed("types-boto3-services", "ec2", "1.0.0", "types_boto3_ec2_package")
+        with (self.path / CHECKPOINT_NAME).open("a") as f:
+            f.write('{"product": "types-boto3-serv')
+
+        checkpoint = self._get_checkpoint(resume=True)
+        assert len(checkpoint.load()) == 2
+        entry = checkpoint.get_completed("types-boto3-services", "s3", "1.0.0")
+        assert entry
+        assert entry.fingerprint == "s3-hash"
+        assert entry.directory_name == "types_boto3_s3_package"
+        assert checkpoint.get_completed("types-boto3-services", "s3", "1.0.1") is None
+        assert checkpoint.get_completed("aiobotocore-services", "s3", "1.0.0") is None
+        assert (
+            self._get_checkpoint(resume=True, options_hash="other").get_completed(
+                "types-boto3-services", "s3", "1.0.0"
+            )
+            is None
+        )
+
+        self.fingerprints.fingerprints["ec2"] = "new-hash"
+        assert checkpoint.get_completed("types-boto3-services", "ec2", "1.0.0") is None
+
+        (self.path / "types_boto3_s3_package").rmdir()
+        assert checkpoint.get_completed("types-boto3-services", "s3", "1.0.0") is None
+
+    def test_start(self) -> None:
+        checkpoint = self._get_checkpoint(resume=False)
+        checkpoint.add_completed("types-boto3-services", "s3", "1.0.0", "types_boto3_s3_package")
+        assert checkpoint.get_completed("types-boto3-services", "s3", "1.0.0") is None
+        journal_path = self.path / CHECKPOINT_NAME
+        data = journal_path.read_text()
+
+        checkpoint = self._get_checkpoint(resume=False)
+        os.utime(journal_path, (0, 0))
+        checkpoint.add_completed("types-boto3-services", "s3", "1.0.0", "types_boto3_s3_package")
+        assert journal_path.stat().st_mtime == 0
+        assert journal_path.read_text() == data
+        assert self._get_checkpoint(resume=True).get_completed(
+            "types-boto3-services", "s3", "1.0.0"
+        )
+
+        checkpoint.add_completed("types-boto3-services", "s3", "1.0.1", "types_boto3_s3_package")
+        assert len(checkpoint.load()) == 2
+
+    def test_get_options_hash(self) -> None:
+        options_hash = BuildCheckpoint.get_options_hash({"services": ["s3"], "partial": False})
+        assert options_hash == BuildCheckpoint.get_options_hash(
+            {"partial": False, "services": ["s3"]}
+        )
+        assert options_hash != BuildCheckpoint.get_options_hash(
+            {"services": ["s3", "ec2"], "partial": False}
+        )
@@ -0,0 +1,101 @@
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mypy_boto3_builder.utils.build_report import BuildReport
+
+
+class TestBuildReport:
+    def setup_method(self) -> None:
+        BuildReport.start()
+
+    def teardown_method(self) -> None:
+        BuildReport.stop()
+
+    def test_disabled(self) -> None:
+        BuildReport.stop()
+        assert not BuildReport.is_enabled()
+        with BuildReport.service("s3"), BuildReport.stage("parse"):
+            BuildReport.add_output(10)
+        BuildReport.record("postprocess:docstrings", 1.0)
+        assert BuildReport.get_stage_totals() == {}
+
+    def test_stage(self) -> None:
+        with BuildReport.service("s3"):
+            with BuildReport.stage("parse"):
+                with BuildReport.stage("load_model"):
+                    pass
+                time.sleep(0.02)
+                BuildReport.record("postprocess:docstrings", 0.01)
+            with BuildReport.stage("write"):
+                BuildReport.add_output(10)
+                BuildReport.add_output(20)
+        with BuildReport.stage("write"):
+            BuildReport.add_output(5)
+
+        totals = BuildReport.get_stage_totals()
+        assert totals["postprocess:docstrings"].wall == pytest.approx(0.01)
+        assert totals["parse"].calls == 1
+        assert 0 < totals["parse"].wall < 1.0
+        assert totals["write"].calls == 2
+        assert totals["write"].files == 3
+        assert totals["write"].bytes == 35
+
+        data = BuildReport.to_dict()
+        assert sorted(data["services"]) == ["", "s3"]
+        assert data["services"]["s3"]["files"] == 2
+        assert data["services"]["s3"]["bytes"] == 30
+        assert sorted(data["services"]["s3"]["stages"]) == [
+            "load_model",
+            "parse",
+            "postprocess:docstrings",
+            "write",
+        ]
+
+    def test_threads(self) -> None:
+        def work() -> None:
+            with BuildReport.service("sqs"), BuildReport.stage("render"):
+                BuildReport.add_output(1)
+
+        with BuildReport.service("s3"):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        data = BuildReport.to_dict()
+        assert list(data["services"]) == ["sqs"]
+
+    def test_save(self) -> None:
+        with BuildReport.service("s3"), BuildReport.stage("parse"):
+            BuildReport.add_subprocess()
+        with tempfile.TemporaryDirectory() as dir_name:
+            path = Path(dir_name) / "reports" / "run.json"
+            BuildReport.save(path)
+            data = json.loads(path.read_text())
+        assert data["stages"]["parse"]["calls"] == 1
+        assert data["services"]["s3"]["stages"]["parse"]["calls"] == 1
+        assert data["wall"] >= 0
+        assert data["subprocesses"] == 1
+
+    def test_trace_memory(self) -> None:
+        BuildReport.start(trace_memory=True)
+        data: list[bytes] = []
+        with BuildReport.service("s3"), BuildReport.stage("parse"):
+            with BuildReport.stage("load_model"):
+                data.append(bytes(1024 * 1024))
+            temp = bytes(4 * 1024 * 1024)
+            del temp
+
+        totals = BuildReport.get_stage_totals()
+        assert totals["load_model"].retained_memory >= 1024 * 1024
+        assert totals["parse"].retained_memory < 1024 * 1024
+        assert totals["parse"].peak_memory >= 4 * 1024 * 1024
+        service_data = BuildReport.to_dict()["services"]["s3"]
+        assert service_data["peak_memory"] >= 4 * 1024 * 1024
+        assert service_data["retained_memory"] >= 1024 * 1024
+        assert service_data["rss"] > 0
+        assert "peak_memory" in service_data["stages"]["parse"]
@@ -0,0 +1,34 @@
+import tempfile
+from pathlib import Path
+
+from mypy_boto3_builder.utils.content_store import ContentStore
+
+
+class TestContentStore:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.store = ContentStore(self.path / "store")
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_add(self) -> None:
+        object_path = self.store.add(b"data")
+        assert object_path.read_bytes() == b"data"
+        assert object_path.stat().st_mode & 0o777 == ContentStore.OBJECT_MODE
+        assert self.store.add(b"data") == object_path
+        assert self.store.find(b"data") == object_path
+        assert self.store.find(b"other") is None
+        assert ContentStore(self.store.path).find(b"data") is None
+
+    def test_link(self) -> None:
+        object_path = self.store.add(b"data")
+        target_path = self.path / "target.pyi"
+        self.store.link(object_path, target_path)
+        assert target_path.read_bytes() == b"data"
+        assert target_path.samefile(object_path)
+
+    def test_get_archive_path(self) -> None:
+        assert self.store.get_archive_path(b"new") != self.store.get_archive_path(b"old")
+        assert self.store.get_archive_path(b"new") == self.store.get_archive_path(b"new")
@@ -0,0 +1,81 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from mypy_boto3_builder.service_name import ServiceName
+from mypy_boto3_builder.utils.cost_model import (
+    CostModel,
+    CostProgress,
+    format_duration,
+    get_service_cost,
+)
+
+UNITS = {"ec2": 100, "s3": 60, "sqs": 30, "sns": 30}
+
+
+def get_units(service_name: ServiceName) -> int:
+    return UNITS[service_name.name]
+
+
+class TestCostModel:
+    def setup_method(self) -> None:
+        self.service_names = [ServiceName(name, name.capitalize()) for name in sorted(UNITS)]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "timings.json"
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    @patch("mypy_boto3_builder.utils.cost_model.get_botocore_session")
+    def test_get_service_cost(self, get_botocore_session_mock: MagicMock) -> None:
+        get_botocore_session_mock().get_service_data.return_value = {
+            "operations": {"a": {}, "b": {}},
+            "shapes": {"c": {}},
+        }
+        assert get_service_cost(ServiceName("s3", "S3")) == 3
+
+    def test_format_duration(self) -> None:
+        assert format_duration(42.4) == "42s"
+        assert format_duration(65) == "1m05s"
+        assert format_duration(3720) == "1h02m"
+
+    @patch("mypy_boto3_builder.utils.cost_model.get_service_cost", get_units)
+    def test_sort(self) -> None:
+        model = CostModel()
+        assert [i.name for i in model.sort(self.service_names)] == ["ec2", "s3", "sns", "sqs"]
+
+        model.record(self.service_names[0], 10.0)
+        model.record(self.service_names[3], 20.0)
+        assert [i.name for i in model.sort(self.service_names)] == ["sqs", "s3", "ec2", "sns"]
+
+    @patch("mypy_boto3_builder.utils.cost_model.get_service_cost", get_units)
+    def test_get_costs(self) -> None:
+        model = CostModel({"s3": 6.0})
+        costs = {k.name: v for k, v in model.get_costs(self.service_names).items()}
+        assert costs == {"ec2": 10.0, "s3": 6.0, "sns": 3.0, "sqs": 3.0}
+        assert not model.get_progress(self.service_names[:1]).calibrated
+        assert model.get_progress(self.service_names).calibrated
+
+    def test_save_load(self) -> None:
+        CostModel().save()
+        assert CostModel.load(self.path).timings == {}
+
+        model = CostModel.load(self.path)
+        model.record(self.service_names[0], 1.23456)
+        model.save()
+        assert json.loads(self.path.read_text()) == {"services": {"ec2": 1.235}}
+        assert CostModel.load(self.path).timings == {"ec2": 1.235}
+
+    def test_progress(self) -> None:
+        progress = CostProgress({"ec2": 30.0, "s3": 10.0}, calibrated=True)
+        assert progress.start() == "[  0% ETA 40s]"
+        progress.finish("ec2")
+        progress.finish("ec2")
+        assert progress.start().startswith("[ 75% ETA ")
+
+        progress = CostProgress({"ec2": 30.0}, calibrated=False)
+        assert progress.start() == "[  0%]"
+        assert progress.get_eta() is None
+        progress.finish("ec2")
+        assert progress.start() == "[100% ETA 0s]"
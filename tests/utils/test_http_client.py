@@ -0,0 +1,147 @@
+import tempfile
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.http_client import HTTPClient, HTTPResponse
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    etag: ClassVar[str] = '"v1"'
+    body: ClassVar[bytes] = b"data"
+    requests: ClassVar[list[tuple[str, str | None]]] = []
+
+    def do_GET(self) -> None:
+        if_none_match = self.headers.get("If-None-Match")
+        self.requests.append((self.path, if_none_match))
+        if self.path == "/missing":
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if if_none_match == self.etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@contextmanager
+def serve() -> Generator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestHTTPClient:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.tmp_dir.name)
+        RequestHandler.etag = '"v1"'
+        RequestHandler.body = b"data"
+        RequestHandler.requests = []
+        HTTPClient.configure(self.cache_path)
+
+    def teardown_method(self) -> None:
+        HTTPClient.cancel_prefetch()
+        HTTPClient.configure(None)
+        self.tmp_dir.cleanup()
+
+    def test_get(self) -> None:
+        with serve() as root:
+            response = HTTPClient().get(f"{root}/file")
+            assert response.ok
+            assert response.text == "data"
+            assert not response.from_cache
+
+            response = HTTPClient().get(f"{root}/file")
+            assert response.text == "data"
+            assert response.from_cache
+
+            RequestHandler.etag = '"v2"'
+            RequestHandler.body = b"new"
+            response = HTTPClient().get(f"{root}/file")
+            assert response.text == "new"
+            assert not response.from_cache
+
+            response = HTTPClient().get(f"{root}/missing")
+            assert not response.ok
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+        assert RequestHandler.requests == [
+            ("/file", None),
+            ("/file", '"v1"'),
+            ("/file", '"v1"'),
+            ("/missing", None),
+        ]
+
+    def test_get_no_cache(self) -> None:
+        HTTPClient.configure(None)
+        with serve() as root:
+            assert HTTPClient().get(f"{root}/file").text == "data"
+            assert HTTPClient().get(f"{root}/file").text == "data"
+
+        assert RequestHandler.requests == [("/file", None), ("/file", None)]
+        assert not list(self.cache_path.iterdir())
+
+    def test_get_offline(self) -> None:
+        with serve() as root:
+            HTTPClient().get(f"{root}/file")
+            HTTPClient().get(f"{root}/missing")
+            HTTPClient.configure(self.cache_path, offline=True)
+            assert HTTPClient().get(f"{root}/file").text == "data"
+            assert HTTPClient().get(f"{root}/missing").status_code == HTTPStatus.NOT_FOUND
+            with pytest.raises(BuildEnvError):
+                HTTPClient().get(f"{root}/other")
+
+        assert len(RequestHandler.requests) == 2
+
+    def test_get_unreachable(self) -> None:
+        with serve() as root:
+            HTTPClient().get(f"{root}/file")
+
+        response = HTTPClient().get(f"{root}/file", timeout=5)
+        assert response.text == "data"
+        assert response.from_cache
+        with pytest.raises(BuildEnvError):
+            HTTPClient().get(f"{root}/other", timeout=5)
+
+    def test_prefetch(self) -> None:
+        with serve() as root:
+            client = HTTPClient()
+            client.prefetch([f"{root}/file", f"{root}/missing", f"{root}/file"])
+            assert client.get(f"{root}/file").text == "data"
+            assert client.get(f"{root}/missing").status_code == HTTPStatus.NOT_FOUND
+            assert sorted(RequestHandler.requests) == [("/file", None), ("/missing", None)]
+
+            assert client.get(f"{root}/file").from_cache
+            assert len(RequestHandler.requests) == 3
+
+            client.prefetch([f"{root}/other"])
+            HTTPClient.cancel_prefetch()
+            client.get(f"{root}/other")
+
+    def test_json(self) -> None:
+        response = HTTPResponse(url="url", status_code=HTTPStatus.OK, content=b'{"key": 1}')
+        assert response.json() == {"key": 1}
+        with pytest.raises(BuildEnvError):
+            HTTPResponse(url="url", status_code=HTTPStatus.OK, content=b"[1]").json()
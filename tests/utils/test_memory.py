@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mypy_boto3_builder.utils.memory import (
+    MemoryBudget,
+    format_memory_size,
+    get_peak_rss,
+    get_rss,
+    parse_memory_size,
+)
+
+
+class TestMemory:
+    def teardown_method(self) -> None:
+        MemoryBudget.configure(None)
+        MemoryBudget._release_callbacks.clear()
+
+    def test_parse_memory_size(self) -> None:
+        assert parse_memory_size("100") == 100
+        assert parse_memory_size("512M") == 512 * 1024**2
+        assert parse_memory_size("4GiB") == 4 * 1024**3
+        assert parse_memory_size("1.5g") == int(1.5 * 1024**3)
+        with pytest.raises(ValueError, match="Invalid memory size"):
+            parse_memory_size("4X")
+
+    def test_format_memory_size(self) -> None:
+        assert format_memory_size(100) == "100B"
+        assert format_memory_size(1536 * 1024) == "1.5M"
+        assert format_memory_size(4 * 1024**3) == "4.0G"
+        assert parse_memory_size(format_memory_size(4 * 1024**3)) == 4 * 1024**3
+
+    def test_get_rss(self) -> None:
+        assert get_rss() > 0
+        assert get_peak_rss() > 0
+
+    @patch("mypy_boto3_builder.utils.memory.get_rss")
+    def test_budget(self, get_rss_mock: MagicMock) -> None:
+        callback = MagicMock()
+        MemoryBudget.on_release(callback)
+        MemoryBudget.on_release(callback)
+        get_rss_mock.return_value = 95
+        assert not MemoryBudget.is_enabled()
+        assert not MemoryBudget.check()
+        callback.assert_not_called()
+
+        MemoryBudget.configure(100)
+        assert MemoryBudget.is_enabled()
+        assert MemoryBudget.is_exceeded()
+        assert MemoryBudget.check()
+        callback.assert_called_once_with()
+
+        get_rss_mock.return_value = 50
+        assert not MemoryBudget.check()
+        callback.assert_called_once_with()
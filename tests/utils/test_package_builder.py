@@ -0,0 +1,131 @@
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+from packaging.metadata import Metadata
+
+from mypy_boto3_builder.utils.package_builder import PackageBuilder, PackageMetadata
+from mypy_boto3_builder.writers.sinks.directory import DirectorySink
+from mypy_boto3_builder.writers.sinks.memory import MemorySink
+
+SETUP_PY = """
+from setuptools import setup
+
+setup(
+    name="types-my-package",
+    version="1.2.3",
+    description="Type annotations",
+    license="MIT License",
+    install_requires=["typing-extensions"],
+    extras_require={"full": ["types-full"]},
+    packages=["my_package"],
+    package_data={"my_package": ["py.typed", "*.pyi", "*/*.pyi"]},
+    long_description_content_type="text/markdown",
+)
+"""
+
+
+class TestPackageBuilder:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.sink = DirectorySink()
+        self.package_path = Path(self.tmp_dir.name) / "package"
+        module_path = self.package_path / "my_package"
+        module_path.mkdir(parents=True)
+        (self.package_path / "setup.py").write_text(SETUP_PY)
+        (self.package_path / "README.md").write_text("# Readme\n")
+        (self.package_path / "LICENSE").write_text("MIT\n")
+        (module_path / "__init__.pyi").write_text("x: int\n")
+        (module_path / "client.pyi").write_text("y: str\n")
+        (module_path / "py.typed").write_text("")
+        (module_path / "skipped.txt").write_text("")
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_metadata(self) -> None:
+        metadata = PackageMetadata.from_setup_py(self.sink, self.package_path)
+        assert metadata.name == "types-my-package"
+        assert metadata.distribution_name == "types_my_package"
+        assert list(metadata.iterate_requires_dist()) == [
+            "typing-extensions",
+            'types-full; extra == "full"',
+        ]
+        rendered = metadata.render()
+        assert rendered.startswith("Metadata-Version: 2.4\nName: types-my-package\n")
+        assert "Provides-Extra: full\n" in rendered
+        assert "License-File: LICENSE\n" in rendered
+        assert rendered.endswith("\n\n# Readme\n")
+        Metadata.from_email(rendered, validate=True)
+
+        (self.package_path / "LICENSE").unlink()
+        metadata = PackageMetadata.from_setup_py(self.sink, self.package_path)
+        assert metadata.license_files == []
+        assert "License-File" not in metadata.render()
+
+    def test_build_wheel(self) -> None:
+        metadata = PackageMetadata.from_setup_py(self.sink, self.package_path)
+        builder = PackageBuilder(self.package_path, Path(self.tmp_dir.name))
+        wheel_path = builder.build_wheel(self.package_path, metadata)
+        assert wheel_path.name == "types_my_package-1.2.3-py3-none-any.whl"
+        with zipfile.ZipFile(wheel_path) as archive:
+            names = archive.namelist()
+            record = archive.read("types_my_package-1.2.3.dist-info/RECORD").decode()
+        assert names == [
+            "my_package/__init__.pyi",
+            "my_package/client.pyi",
+            "my_package/py.typed",
+            "types_my_package-1.2.3.dist-info/licenses/LICENSE",
+            "types_my_package-1.2.3.dist-info/METADATA",
+            "types_my_package-1.2.3.dist-info/WHEEL",
+            "types_my_package-1.2.3.dist-info/top_level.txt",
+            "types_my_package-1.2.3.dist-info/RECORD",
+        ]
+        assert "my_package/__init__.pyi,sha256=" in record
+        assert record.endswith("types_my_package-1.2.3.dist-info/RECORD,,\n")
+
+        data = wheel_path.read_bytes()
+        wheel_path.unlink()
+        assert builder.build_wheel(self.package_path, metadata).read_bytes() == data
+
+    def test_build_sdist(self) -> None:
+        metadata = PackageMetadata.from_setup_py(self.sink, self.package_path)
+        builder = PackageBuilder(self.package_path, Path(self.tmp_dir.name))
+        sdist_path = builder.build_sdist(self.package_path, metadata)
+        assert sdist_path.name == "types_my_package-1.2.3.tar.gz"
+        with tarfile.open(sdist_path) as archive:
+            names = archive.getnames()
+        assert names == [
+            "types_my_package-1.2.3/LICENSE",
+            "types_my_package-1.2.3/PKG-INFO",
+            "types_my_package-1.2.3/README.md",
+            "types_my_package-1.2.3/my_package/__init__.pyi",
+            "types_my_package-1.2.3/my_package/client.pyi",
+            "types_my_package-1.2.3/my_package/py.typed",
+            "types_my_package-1.2.3/setup.py",
+        ]
+
+        data = sdist_path.read_bytes()
+        sdist_path.unlink()
+        assert builder.build_sdist(self.package_path, metadata).read_bytes() == data
+
+    def test_build_from_memory(self) -> None:
+        sink = MemorySink()
+        for path in self.sink.iterate_files(self.package_path):
+            sink.write_bytes(path, path.read_bytes())
+        sink.write_text(self.package_path / "my_package" / "sub" / "module.pyi", "z: int\n")
+        sink.write_text(self.package_path / "my_package" / "sub" / "deep" / "module.pyi", "")
+        output_path = Path(self.tmp_dir.name)
+        builder = PackageBuilder(self.package_path, output_path, sink=sink)
+        metadata = PackageMetadata.from_setup_py(sink, self.package_path)
+        wheel_path = builder.build_wheel(self.package_path, metadata)
+        assert wheel_path.parent == output_path
+        with zipfile.ZipFile(wheel_path) as archive:
+            names = archive.namelist()
+        assert names[:4] == [
+            "my_package/__init__.pyi",
+            "my_package/client.pyi",
+            "my_package/py.typed",
+            "my_package/sub/module.pyi",
+        ]
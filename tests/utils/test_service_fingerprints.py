@@ -0,0 +1,75 @@
+import gzip
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from mypy_boto3_builder.constants import SERVICE_FINGERPRINTS_NAME
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.service_fingerprints import ServiceFingerprints
+
+
+class TestServiceFingerprints:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.data_path = self.path / "botocore" / "data"
+        self._write_model("s3", "2006-03-01", "service-2.json.gz", b"s3")
+        self._write_model("s3", "2006-03-01", "examples-1.json", b"examples")
+        self._write_model("ec2", "2016-11-15", "service-2.json.gz", b"ec2")
+        self._write_model("ec2", "2016-11-15", "waiters-2.json", b"waiters")
+        (self.data_path / "endpoints.json").write_text("{}")
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _write_model(self, service_name: str, version: str, name: str, data: bytes) -> None:
+        path = self.data_path / service_name / version / name
+        path.parent.mkdir(exist_ok=True, parents=True)
+        path.write_bytes(gzip.compress(data) if name.endswith(".gz") else data)
+
+    def _get_fingerprints(self) -> ServiceFingerprints:
+        return ServiceFingerprints.from_data_paths({"botocore": self.data_path})
+
+    def test_from_data_paths(self) -> None:
+        fingerprints = self._get_fingerprints()
+        assert list(fingerprints.fingerprints) == ["ec2", "s3"]
+        assert fingerprints.library_names == ("botocore",)
+        assert fingerprints.fingerprints == self._get_fingerprints().fingerprints
+
+    def test_get_updated(self) -> None:
+        previous = self._get_fingerprints()
+        self._write_model("s3", "2006-03-01", "examples-1.json", b"new examples")
+        assert self._get_fingerprints().get_updated(previous) == []
+
+        self._write_model("ec2", "2016-11-15", "waiters-2.json", b"new waiters")
+        self._write_model("sqs", "2012-11-05", "service-2.json.gz", b"sqs")
+        self._write_model("s3", "2006-03-01", "service-2.json.gz", b"s3")
+        assert self._get_fingerprints().get_updated(previous) == ["ec2", "sqs"]
+
+        self._write_model("s3", "2020-01-01", "service-2.json.gz", b"s3 v2")
+        assert self._get_fingerprints().get_updated(previous) == ["ec2", "s3", "sqs"]
+
+    def test_save_load(self) -> None:
+        fingerprints = self._get_fingerprints()
+        fingerprints.save(self.path)
+        manifest_path = self.path / SERVICE_FINGERPRINTS_NAME
+        assert manifest_path.exists()
+        os.utime(manifest_path, (0, 0))
+        fingerprints.save(self.path)
+        assert manifest_path.stat().st_mtime == 0
+
+        loaded = ServiceFingerprints.load(self.path)
+        assert loaded.fingerprints == fingerprints.fingerprints
+        assert loaded.library_names == ("botocore",)
+        assert ServiceFingerprints.load(self.data_path).fingerprints == fingerprints.fingerprints
+        with pytest.raises(BuildEnvError):
+            ServiceFingerprints.load(self.path / "missing.json")
+
+    def test_update(self) -> None:
+        manifest = ServiceFingerprints({"s3": "old", "sqs": "old"})
+        manifest.update(self._get_fingerprints(), ["s3", "ec2", "missing"])
+        assert manifest.fingerprints["sqs"] == "old"
+        assert manifest.fingerprints["s3"] != "old"
+        assert sorted(manifest.fingerprints) == ["ec2", "s3", "sqs"]
@@ -0,0 +1,74 @@
+import json
+import pstats
+import tempfile
+import time
+from pathlib import Path
+
+from mypy_boto3_builder.enums.profile_mode import ProfileMode
+from mypy_boto3_builder.utils.service_profiler import ServiceProfiler
+
+
+def busy_work(seconds: float) -> int:
+    result = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        result += 1
+    return result
+
+
+class TestServiceProfiler:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+
+    def teardown_method(self) -> None:
+        ServiceProfiler.stop()
+        self.tmp_dir.cleanup()
+
+    def test_disabled(self) -> None:
+        assert not ServiceProfiler.is_enabled()
+        with ServiceProfiler.service("s3"):
+            busy_work(0.001)
+        ServiceProfiler.stop()
+        assert not list(self.path.iterdir())
+
+    def test_sampling(self) -> None:
+        ServiceProfiler.start(self.path, ProfileMode.sampling, interval=0.001)
+        assert ServiceProfiler.is_enabled()
+        with ServiceProfiler.service("s3"):
+            busy_work(0.1)
+        with ServiceProfiler.service("sqs"), ServiceProfiler.service("sqs"):
+            busy_work(0.1)
+        ServiceProfiler.stop()
+        assert not ServiceProfiler.is_enabled()
+
+        assert sorted(i.name for i in self.path.iterdir()) == [
+            "all.collapsed",
+            "all.speedscope.json",
+            "s3.collapsed",
+            "s3.speedscope.json",
+            "sqs.collapsed",
+            "sqs.speedscope.json",
+        ]
+        line = (self.path / "s3.collapsed").read_text().splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert "busy_work (tests/utils/test_service_profiler.py:" in stack
+
+        data = json.loads((self.path / "all.speedscope.json").read_text())
+        assert data["profiles"][0]["type"] == "sampled"
+        assert data["profiles"][0]["name"] == "all"
+        frame_names = [frame["name"] for frame in data["shared"]["frames"]]
+        assert "busy_work" in frame_names
+
+    def test_cprofile(self) -> None:
+        ServiceProfiler.start(self.path, ProfileMode.cprofile)
+        with ServiceProfiler.service("s3"):
+            busy_work(0.01)
+            with ServiceProfiler.service("sqs"):
+                busy_work(0.01)
+        ServiceProfiler.stop()
+
+        assert sorted(i.name for i in self.path.iterdir()) == ["all.prof", "s3.prof", "sqs.prof"]
+        stats = pstats.Stats((self.path / "all.prof").as_posix())
+        assert any(function_name == "busy_work" for _, _, function_name in stats.stats)
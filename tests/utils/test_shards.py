@@ -0,0 +1,116 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from mypy_boto3_builder.constants import SHARD_MANIFEST_NAME
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.service_name import ServiceName
+from mypy_boto3_builder.utils.install_requires import InstallRequiresItem
+from mypy_boto3_builder.utils.shards import (
+    Shard,
+    ShardFullPackage,
+    ShardManifest,
+    ShardProduct,
+    get_shard_service_names,
+    split_service_names,
+)
+
+COSTS = {"ec2": 100, "s3": 60, "sqs": 30, "sns": 30, "lambda": 20, "iam": 10}
+
+
+def get_cost(service_name: ServiceName) -> int:
+    return COSTS[service_name.name]
+
+
+class TestShards:
+    def setup_method(self) -> None:
+        self.service_names = [ServiceName(name, name.capitalize()) for name in sorted(COSTS)]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_shard(self) -> None:
+        assert Shard.parse("2/3") == Shard(2, 3)
+        assert str(Shard(2, 3)) == "2/3"
+        with pytest.raises(ValueError, match="expected K/N"):
+            Shard.parse("2")
+        with pytest.raises(ValueError, match="expected K/N"):
+            Shard.parse("4/3")
+        with pytest.raises(ValueError, match="expected K/N"):
+            Shard.parse("0/3")
+
+    def test_split_service_names(self) -> None:
+        shards = split_service_names(self.service_names, 2, get_cost)
+        assert [[i.name for i in shard] for shard in shards] == [
+            ["ec2", "iam", "lambda"],
+            ["s3", "sns", "sqs"],
+        ]
+        assert split_service_names(list(reversed(self.service_names)), 2, get_cost)[0] == list(
+            reversed(shards[0])
+        )
+        assert sorted(i.name for shard in shards for i in shard) == sorted(COSTS)
+
+        shards = split_service_names(self.service_names, 8, get_cost)
+        assert len(shards) == 8
+        assert [len(shard) for shard in shards] == [1, 1, 1, 1, 1, 1, 0, 0]
+
+    def test_get_shard_service_names(self) -> None:
+        result = get_shard_service_names(self.service_names, Shard(2, 3), get_cost)
+        assert [i.name for i in result] == ["lambda", "s3"]
+
+    def test_save_load(self) -> None:
+        product = ShardProduct(
+            package_directories=["types_boto3_s3_package"],
+            full_packages={
+                "types_boto3_full_package": ShardFullPackage(
+                    service_directories=["types_boto3_s3"],
+                    install_requires=[
+                        {"name": "typing-extensions", "drop_python_version": "3.12"},
+                    ],
+                ),
+            },
+        )
+        manifest = ShardManifest(
+            shard=Shard(1, 2),
+            service_names=["s3"],
+            products={"types-boto3-services": product},
+            selected_service_names=["sqs", "s3"],
+        )
+        manifest.save(self.path)
+        assert (self.path / SHARD_MANIFEST_NAME).exists()
+
+        loaded = ShardManifest.load(self.path)
+        assert loaded.shard == Shard(1, 2)
+        assert loaded.service_names == ["s3"]
+        assert loaded.selected_service_names == ["sqs", "s3"]
+        assert loaded.output_path == self.path
+        assert loaded.get_product("types-boto3-services") == product
+        assert loaded.get_product("types-boto3-services").full_packages[
+            "types_boto3_full_package"
+        ].get_install_requires() == [
+            InstallRequiresItem(name="typing-extensions", drop_python_version="3.12"),
+        ]
+        with pytest.raises(BuildEnvError):
+            loaded.get_product("types-boto3-full")
+        with pytest.raises(BuildEnvError):
+            ShardManifest.load(self.path / "missing")
+
+    def test_load_all(self) -> None:
+        paths = [self.path / "1", self.path / "2"]
+        for index, path in enumerate(paths):
+            path.mkdir()
+            ShardManifest(shard=Shard(index + 1, 2)).save(path)
+
+        manifests = ShardManifest.load_all(reversed(paths))
+        assert [i.shard.index for i in manifests] == [1, 2]
+        with pytest.raises(BuildEnvError):
+            ShardManifest.load_all(paths[:1])
+        with pytest.raises(BuildEnvError):
+            ShardManifest.load_all([])
+
+        ShardManifest(shard=Shard(2, 3)).save(paths[1])
+        with pytest.raises(BuildEnvError):
+            ShardManifest.load_all(paths)
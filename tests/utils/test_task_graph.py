@@ -0,0 +1,140 @@
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mypy_boto3_builder.enums.resource_class import ResourceClass
+from mypy_boto3_builder.enums.task_status import TaskStatus
+from mypy_boto3_builder.exceptions import BuildInternalError
+from mypy_boto3_builder.utils.task_graph import TaskGraph
+
+
+def add(*values: int) -> int:
+    return sum(values)
+
+
+def fail() -> None:
+    raise ValueError("fail")
+
+
+class TestTaskGraph:
+    def test_run(self) -> None:
+        graph = TaskGraph("test")
+        first = graph.add("first", add, 1, 2)
+        second = graph.add("second", add, 10, dependencies=[first], keep_result=True)
+        third = graph.add(
+            "third", add, dependencies=[first, second], resource_class=ResourceClass.io
+        )
+        graph.run()
+        assert second.result == 13
+        assert third.result == 16
+        assert first.result is None
+        assert all(task.status == TaskStatus.done for task in graph.tasks)
+        assert all(task.worker for task in graph.tasks)
+        assert first.finished <= second.started
+        assert "3 tasks in" in graph.get_summary()
+
+    def test_add(self) -> None:
+        graph = TaskGraph("test")
+        task = graph.add("task", add)
+        with pytest.raises(BuildInternalError):
+            graph.add("task", add)
+        with pytest.raises(BuildInternalError):
+            TaskGraph("other").add("other", add, dependencies=[task])
+
+    def test_run_order(self) -> None:
+        order: list[str] = []
+        lock = threading.Lock()
+
+        def record(name: str, *_args: object) -> str:
+            with lock:
+                order.append(name)
+            return name
+
+        graph = TaskGraph("test", max_workers={ResourceClass.cpu: 1, ResourceClass.io: 1})
+        for index in range(3):
+            parse = graph.add(f"parse:{index}", record, f"parse:{index}")
+            graph.add(f"render:{index}", record, f"render:{index}", dependencies=[parse])
+        graph.run()
+        assert order[:3] == ["parse:0", "render:0", "parse:1"]
+
+    def test_run_parallel(self) -> None:
+        graph = TaskGraph("test", max_workers={ResourceClass.subprocess: 4})
+        for index in range(4):
+            graph.add(f"sleep:{index}", time.sleep, 0.2, resource_class=ResourceClass.subprocess)
+        graph.run()
+        assert graph.finished - graph.started < 0.6
+
+    def test_run_throttle(self) -> None:
+        running: list[str] = []
+        max_running: list[int] = []
+        lock = threading.Lock()
+
+        def work(name: str) -> None:
+            with lock:
+                running.append(name)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(name)
+
+        graph = TaskGraph("test", max_workers={ResourceClass.cpu: 4}, throttle=lambda: True)
+        for index in range(3):
+            graph.add(f"work:{index}", work, f"work:{index}")
+        graph.run()
+        assert max(max_running) == 1
+
+    def test_run_failed(self) -> None:
+        graph = TaskGraph("test", max_workers={ResourceClass.cpu: 1})
+        failed = graph.add("fail", fail)
+        skipped = graph.add("skipped", add, dependencies=[failed])
+        with pytest.raises(ValueError, match="fail"):
+            graph.run()
+        assert failed.status == TaskStatus.failed
+        assert skipped.status == TaskStatus.cancelled
+
+    def test_run_keep_going(self) -> None:
+        graph = TaskGraph("test", max_workers={ResourceClass.cpu: 1}, keep_going=True)
+        first = graph.add("first", add, 1, keep_result=True)
+        failed = graph.add("fail", fail)
+        skipped = graph.add("skipped", add, dependencies=[first, failed])
+        other = graph.add("other", add, 2, keep_result=True)
+        graph.run()
+        assert first.status == TaskStatus.done
+        assert failed.status == TaskStatus.failed
+        assert isinstance(failed.error, ValueError)
+        assert skipped.status == TaskStatus.cancelled
+        assert other.status == TaskStatus.done
+        assert other.result == 2
+        assert [i["error"] for i in graph.to_dict()["tasks"]] == [None, "fail", None, None]
+
+    def test_run_processes(self) -> None:
+        graph = TaskGraph("test", max_workers={ResourceClass.cpu: 2}, use_processes=True)
+        first = graph.add("first", add, 1, 2)
+        second = graph.add("second", add, 3, dependencies=[first])
+        graph.run()
+        assert second.result == 6
+        assert first.worker
+        assert second.worker
+
+    def test_dump(self) -> None:
+        graph = TaskGraph("test")
+        first = graph.add("first", add, 1)
+        graph.add("second", add, dependencies=[first], resource_class=ResourceClass.io)
+        graph.run()
+        with tempfile.TemporaryDirectory() as dir_name:
+            json_path = Path(dir_name) / "graph.json"
+            graph.dump(json_path)
+            data = json.loads(json_path.read_text())
+            assert data["name"] == "test"
+            assert [i["name"] for i in data["tasks"]] == ["first", "second"]
+            assert data["tasks"][1]["dependencies"] == ["first"]
+            assert data["tasks"][1]["resource_class"] == "io"
+            assert data["tasks"][1]["start"] >= 0
+
+            dot_path = Path(dir_name) / "graph.dot"
+            graph.dump(dot_path)
+            assert '"first" -> "second";' in dot_path.read_text()
@@ -0,0 +1,46 @@
+from mypy_boto3_builder.type_annotations.type import Type
+from mypy_boto3_builder.type_annotations.type_literal import TypeLiteral
+from mypy_boto3_builder.type_annotations.type_subscript import TypeSubscript
+from mypy_boto3_builder.type_annotations.type_typed_dict import TypeTypedDict
+from mypy_boto3_builder.type_annotations.type_union import TypeUnion
+from mypy_boto3_builder.utils.type_iterator import TypeIterator
+
+
+class TestTypeIterator:
+    def setup_method(self) -> None:
+        self.literal = TypeLiteral("MyLiteral", ["a", "b"])
+        self.typed_dict = TypeTypedDict("MyTypedDict")
+        self.typed_dict.add_attribute("key", self.literal, required=True)
+        self.typed_dict.add_attribute(
+            "child",
+            TypeSubscript(Type.List, [self.typed_dict]),
+            required=False,
+        )
+        self.union = TypeUnion([Type.str, self.typed_dict], name="MyUnion")
+
+    def test_iter(self) -> None:
+        root = TypeSubscript(Type.Dict, [Type.str, TypeSubscript(Type.List, [Type.str])])
+        assert list(root.iterate_types()) == [Type.Dict, Type.str, Type.List, Type.str]
+        assert list(TypeIterator([root])) == [Type.Dict, Type.str, Type.List]
+        assert list(TypeIterator([root, Type.int, root])) == [
+            Type.Dict,
+            Type.str,
+            Type.List,
+            Type.int,
+        ]
+
+    def test_iter_deep(self) -> None:
+        assert list(TypeIterator([self.union])) == [self.union]
+        assert list(TypeIterator([self.union], deep=True)) == [
+            self.union,
+            Type.str,
+            self.typed_dict,
+            self.literal,
+            Type.List,
+        ]
+
+    def test_filter(self) -> None:
+        root = TypeSubscript(Type.List, [self.union])
+        assert list(TypeIterator([root]).filter(TypeLiteral)) == []
+        assert list(TypeIterator([root], deep=True).filter(TypeLiteral)) == [self.literal]
+        assert list(TypeIterator([root], deep=True).filter(TypeTypedDict)) == [self.typed_dict]
@@ -0,0 +1,52 @@
+from mypy_boto3_builder.type_annotations.fake_annotation import FakeAnnotation
+from mypy_boto3_builder.type_annotations.type import Type
+from mypy_boto3_builder.type_annotations.type_subscript import TypeSubscript
+from mypy_boto3_builder.type_annotations.type_typed_dict import TypeTypedDict
+from mypy_boto3_builder.utils.type_replacer import TypeReplacer
+
+
+def _replace_str(type_annotation: FakeAnnotation) -> FakeAnnotation | None:
+    if type_annotation is Type.str:
+        return Type.int
+    return None
+
+
+class TestTypeReplacer:
+    def test_scan(self) -> None:
+        typed_dict = TypeTypedDict("MyTypedDict")
+        typed_dict.add_attribute("key", TypeSubscript(Type.List, [Type.str]), required=True)
+        typed_dict.add_attribute("other", Type.bool, required=False)
+        untouched = TypeSubscript(Type.List, [Type.bool])
+        root = TypeSubscript(Type.Dict, [Type.str, typed_dict])
+
+        type_replacer = TypeReplacer(_replace_str)
+        type_replacer.scan([root, untouched])
+
+        assert type_replacer.get(untouched) is untouched
+        new_root = type_replacer.get(root)
+        assert new_root is not root
+        assert new_root.render() == "Dict[int, MyTypedDict]"
+        assert root.render() == "Dict[str, MyTypedDict]"
+
+        new_typed_dict = type_replacer.get(typed_dict)
+        assert isinstance(new_typed_dict, TypeTypedDict)
+        assert new_typed_dict is not typed_dict
+        assert new_typed_dict.children[0].type_annotation.render() == "List[int]"
+        assert new_typed_dict.children[1].type_annotation is Type.bool
+        assert typed_dict.children[0].type_annotation.render() == "List[str]"
+
+    def test_scan_cycle(self) -> None:
+        typed_dict = TypeTypedDict("MyTypedDict")
+        typed_dict.add_attribute("key", Type.str, required=True)
+        typed_dict.add_attribute("child", TypeSubscript(Type.List, [typed_dict]), required=False)
+
+        type_replacer = TypeReplacer(_replace_str)
+        type_replacer.scan([typed_dict])
+
+        new_typed_dict = type_replacer.get(typed_dict)
+        assert isinstance(new_typed_dict, TypeTypedDict)
+        assert new_typed_dict.children[0].type_annotation is Type.int
+        child = new_typed_dict.children[1].type_annotation
+        assert isinstance(child, TypeSubscript)
+        assert child.children[0] is new_typed_dict
+        assert typed_dict.children[0].type_annotation is Type.str
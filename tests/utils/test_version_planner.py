@@ -0,0 +1,112 @@
+import json
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+from unittest.mock import patch
+
+import pytest
+
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.pypi_manager import PyPIManager
+from mypy_boto3_builder.utils.version_planner import VersionPlan, VersionPlanner
+
+
+class FakeIndexHandler(BaseHTTPRequestHandler):
+    releases: ClassVar[dict[str, list[str]]] = {}
+    failures: ClassVar[dict[str, int]] = {}
+    requests: ClassVar[list[str]] = []
+
+    def do_GET(self) -> None:
+        package = self.path.split("/")[2]
+        self.requests.append(package)
+        if self.failures.get(package):
+            self.failures[package] -= 1
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, b"unavailable")
+            return
+        if package not in self.releases:
+            self._send(HTTPStatus.NOT_FOUND, b"not found")
+            return
+        data = {"releases": {version: [] for version in self.releases[package]}}
+        self._send(HTTPStatus.OK, json.dumps(data).encode())
+
+    def _send(self, status: HTTPStatus, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@contextmanager
+def serve_index() -> Generator[None]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeIndexHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/pypi/{{package}}/json"
+    try:
+        with patch.object(PyPIManager, "JSON_URL", url):
+            yield
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestVersionPlanner:
+    def setup_method(self) -> None:
+        FakeIndexHandler.releases = {
+            "new-package": ["1.0.0"],
+            "published": ["1.0.0", "1.2.3"],
+            "post-published": ["1.2.3", "1.2.3.post1"],
+        }
+        FakeIndexHandler.failures = {}
+        FakeIndexHandler.requests = []
+
+    def test_resolve(self) -> None:
+        names = ["new-package", "published", "post-published", "missing", "published"]
+        with serve_index():
+            plan = VersionPlanner("1.2.3", skip_published=False).resolve(names)
+
+        assert plan.versions == {
+            "new-package": "1.2.3",
+            "published": "1.2.3.post1",
+            "post-published": "1.2.3.post2",
+            "missing": "1.2.3",
+        }
+        assert plan.published == []
+        assert sorted(FakeIndexHandler.requests) == [
+            "missing",
+            "new-package",
+            "post-published",
+            "published",
+        ]
+
+    def test_resolve_skip_published(self) -> None:
+        with serve_index():
+            plan = VersionPlanner("1.2.3", skip_published=True).resolve(
+                ["new-package", "published", "post-published"]
+            )
+
+        assert plan.versions == {"new-package": "1.2.3"}
+        assert plan.published == ["published", "post-published"]
+        assert plan.get_version("published") is None
+
+    def test_resolve_retries(self) -> None:
+        FakeIndexHandler.failures = {"published": 2}
+        planner = VersionPlanner("1.2.3", skip_published=False, retry_delay=0)
+        with serve_index():
+            plan = planner.resolve(["published"])
+
+        assert plan.versions == {"published": "1.2.3.post1"}
+        assert FakeIndexHandler.requests == ["published"] * 3
+
+        FakeIndexHandler.failures = {"published": 3}
+        with serve_index(), pytest.raises(BuildEnvError):
+            planner.resolve(["published"])
+
+    def test_resolve_empty(self) -> None:
+        assert VersionPlanner("1.2.3", skip_published=False).resolve([]) == VersionPlan()
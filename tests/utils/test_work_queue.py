@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from mypy_boto3_builder.exceptions import BuildEnvError
+from mypy_boto3_builder.utils.work_queue import WorkJob, WorkQueue
+
+
+def get_job(index: int) -> WorkJob:
+    return WorkJob(
+        job_id=f"{index:04d}-product-service{index}",
+        product="product",
+        service_name=f"service{index}",
+        version="1.2.3",
+        output_path="/output",
+    )
+
+
+def handle(job: WorkJob) -> str:
+    return f"{job.service_name}_package"
+
+
+class TestWorkQueue:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_claim(self) -> None:
+        queue = WorkQueue(self.path, worker="test")
+        assert queue.claim() is None
+        queue.put([get_job(1), get_job(0)])
+        assert queue.claim() == get_job(0)
+        assert queue.claim() == get_job(1)
+        assert queue.claim() is None
+
+        result = queue.process(get_job(1), handle)
+        assert result.directory_name == "service1_package"
+        assert result.worker == "test"
+        assert queue.get_result(get_job(1).job_id) == result
+        assert queue.get_result(get_job(0).job_id) is None
+        assert [i.name for i in queue.running_path.glob("*.json")] == [f"{get_job(0).job_id}.json"]
+
+    def test_run(self) -> None:
+        queue = WorkQueue(self.path, worker="main", poll_interval=0.01)
+        queue.open()
+        processed: list[str] = []
+        lock = threading.Lock()
+
+        def handle_slow(job: WorkJob) -> str:
+            with lock:
+                processed.append(job.job_id)
+            threading.Event().wait(0.02)
+            return handle(job)
+
+        workers = [
+            threading.Thread(
+                target=WorkQueue(self.path, worker=f"worker{i}", poll_interval=0.01).work,
+                args=(handle_slow,),
+            )
+            for i in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        jobs = [get_job(i) for i in range(10)]
+        results = queue.run(jobs, handle_slow)
+        queue.close()
+        for worker in workers:
+            worker.join(timeout=5)
+
+        assert [i.directory_name for i in results] == [f"service{i}_package" for i in range(10)]
+        assert sorted(processed) == [job.job_id for job in jobs]
+        assert not any(worker.is_alive() for worker in workers)
+
+    def test_run_failed(self) -> None:
+        def fail(job: WorkJob) -> str:
+            raise ValueError(job.service_name)
+
+        queue = WorkQueue(self.path, worker="main", poll_interval=0.01)
+        with pytest.raises(BuildEnvError, match="service0"):
+            queue.run([get_job(0)], fail)
+        assert (queue.failed_path / f"{get_job(0).job_id}.json").exists()
+
+    def test_process_error(self) -> None:
+        def crash(job: WorkJob) -> str:
+            raise RuntimeError(job.service_name)
+
+        queue = WorkQueue(self.path, worker="test")
+        queue.put([get_job(0)])
+        job = queue.claim()
+        assert job
+        result = queue.process(job, crash)
+        assert result.error == "RuntimeError: service0"
+        assert queue.get_result(job.job_id) == result
+        assert not list(queue.running_path.glob("*.json"))
+
+    def test_release_expired(self) -> None:
+        queue = WorkQueue(self.path, worker="test", lease_time=60.0)
+        queue.put([get_job(0)])
+        assert queue.claim() == get_job(0)
+        running_path = queue.running_path / f"{get_job(0).job_id}.json"
+        assert queue.release_expired() == []
+
+        os.utime(running_path, (0, 0))
+        assert [i.attempt for i in queue.release_expired()] == [1]
+        job = queue.claim()
+        assert job
+        assert job.attempt == 1
+
+        os.utime(running_path, (0, 0))
+        assert [i.attempt for i in queue.release_expired()] == [2]
+        result = queue.get_result(job.job_id)
+        assert result
+        assert result.error == "Lease expired after 2 attempts"
+        assert queue.claim() is None
+
+    def test_run_dead_worker(self) -> None:
+        dead_queue = WorkQueue(self.path, worker="dead")
+        dead_queue.put([get_job(0)])
+        assert dead_queue.claim()
+        os.utime(dead_queue.running_path / f"{get_job(0).job_id}.json", (0, 0))
+
+        queue = WorkQueue(self.path, worker="main", poll_interval=0.01)
+        results = queue.run([get_job(0)], handle)
+        assert [i.worker for i in results] == ["main"]
+
+    def test_work(self) -> None:
+        queue = WorkQueue(self.path, poll_interval=0.01)
+        queue.put([get_job(0), get_job(1)])
+        assert queue.work(handle, idle_timeout=0.05) == 2
+        queue.close()
+        assert queue.is_closed()
+        assert queue.work(handle) == 0
+        queue.open()
+        assert not queue.is_closed()
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from mypy_boto3_builder.constants import OUTPUT_MANIFEST_NAME
+from mypy_boto3_builder.enums.file_status import FileStatus
+from mypy_boto3_builder.utils.content_store import ContentStore
+from mypy_boto3_builder.writers.sinks.directory import DirectorySink
+
+
+class TestDirectorySink:
+    def setup_method(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.sink = DirectorySink()
+
+    def teardown_method(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_write(self) -> None:
+        path = self.path / "package" / "module.pyi"
+        assert self.sink.write_text(path, "a: int\n") == FileStatus.created
+        os.utime(path, (0, 0))
+        assert self.sink.write_text(path, "a: int\n") == FileStatus.unchanged
+        assert path.stat().st_mtime == 0
+        path.chmod(0o600)
+        assert self.sink.write_text(path, "a: str\n") == FileStatus.updated
+        assert path.read_text() == "a: str\n"
+        assert path.stat().st_mode & 0o777 == 0o600
+        assert [i.name for i in path.parent.iterdir()] == ["module.pyi"]
+        assert self.sink.counts == {
+            FileStatus.created: 1,
+            FileStatus.updated: 1,
+            FileStatus.unchanged: 1,
+            FileStatus.deleted: 0,
+        }
+        assert self.sink.get_summary() == "1 created, 1 updated, 1 unchanged, 0 deleted"
+
+    def test_cleanup(self) -> None:
+        known_path = self.path / "package" / "module.pyi"
+        unknown_path = self.path / "package" / "sub" / "old.pyi"
+        other_path = self.path / "other" / "old.pyi"
+        for path in (known_path, unknown_path, other_path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("")
+
+        self.sink.write_text(known_path, "")
+        self.sink.add_cleanup_path(self.path / "package")
+        self.sink.cleanup()
+        assert known_path.exists()
+        assert not unknown_path.exists()
+        assert other_path.exists()
+        assert self.sink.counts[FileStatus.deleted] == 1
+
+    def test_cleanup_manifest(self) -> None:
+        package_path = self.path / "package"
+        old_path = package_path / "old.pyi"
+        manifest_path = self.path / OUTPUT_MANIFEST_NAME
+        sink = DirectorySink(manifest_path=manifest_path)
+        sink.write_text(package_path / "module.pyi", "")
+        sink.write_text(old_path, "")
+        sink.add_cleanup_path(package_path)
+        sink.cleanup()
+        assert json.loads(manifest_path.read_text()) == {"package": ["module.pyi", "old.pyi"]}
+        assert not (package_path / OUTPUT_MANIFEST_NAME).exists()
+
+        user_path = package_path / "user.pyi"
+        user_path.write_text("")
+        sink = DirectorySink(manifest_path=manifest_path)
+        sink.write_text(package_path / "module.pyi", "")
+        sink.add_cleanup_path(package_path)
+        sink.cleanup()
+        assert not old_path.exists()
+        assert user_path.exists()
+        assert json.loads(manifest_path.read_text()) == {"package": ["module.pyi"]}
+
+    def test_write_from_store(self) -> None:
+        sink = DirectorySink(store=ContentStore(self.path / "store"))
+        sink.add_static_content(b"static")
+        static_path = self.path / "package" / "static.pyi"
+        generated_path = self.path / "package" / "generated.pyi"
+        assert sink.write_bytes(static_path, b"static") == FileStatus.created
+        assert sink.write_bytes(generated_path, b"generated") == FileStatus.created
+        assert static_path.stat().st_nlink == 2
+        assert generated_path.stat().st_nlink == 1
+
+        assert sink.write_bytes(static_path, b"changed") == FileStatus.updated
+        assert static_path.stat().st_nlink == 1
+        assert static_path.stat().st_mode & 0o200
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import pytest
+
+from mypy_boto3_builder.enums.file_status import FileStatus
+from mypy_boto3_builder.writers.sinks.memory import MemorySink
+
+
+class TestMemorySink:
+    def setup_method(self) -> None:
+        self.sink = MemorySink()
+        self.sink.write_text(Path("/out/package/setup.py"), "setup()")
+        self.sink.write_bytes(Path("/out/package/module/__init__.pyi"), b"")
+        self.sink.write_text(Path("/out/other/setup.py"), "")
+
+    def test_write(self) -> None:
+        path = Path("/out/package/setup.py")
+        assert self.sink.write_text(path, "setup()") == FileStatus.unchanged
+        assert self.sink.write_text(path, "") == FileStatus.updated
+        assert self.sink.counts[FileStatus.created] == 3
+
+    def test_read(self) -> None:
+        assert self.sink.read_text(Path("/out/package/setup.py")) == "setup()"
+        assert self.sink.exists(Path("/out/package/setup.py"))
+        assert not self.sink.exists(Path("/out/package"))
+        with pytest.raises(FileNotFoundError):
+            self.sink.read_bytes(Path("/out/package/README.md"))
+
+    def test_iterate_files(self) -> None:
+        assert list(self.sink.iterate_files(Path("/out/package"))) == [
+            Path("/out/package/setup.py"),
+            Path("/out/package/module/__init__.pyi"),
+        ]
+        assert list(self.sink.iterate_files(Path("/out/missing"))) == []
+
+    def test_delete(self) -> None:
+        self.sink.delete(Path("/out/other/setup.py"))
+        assert not self.sink.exists(Path("/out/other/setup.py"))
+        with pytest.raises(FileNotFoundError):
+            self.sink.delete(Path("/out/other/setup.py"))
+
+        self.sink.clear(Path("/out/package"))
+        assert list(self.sink.iterate_files(Path("/out"))) == []
@@ -40,3 +40,17 @@ class TestRuffFormatter:
         )
         assert formatter.format_markdown("# a\n```python\na=5\n```") == "# a\n```python\na = 5\n```"
         assert formatter.format_markdown("# a\n```bash\na=5\n```") == "# a\n```bash\na=5\n```"
+
+    def test_format_python_sources(self) -> None:
+        formatter = RuffFormatter(known_first_party=["local"])
+        result = formatter.format_python_sources(
+            {
+                Path("/out/local/__init__.pyi"): "import os\nimport local\na   =5\n",
+                Path("/out/local/sub/client.py"): "b=[1,2]\n",
+            }
+        )
+        assert result == {
+            Path("/out/local/__init__.pyi"): "import os\n\nimport local\n\na = 5\n",
+            Path("/out/local/sub/client.py"): "b = [1, 2]\n",
+        }
+        assert not formatter.format_python_sources({})